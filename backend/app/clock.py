@@ -0,0 +1,44 @@
+"""Clock abstraction for date-dependent calculations.
+
+Routes resolve today's date once per request from the clock and pass it
+down to the services, so "as of" backfills and tests only need a different
+clock rather than patching date.today().
+"""
+from datetime import date
+from typing import Optional
+from fastapi import Depends, Query
+
+
+class Clock:
+    """Clock reading the system date."""
+
+    def today(self) -> date:
+        return date.today()
+
+
+class FixedClock(Clock):
+    """Clock pinned to a given date."""
+
+    def __init__(self, as_of: date):
+        self.as_of = as_of
+
+    def today(self) -> date:
+        return self.as_of
+
+
+system_clock = Clock()
+
+
+def get_clock() -> Clock:
+    """Dependency for getting the clock."""
+    return system_clock
+
+
+def get_today(
+    as_of: Optional[date] = Query(
+        default=None, description="Compute as of this date instead of today"
+    ),
+    clock: Clock = Depends(get_clock),
+) -> date:
+    """Dependency resolving the date a request is computed for."""
+    return as_of or clock.today()
@@ -0,0 +1,116 @@
+"""Bounded process pool for CPU-bound calculation endpoints.
+
+Calculations run outside the request worker so they don't hold its GIL.
+Admission control caps the work queued per worker process: when the pool is
+saturated requests are rejected with 503 and Retry-After instead of piling up.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import BrokenExecutor, Executor, ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+from fastapi import HTTPException, status
+
+# Server worker processes on this host, each with its own pool (gunicorn
+# reads the same variable)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "2"))
+# Processes per server worker; by default up to 4 cores are split between
+# the server workers. 0 runs calculations on a thread pool instead
+CALC_POOL_WORKERS = int(
+    os.getenv("CALC_POOL_WORKERS", str(max(1, min(4, os.cpu_count() or 1) // WEB_CONCURRENCY)))
+)
+CALC_POOL_MAX_PENDING = int(os.getenv("CALC_POOL_MAX_PENDING", "32"))
+CALC_POOL_RETRY_AFTER = int(os.getenv("CALC_POOL_RETRY_AFTER", "1"))
+
+# Per-endpoint timeouts in seconds
+CALC_TIMEOUTS = {
+    "payment": float(os.getenv("CALC_TIMEOUT_PAYMENT", "5")),
+    "scenarios": float(os.getenv("CALC_TIMEOUT_SCENARIOS", "10")),
+}
+
+
+class ComputePool:
+    """Process pool with a pending-work limit and per-call timeouts."""
+
+    def __init__(self, workers: int, max_pending: int, retry_after: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so forked server workers each get their own pool
+        if self._executor is None:
+            if self.workers > 0:
+                # Deferred: multiprocessing is only needed once a request arrives
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max(1, os.cpu_count() or 1))
+        return self._executor
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: float) -> Any:
+        """
+        Run fn(*args) in the pool. Raises 503 when the pool is saturated and
+        504 when the call exceeds its timeout.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Calculation capacity exhausted, retry shortly",
+                    headers={"Retry-After": str(self.retry_after)},
+                )
+            self._pending += 1
+
+        try:
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except BrokenExecutor:
+                # A worker died; start a fresh pool and retry once
+                self._executor = None
+                future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Capacity is held until the work actually finishes, even after a timeout
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Calculation timed out",
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def detach(instance) -> SimpleNamespace:
+    """Copy an ORM instance's column values into a picklable object."""
+    return SimpleNamespace(
+        **{column.key: getattr(instance, column.key) for column in instance.__table__.columns}
+    )
+
+
+compute_pool = ComputePool(CALC_POOL_WORKERS, CALC_POOL_MAX_PENDING, CALC_POOL_RETRY_AFTER)
@@ -0,0 +1,39 @@
+"""Settled reads of id-ordered logs.
+
+Event and transition ids are handed out in insert order, but transactions
+commit in any order. A reader that sees id 12 while the transaction holding
+id 11 is still open, and moves its cursor past 12, never sees 11. Readers
+therefore stop at the first gap in the ids, unless the row after the gap is
+older than CURSOR_SETTLE_SECONDS. By then the transaction that took the
+missing id, which started earlier, has committed or rolled back. A rolled-back
+id leaves a permanent gap and holds readers back once, for the settle time.
+Contiguous ids are served at once. SQLite runs one writer at a time, so its
+ids commit in order.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, TypeVar
+
+# Longer than any write transaction that records events or transitions
+CURSOR_SETTLE_SECONDS = float(os.getenv("CURSOR_SETTLE_SECONDS", "60"))
+
+T = TypeVar("T")
+
+
+def settled(
+    rows: Sequence[T],
+    after_id: int,
+    now: Optional[datetime] = None,
+    settle_seconds: float = CURSOR_SETTLE_SECONDS,
+) -> List[T]:
+    """
+    The leading rows (with id and created_at, ordered by id after after_id)
+    that no uncommitted row can precede.
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(seconds=settle_seconds)
+    previous = after_id
+    for index, row in enumerate(rows):
+        if row.id != previous + 1 and row.created_at > cutoff:
+            return list(rows[:index])
+        previous = row.id
+    return list(rows)
@@ -1,24 +1,132 @@
+import itertools
+import logging
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+from typing import List, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import Pool
+
+from app.deadlines import apply_to_connection, clear_connection, deadline_exceeded
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./mortgage_guardian.db")
 
-# Handle Render.com postgres URL format
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+# "state" creates new PostgreSQL databases with mortgages LIST-partitioned
+# by state; see app.migrations.partition_mortgages for existing ones
+MORTGAGE_PARTITIONING = os.getenv("MORTGAGE_PARTITIONING", "none")
+
+# Connections per process for server databases: kept open, and extra ones
+# opened under load
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+# Comma-separated read replica URLs for read-only routes; empty uses the primary
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+# Seconds between replica health checks
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+# After a write, the client's reads go to the primary for this many seconds
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+def _create_engine(url: str, **kwargs) -> Engine:
+    # Handle Render.com postgres URL format
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+
+    # SQLite needs check_same_thread=False
+    if url.startswith("sqlite"):
+        return create_engine(url, connect_args={"check_same_thread": False}, **kwargs)
+    return create_engine(
+        url, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, **kwargs
+    )
+
 
-# SQLite needs check_same_thread=False
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(DATABASE_URL)
+engine = _create_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+class ReplicaPool:
+    """
+    Round-robin over the read replicas that passed their last health check.
+    A background thread re-checks every replica, so a failed one rejoins
+    once it recovers; with none healthy, reads fall back to the primary.
+    """
+
+    def __init__(self, engines: List[Engine]):
+        self.engines = engines
+        self._healthy = list(engines)
+        self._counter = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def pick(self) -> Optional[Engine]:
+        """Next healthy replica, or None to use the primary."""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def mark_unhealthy(self, replica: Engine) -> None:
+        self._healthy = [e for e in self._healthy if e is not replica]
+
+    def check(self) -> None:
+        """Ping every replica and keep the ones that answer."""
+        healthy = []
+        for replica in self.engines:
+            try:
+                with replica.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+            except Exception:
+                logger.warning("Read replica %s failed its health check", replica.url)
+                continue
+            healthy.append(replica)
+        self._healthy = healthy
+
+    def start(self, interval: float) -> None:
+        self._thread = threading.Thread(
+            target=self._loop, args=(interval,), name="replica-health", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.check()
+
+
+replicas = ReplicaPool(
+    [_create_engine(url, pool_pre_ping=True) for url in DATABASE_REPLICA_URLS]
+)
+
+
+# Every transaction started during a request is bounded by its deadline
+event.listen(
+    Session,
+    "after_begin",
+    lambda session, transaction, connection: apply_to_connection(connection),
+)
+event.listen(Pool, "checkin", clear_connection)
+
+
 def get_db():
     """Dependency for getting database sessions."""
     db = SessionLocal()
@@ -28,6 +136,56 @@ def get_db():
         db.close()
 
 
+def wants_primary(request: Request) -> bool:
+    """Whether a read must see the client's own recent writes."""
+    if request.headers.get("x-consistency") == "strong":
+        return True
+    until = request.cookies.get(READ_PRIMARY_COOKIE)
+    return until is not None and until.isdigit() and int(until) > time.time()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for read-only routes: a session on a healthy replica, or on
+    the primary when there is none or the client needs its recent writes.
+    """
+    replica = None if wants_primary(request) else replicas.pick()
+    db = SessionLocal(bind=replica) if replica else SessionLocal()
+    try:
+        yield db
+    except OperationalError:
+        # Stop routing here until the next health check passes; a query
+        # cancelled by the request deadline says nothing about the replica
+        if replica and not deadline_exceeded():
+            replicas.mark_unhealthy(replica)
+        raise
+    finally:
+        db.close()
+
+
 def init_db():
-    """Initialize database tables."""
+    """
+    Bring the schema up to date. A new database is created at the current
+    layout, so existing migrations are recorded as already applied; an
+    existing one first gets the migrations it hasn't recorded. Missing
+    tables are then created.
+    """
+    # Imported here: the migration modules import the models, which import this module
+    from app.migrations import apply, mark_applied, money_to_cents, partition_mortgages
+
+    # Applied on startup, in order; partitioning stays an explicit step
+    migrations = [money_to_cents]
+
+    new_database = not inspect(engine).has_table("mortgages")
+    if new_database:
+        applied = [migration.NAME for migration in migrations]
+        if MORTGAGE_PARTITIONING == "state" and engine.dialect.name == "postgresql":
+            with engine.begin() as connection:
+                partition_mortgages.create_partitioned_table(connection)
+            applied.append(partition_mortgages.NAME)
+    else:
+        for migration in migrations:
+            apply(engine, migration.NAME, migration.upgrade)
     Base.metadata.create_all(bind=engine)
+    if new_database:
+        mark_applied(engine, applied)
@@ -0,0 +1,85 @@
+"""Per-request deadlines.
+
+DeadlineMiddleware sets the current request's deadline in a context
+variable. The sync endpoint threadpool copies the context, so the deadline is
+visible there too. Every database transaction started under a deadline gets
+the remaining time: a statement_timeout on PostgreSQL, or a progress handler
+on SQLite. A query still running when time is up is cancelled and its
+connection goes back to the pool. Loops over chunks call check_deadline()
+between steps. Both paths end the request with 504. Outside a request,
+such as in jobs or the CLI, there is no deadline and all of this is a no-op.
+"""
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+# time.monotonic() value by which the current request must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+# SQLite VM instructions between deadline checks
+SQLITE_PROGRESS_STEPS = 10000
+
+
+def set_deadline(seconds: Optional[float]) -> Token:
+    """Start a deadline seconds from now; None clears it."""
+    return _deadline.set(None if seconds is None else time.monotonic() + seconds)
+
+
+def reset_deadline(token: Token) -> None:
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def deadline_exceeded() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check_deadline() -> None:
+    """Raise 504 if the current request is out of time."""
+    if deadline_exceeded():
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded",
+        )
+
+
+def apply_to_connection(connection: Connection) -> None:
+    """Bound the statements of a new transaction by the remaining time."""
+    left = remaining()
+    if left is None:
+        return
+    check_deadline()
+    if connection.dialect.name == "postgresql":
+        # SET LOCAL ends with the transaction, so pooled connections come back clean
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}")
+    elif connection.dialect.name == "sqlite":
+        deadline = _deadline.get()
+        connection.connection.dbapi_connection.set_progress_handler(
+            lambda: time.monotonic() > deadline, SQLITE_PROGRESS_STEPS
+        )
+
+
+def clear_connection(dbapi_connection, connection_record) -> None:
+    """Pool checkin hook: drop a SQLite progress handler left by a deadline."""
+    if hasattr(dbapi_connection, "set_progress_handler"):
+        dbapi_connection.set_progress_handler(None, 0)
+
+
+async def database_error_handler(request: Request, exc: OperationalError):
+    """A query cancelled by the deadline is a 504; other database errors propagate."""
+    if deadline_exceeded():
+        return JSONResponse(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            content={"detail": "Request deadline exceeded"},
+        )
+    raise exc
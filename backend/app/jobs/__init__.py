@@ -0,0 +1 @@
+# Background jobs, runnable as `python -m app.jobs.<name>`
@@ -0,0 +1,30 @@
+"""Daily archival of paid-off loans to mortgages_archive.
+
+Usage: python -m app.jobs.archive
+"""
+import logging
+
+from app.database import SessionLocal, init_db
+from app.services.archive import ArchiveService
+
+logger = logging.getLogger(__name__)
+
+
+def run() -> int:
+    """Archive inactive paid-off loans. Returns the number archived."""
+    db = SessionLocal()
+    try:
+        return ArchiveService.archive_inactive(db)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    archived = run()
+    logger.info("Archived %d paid-off mortgages", archived)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Daily purge of expired idempotency keys.
+
+Usage: python -m app.jobs.idempotency
+"""
+import logging
+
+from app.database import SessionLocal, init_db
+from app.services.idempotency import IdempotencyService
+
+logger = logging.getLogger(__name__)
+
+
+def run() -> int:
+    """Delete expired idempotency keys. Returns the number removed."""
+    db = SessionLocal()
+    try:
+        return IdempotencyService.purge_expired(db)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    removed = run()
+    logger.info("Purged %d expired idempotency keys", removed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Daily refresh of materialized milestone dates.
+
+Usage: python -m app.jobs.milestones
+"""
+import logging
+
+from app.database import SessionLocal, init_db
+from app.services.milestones import MilestoneService
+
+logger = logging.getLogger(__name__)
+
+
+def run() -> int:
+    """Rebuild milestones for every mortgage. Returns mortgages processed."""
+    db = SessionLocal()
+    try:
+        return MilestoneService.refresh_all(db)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    processed = run()
+    logger.info("Refreshed milestones for %d mortgages", processed)
+
+
+if __name__ == "__main__":
+    main()
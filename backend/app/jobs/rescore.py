@@ -0,0 +1,185 @@
+"""Daily re-scoring of date-dependent risk data.
+
+Recomputes days past due, next payment due, risk level, foreclosure stage
+and milestone dates for the whole portfolio. Chunks of mortgages are scored
+in a process pool while the parent process streams reads and bulk writes.
+
+Usage: python -m app.jobs.rescore [--workers N] [--chunk-size N] [--as-of DATE]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, init_db
+from app.models.job_run import JobRun
+from app.services.calculations import CalculationService
+from app.services.milestones import MilestoneService
+from app.services.portfolio import MortgageColumns, PortfolioService
+from app.services.scoring import ScoringService
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "rescore"
+DEFAULT_WORKERS = int(os.getenv("RESCORE_WORKERS", str(os.cpu_count() or 1)))
+DEFAULT_CHUNK_SIZE = int(os.getenv("RESCORE_CHUNK_SIZE", "2000"))
+
+
+def score_chunk(chunk: MortgageColumns, today: date) -> Tuple[List[dict], List[dict]]:
+    """
+    Score a chunk of mortgages. Runs in a worker process; produces the same
+    rows as ScoringService.score, with risk and stage classified as arrays.
+    """
+    classified = PortfolioService.classify(chunk, today)
+    warning_types = defaultdict(list)
+    for warning in PortfolioService.find_warnings(chunk, today):
+        warning_types[warning.mortgage_id].append(warning.type)
+    scores = [
+        {
+            "mortgage_id": row.id,
+            "days_past_due": int(days_past_due),
+            "next_payment_due": CalculationService.get_next_payment_due(
+                row.last_payment_date, today
+            ),
+            "dti_ratio": round(float(dti_ratio), 1),
+            "risk_level": PortfolioService.RISK_LEVELS[risk_level].value,
+            "foreclosure_stage": PortfolioService.STAGES[stage].value,
+            "warning_types": ScoringService.join_warning_types(warning_types[row.id]),
+            "scored_on": today,
+        }
+        for row, days_past_due, dti_ratio, risk_level, stage in zip(
+            chunk,
+            classified["days_past_due"],
+            classified["dti_ratio"],
+            classified["risk_level"],
+            classified["foreclosure_stage"],
+        )
+    ]
+    milestones = [
+        row for mortgage in chunk for row in MilestoneService.build_rows(mortgage, today)
+    ]
+    return scores, milestones
+
+
+class _InlineExecutor:
+    """Executor stand-in that runs work in the calling process."""
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def run(
+    db: Session,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    today: Optional[date] = None,
+) -> JobRun:
+    """
+    Re-score every mortgage as of today (or the given date, for backfills)
+    and record the run. Returns the JobRun.
+    """
+    today = today or date.today()
+    workers = workers or DEFAULT_WORKERS
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+
+    job_run = JobRun(job_name=JOB_NAME, status="running")
+    db.add(job_run)
+    db.commit()
+
+    started = time.perf_counter()
+    processed = 0
+    try:
+        if workers > 1:
+            # spawn: the in-process scheduler runs this from a threaded server
+            executor = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            executor = _InlineExecutor()
+        with executor:
+            # Keep every worker busy while the parent writes finished chunks
+            pending = deque()
+            chunks = PortfolioService.iter_chunks(db, chunk_size)
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < workers * 2:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    future = executor.submit(score_chunk, chunk, today)
+                    pending.append((chunk.id.tolist(), future))
+                if not pending:
+                    break
+
+                ids, future = pending.popleft()
+                scores, milestones = future.result()
+                ScoringService.save(db, scores)
+                MilestoneService.replace(db, ids, milestones)
+                db.commit()
+                processed += len(scores)
+        job_run.status = "succeeded"
+    except Exception:
+        db.rollback()
+        job_run.status = "failed"
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        job_run.finished_at = datetime.utcnow()
+        job_run.duration_seconds = round(duration, 3)
+        job_run.rows_processed = processed
+        job_run.rows_per_second = round(processed / duration, 1) if duration > 0 else None
+        db.commit()
+        logger.info(
+            "Re-score %s: %d mortgages in %.2fs (%s rows/sec)",
+            job_run.status,
+            processed,
+            duration,
+            job_run.rows_per_second,
+        )
+    return job_run
+
+
+def run_job() -> None:
+    """Run the job with its own session (used by the in-process scheduler)."""
+    db = SessionLocal()
+    try:
+        run(db)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-score the mortgage portfolio.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--as-of", type=date.fromisoformat, default=None, help="Score as of YYYY-MM-DD"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    db = SessionLocal()
+    try:
+        run(db, workers=args.workers, chunk_size=args.chunk_size, today=args.as_of)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""In-process daily scheduler for background jobs.
+
+With SCHEDULER_ENABLED=true every server process starts a scheduler, but
+only the one holding the database's scheduler lock runs the jobs: a
+session-level advisory lock on PostgreSQL (shared by all instances), or a
+lock file beside a SQLite database. The lock is kept until its process
+exits, and then another process takes over at the next run. The CLI entry
+points don't take the lock.
+"""
+import logging
+import os
+import threading
+from datetime import datetime, time, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import NullPool
+
+try:
+    import fcntl
+except ImportError:  # Windows development servers run a single process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+# Daily run time in UTC, HH:MM
+SCHEDULER_RUN_AT = os.getenv("SCHEDULER_RUN_AT", "05:00")
+
+# pg_try_advisory_lock key shared by every process that runs the scheduler
+ADVISORY_LOCK_KEY = 0x4D475343
+
+
+def next_run_after(now: datetime, run_at: time) -> datetime:
+    """Get the next datetime at run_at strictly after now."""
+    candidate = datetime.combine(now.date(), run_at)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+class SchedulerLock:
+    """Held by at most one process per database, for the rest of its life."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._connection: Optional[Connection] = None
+        self._file = None
+
+    def acquire(self) -> bool:
+        """Take or confirm the lock without waiting. False if another process has it."""
+        if self.engine.dialect.name == "postgresql":
+            return self._acquire_advisory()
+        if self.engine.dialect.name == "sqlite":
+            return self._acquire_file()
+        return True
+
+    def _acquire_advisory(self) -> bool:
+        try:
+            if self._connection is None:
+                # Own connection outside the pool, held while the lock is
+                self._connection = create_engine(self.engine.url, poolclass=NullPool).connect()
+            # Re-entrant, so this also confirms a lock taken earlier is still held
+            held = self._connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+            )
+            self._connection.commit()
+        except Exception:
+            # A dropped connection loses the lock; try again with a new one next run
+            logger.exception("Scheduler lock check failed")
+            self.release()
+            return False
+        if not held:
+            self.release()
+        return bool(held)
+
+    def _acquire_file(self) -> bool:
+        database = self.engine.url.database
+        if fcntl is None or not database or database == ":memory:":
+            return True
+        if self._file is not None:
+            return True
+        lock_file = open(f"{database}.scheduler.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class DailyScheduler:
+    """Runs a list of jobs once a day on a background thread."""
+
+    def __init__(
+        self,
+        run_at: time,
+        jobs: List[Callable[[], None]],
+        lock: Optional[SchedulerLock] = None,
+    ):
+        self.run_at = run_at
+        self.jobs = jobs
+        self.lock = lock
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._loop, name="daily-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self.lock is not None:
+            self.lock.release()
+
+    def run_jobs(self) -> bool:
+        """Run every job if this process holds the lock. Returns whether it did."""
+        if self.lock is not None and not self.lock.acquire():
+            logger.info("Scheduled jobs skipped: another process holds the scheduler lock")
+            return False
+        for job in self.jobs:
+            try:
+                job()
+            except Exception:
+                logger.exception("Scheduled job %s failed", job.__qualname__)
+        return True
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            now = datetime.utcnow()
+            wait = (next_run_after(now, self.run_at) - now).total_seconds()
+            if self._stop.wait(wait):
+                return
+            self.run_jobs()
+
+
+def create_scheduler() -> Optional[DailyScheduler]:
+    """Create the daily scheduler from environment settings, if enabled."""
+    if not SCHEDULER_ENABLED:
+        return None
+    # Imported here so a disabled scheduler doesn't load the job modules
+    from app.database import engine
+    from app.jobs import archive, idempotency, rescore
+
+    # Archive first so the re-score skips loans leaving the hot table
+    return DailyScheduler(
+        time.fromisoformat(SCHEDULER_RUN_AT),
+        [archive.run, rescore.run_job, idempotency.run],
+        SchedulerLock(engine),
+    )
@@ -1,12 +1,44 @@
+# Started before the remaining imports so they are included in the breakdown
+from app.startup import StartupTimer
+
+startup_timer = StartupTimer()
+
+import logging
 from datetime import datetime
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import OperationalError
 
-from app.database import init_db
+from app.compute import compute_pool
+from app.deadlines import database_error_handler
+from app.database import (
+    DB_MAX_OVERFLOW,
+    READ_YOUR_WRITES_SECONDS,
+    REPLICA_HEALTH_INTERVAL,
+    engine,
+    init_db,
+    replicas,
+)
+from app.jobs.scheduler import create_scheduler
+from app.middleware import (
+    CompressionMiddleware,
+    DeadlineMiddleware,
+    LoadSheddingMiddleware,
+    RateLimitMiddleware,
+    ReadYourWritesMiddleware,
+)
+from app.middleware.compression import COMPRESSION_ENABLED
+from app.middleware.load_shedding import LOAD_SHEDDING_ENABLED
+from app.middleware.rate_limit import RATE_LIMIT_ENABLED, create_backend
 from app.routers.mortgages import router as mortgages_router
 from app.routers.calculations import router as calculations_router
+from app.routers.portfolio import router as portfolio_router
+from app.routers.changes import router as changes_router
+from app.routers.transitions import router as transitions_router
 from app.schemas.mortgage import HealthResponse
 
+startup_timer.mark("imports")
+
 app = FastAPI(
     title="Mortgage Guardian API",
     description="API for tracking mortgage deadlines, calculating modified payments, and providing guidance on avoiding foreclosure.",
@@ -15,6 +47,19 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Innermost, so the deadline covers the handler and its queries
+app.add_middleware(DeadlineMiddleware)
+app.add_exception_handler(OperationalError, database_error_handler)
+
+# Added before CORS so rejected responses still carry CORS headers. The last
+# added runs first: rate limits apply before load is measured.
+if LOAD_SHEDDING_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware, engine=engine, max_overflow=DB_MAX_OVERFLOW)
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, backend=create_backend())
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -30,15 +75,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if replicas:
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=READ_YOUR_WRITES_SECONDS)
+
 # Include routers
 app.include_router(mortgages_router)
 app.include_router(calculations_router)
+app.include_router(portfolio_router)
+app.include_router(changes_router)
+app.include_router(transitions_router)
+
+
+scheduler = create_scheduler()
+
+startup_timer.mark("app_setup")
+
+# Uvicorn and gunicorn both configure this logger
+logger = logging.getLogger("uvicorn.error")
 
 
 @app.on_event("startup")
 def on_startup():
-    """Initialize database on startup."""
+    """Initialize database and background jobs on startup."""
+    startup_timer.resume()
     init_db()
+    startup_timer.mark("init_db")
+    if scheduler:
+        scheduler.start()
+        startup_timer.mark("scheduler")
+    if replicas:
+        replicas.start(REPLICA_HEALTH_INTERVAL)
+    app.state.startup_timings = dict(startup_timer.phases)
+    logger.info("Startup complete in %s", startup_timer.summary())
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """Stop background jobs and worker pools on shutdown."""
+    if scheduler:
+        scheduler.stop()
+    replicas.stop()
+    compute_pool.shutdown()
 
 
 @app.get("/health", response_model=HealthResponse, tags=["health"])
@@ -0,0 +1,13 @@
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.deadline import DeadlineMiddleware
+from app.middleware.load_shedding import LoadSheddingMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "DeadlineMiddleware",
+    "LoadSheddingMiddleware",
+    "RateLimitMiddleware",
+    "ReadYourWritesMiddleware",
+]
@@ -0,0 +1,217 @@
+"""Response compression negotiated from Accept-Encoding.
+
+gzip always works. br and zstd are offered when the optional brotli or
+zstandard packages are installed. When the client rates several encodings
+equally, the server prefers br, then zstd, then gzip. Whole responses below
+COMPRESSION_MIN_SIZE are sent as they are. Streamed responses, such as NDJSON
+exports and server-sent events, are compressed chunk by chunk with a flush
+after each chunk, so every event reaches the client as soon as it is sent.
+
+Static payloads can be compressed once at the highest level with
+PrecompressedPayload. Responses that already carry a Content-Encoding are
+passed through unchanged.
+"""
+import os
+import zlib
+from typing import Dict, List, Optional
+
+from fastapi import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Bytes below which whole responses aren't worth compressing
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "500"))
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/",
+)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# encoding -> (encoder factory taking a level, streaming level, static level),
+# in server preference order
+ENCODERS: Dict[str, tuple] = {}
+
+try:
+    # Optional dependency: brotli
+    import brotli
+
+    class _BrotliEncoder:
+        def __init__(self, level: int):
+            self._compressor = brotli.Compressor(quality=level)
+
+        def compress(self, data: bytes) -> bytes:
+            return self._compressor.process(data)
+
+        def flush(self) -> bytes:
+            return self._compressor.flush()
+
+        def finish(self) -> bytes:
+            return self._compressor.finish()
+
+    ENCODERS["br"] = (_BrotliEncoder, 5, 11)
+except ImportError:
+    pass
+
+try:
+    # Optional dependency: zstandard
+    import zstandard
+
+    class _ZstdEncoder:
+        def __init__(self, level: int):
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+        def compress(self, data: bytes) -> bytes:
+            return self._compressor.compress(data)
+
+        def flush(self) -> bytes:
+            return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+        def finish(self) -> bytes:
+            return self._compressor.flush()
+
+    ENCODERS["zstd"] = (_ZstdEncoder, 6, 19)
+except ImportError:
+    pass
+
+ENCODERS["gzip"] = (_GzipEncoder, 6, 9)
+
+
+def negotiate(
+    accept_encoding: Optional[str], available: Optional[List[str]] = None
+) -> Optional[str]:
+    """
+    Best available encoding for an Accept-Encoding header, or None for
+    identity. Highest q-value wins; ties go to server preference.
+    """
+    if not accept_encoding:
+        return None
+    available = available if available is not None else list(ENCODERS)
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a whole payload; level defaults to the streaming level."""
+    factory, streaming_level, _ = ENCODERS[encoding]
+    encoder = factory(streaming_level if level is None else level)
+    return encoder.compress(data) + encoder.finish()
+
+
+def is_compressible(headers: Headers) -> bool:
+    return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+class PrecompressedPayload:
+    """A static body compressed once per available encoding at the highest level."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.media_type = media_type
+        self.variants: Dict[Optional[str], bytes] = {None: body}
+        for encoding, (_, _, static_level) in ENCODERS.items():
+            self.variants[encoding] = compress(body, encoding, static_level)
+
+    def response(self, accept_encoding: Optional[str]) -> Response:
+        encoding = negotiate(accept_encoding)
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], media_type=self.media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    """Compresses compressible responses in the client's preferred encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not is_compressible(headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held until the first body chunk shows whether the response streams
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(scope=start)
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                factory, level, _ = ENCODERS[encoding]
+                encoder = factory(level)
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = encoder.compress(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+
+            data = encoder.compress(body)
+            data += encoder.flush() if more_body else encoder.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
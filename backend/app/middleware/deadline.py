@@ -0,0 +1,67 @@
+import os
+import re
+from typing import Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.deadlines import reset_deadline, set_deadline
+
+# Seconds a request may run unless its route says otherwise
+REQUEST_TIMEOUT_DEFAULT = float(os.getenv("REQUEST_TIMEOUT_DEFAULT", "15"))
+# Upper bound for timeouts requested through the header
+REQUEST_TIMEOUT_MAX = float(os.getenv("REQUEST_TIMEOUT_MAX", "60"))
+
+# Clients may ask for a shorter deadline, in seconds
+TIMEOUT_HEADER = b"x-request-timeout"
+
+# First match wins; None means no deadline unless the client sets one
+ROUTE_TIMEOUTS = [
+    (re.compile(r"^/api/v1/(changes|transitions)/stream$"), None),
+    (re.compile(r"^/api/v1/mortgages/\d+/history$"), None),
+    # Long polls wait up to 30 seconds before querying
+    (re.compile(r"^/api/v1/changes$"), 45.0),
+    (re.compile(r"^/api/v1/(mortgages(/bulk)?|projections)$"), 60.0),
+]
+
+
+def route_timeout(path: str) -> Optional[float]:
+    for pattern, timeout in ROUTE_TIMEOUTS:
+        if pattern.match(path):
+            return timeout
+    return REQUEST_TIMEOUT_DEFAULT
+
+
+def requested_timeout(scope: Scope) -> Optional[float]:
+    for name, value in scope["headers"]:
+        if name == TIMEOUT_HEADER:
+            try:
+                timeout = float(value)
+            except ValueError:
+                return None
+            return timeout if timeout > 0 else None
+    return None
+
+
+class DeadlineMiddleware:
+    """
+    Sets each request's deadline: the route's default, or the client's
+    X-Request-Timeout when that is shorter (capped at REQUEST_TIMEOUT_MAX).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = route_timeout(scope["path"])
+        requested = requested_timeout(scope)
+        if requested is not None:
+            timeout = min(requested, timeout or REQUEST_TIMEOUT_MAX, REQUEST_TIMEOUT_MAX)
+
+        token = set_deadline(timeout)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_deadline(token)
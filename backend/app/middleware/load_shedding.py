@@ -0,0 +1,183 @@
+"""Adaptive admission control.
+
+Each request's pressure is the worst of four overload signals, each scaled so
+1.0 is its limit:
+
+- requests in flight in this worker;
+- tasks queued for the sync endpoint threadpool;
+- connections checked out of the database pool, where 1.0 means the next
+  checkout waits;
+- mean latency to first response byte over a sliding window, counted
+  once the window holds LOAD_SHED_MIN_SAMPLES responses. Only NORMAL and
+  CRITICAL routes are sampled, so slow batch work doesn't shed everything else.
+
+LOW priority routes (calculators, exports, bulk analytics, streams) are
+shed with 503 and Retry-After once pressure reaches 1.0, NORMAL routes at
+LOAD_SHED_NORMAL_AT. Mortgage CRUD and health checks are never shed.
+Streams and long polls are admitted or shed like any LOW route but left
+out of the signals, since their duration says nothing about load.
+"""
+import os
+import re
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Deque, Optional, Tuple
+
+import anyio.to_thread
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LOAD_SHEDDING_ENABLED = os.getenv("LOAD_SHEDDING_ENABLED", "true").lower() == "true"
+LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv("LOAD_SHED_MAX_IN_FLIGHT", "100"))
+LOAD_SHED_MAX_QUEUED = int(os.getenv("LOAD_SHED_MAX_QUEUED", "20"))
+# Target mean latency to first byte, in milliseconds
+LOAD_SHED_TARGET_LATENCY_MS = float(os.getenv("LOAD_SHED_TARGET_LATENCY_MS", "1000"))
+LOAD_SHED_WINDOW_SECONDS = float(os.getenv("LOAD_SHED_WINDOW_SECONDS", "10"))
+# Responses in the window before its mean latency counts, so a few slow
+# requests on an idle worker don't shed anything
+LOAD_SHED_MIN_SAMPLES = int(os.getenv("LOAD_SHED_MIN_SAMPLES", "20"))
+# Pressure at which NORMAL priority routes are shed too
+LOAD_SHED_NORMAL_AT = float(os.getenv("LOAD_SHED_NORMAL_AT", "1.5"))
+LOAD_SHED_RETRY_AFTER = int(os.getenv("LOAD_SHED_RETRY_AFTER", "2"))
+
+
+class Priority(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    CRITICAL = 2
+
+
+# First match wins; anything unmatched is NORMAL
+ROUTE_PRIORITIES = [
+    (re.compile(r"^/(health)?$"), Priority.CRITICAL),
+    (re.compile(r"^/api/v1/mortgages(/bulk|/\d+)?$"), Priority.CRITICAL),
+    (re.compile(r"^/api/v1/calculate/"), Priority.LOW),
+    (re.compile(r"^/api/v1/projections$"), Priority.LOW),
+    (re.compile(r"^/api/v1/mortgages/\d+/(history|projection|scenarios)$"), Priority.LOW),
+    (re.compile(r"^/api/v1/(changes|transitions)(/|$)"), Priority.LOW),
+]
+
+LONG_LIVED = re.compile(r"^/api/v1/(changes|transitions/stream|mortgages/\d+/history)")
+
+
+def route_priority(path: str) -> Priority:
+    for pattern, priority in ROUTE_PRIORITIES:
+        if pattern.match(path):
+            return priority
+    return Priority.NORMAL
+
+
+class LatencyWindow:
+    """
+    Mean of samples recorded within the last window_seconds, or 0.0 with
+    fewer than min_samples of them.
+    """
+
+    def __init__(self, window_seconds: float, min_samples: int = 1):
+        self.window_seconds = window_seconds
+        self.min_samples = max(1, min_samples)
+        self._samples: Deque[Tuple[float, float]] = deque()
+        self._total = 0.0
+
+    def record(self, latency: float, now: Optional[float] = None) -> None:
+        self._samples.append((now or time.monotonic(), latency))
+        self._total += latency
+
+    def mean(self, now: Optional[float] = None) -> float:
+        cutoff = (now or time.monotonic()) - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._total -= self._samples.popleft()[1]
+        if len(self._samples) < self.min_samples:
+            return 0.0
+        return self._total / len(self._samples)
+
+
+class LoadSheddingMiddleware:
+    """Rejects lower-priority requests first when this worker is overloaded."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        engine: Optional[Engine] = None,
+        max_overflow: int = 0,
+        max_in_flight: int = LOAD_SHED_MAX_IN_FLIGHT,
+        max_queued: int = LOAD_SHED_MAX_QUEUED,
+        target_latency_ms: float = LOAD_SHED_TARGET_LATENCY_MS,
+        window_seconds: float = LOAD_SHED_WINDOW_SECONDS,
+        min_samples: int = LOAD_SHED_MIN_SAMPLES,
+        normal_at: float = LOAD_SHED_NORMAL_AT,
+        retry_after: int = LOAD_SHED_RETRY_AFTER,
+    ):
+        self.app = app
+        self.engine = engine
+        # The pool's configured overflow, which it doesn't expose
+        self.max_overflow = max(max_overflow, 0)
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.target_latency = target_latency_ms / 1000
+        self.latency = LatencyWindow(window_seconds, min_samples)
+        self.normal_at = normal_at
+        self.retry_after = retry_after
+        # The event loop is single-threaded, so plain counters are safe
+        self.in_flight = 0
+        self.shed = 0
+
+    def pool_utilization(self) -> float:
+        pool = self.engine.pool if self.engine is not None else None
+        if not isinstance(pool, QueuePool):
+            return 0.0
+        capacity = pool.size() + self.max_overflow
+        return pool.checkedout() / capacity if capacity else 0.0
+
+    def pressure(self) -> float:
+        """Worst overload signal; 1.0 means at least one is at its limit."""
+        queued = anyio.to_thread.current_default_thread_limiter().statistics().tasks_waiting
+        return max(
+            self.in_flight / self.max_in_flight,
+            queued / self.max_queued,
+            self.pool_utilization(),
+            self.latency.mean() / self.target_latency,
+        )
+
+    def admits(self, priority: Priority) -> bool:
+        if priority == Priority.CRITICAL:
+            return True
+        threshold = self.normal_at if priority == Priority.NORMAL else 1.0
+        return self.pressure() < threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        priority = route_priority(path)
+        if not self.admits(priority):
+            self.shed += 1
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        if LONG_LIVED.match(path):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.monotonic()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self.latency.record(time.monotonic() - started)
+            await send(message)
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send if priority == Priority.LOW else send_wrapper)
+        finally:
+            self.in_flight -= 1
@@ -0,0 +1,238 @@
+"""Per-client token-bucket rate limiting.
+
+Clients are identified by their X-API-Key header when it is one of
+RATE_LIMIT_API_KEYS, or else by their IP address, so made-up keys can't
+buy fresh buckets. Behind a proxy the IP comes from X-Forwarded-For, which
+the server trusts only from FORWARDED_ALLOW_IPS (see app/server.py).
+Each client's bucket holds up to RATE_LIMIT_BURST tokens and refills at
+RATE_LIMIT_PER_SECOND. A request takes its route's cost in tokens, and batch
+and export routes cost more. Requests that can't pay are rejected with 429
+and Retry-After. Every response carries RateLimit-Limit, RateLimit-Remaining
+and RateLimit-Reset headers, where Reset is the number of seconds until the
+bucket is full again.
+
+Off unless RATE_LIMIT_ENABLED=true. Behind a proxy, enable it only once
+FORWARDED_ALLOW_IPS names the proxy; otherwise every anonymous client shares
+the proxy's bucket.
+
+Buckets live in process memory by default, which means one set per worker. Set
+RATE_LIMIT_REDIS_URL to share them across workers and instances (this needs
+the redis package).
+"""
+import abc
+import hashlib
+import math
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Collection, Dict, List, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "120"))
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "10"))
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+# Comma-separated API keys that get a bucket of their own
+RATE_LIMIT_API_KEYS = frozenset(
+    key.strip() for key in os.getenv("RATE_LIMIT_API_KEYS", "").split(",") if key.strip()
+)
+
+API_KEY_HEADER = b"x-api-key"
+
+# (method or None for any, path pattern, cost); first match wins, default 1
+ROUTE_COSTS = [
+    (None, re.compile(r"^/(health)?$"), 0),
+    ("POST", re.compile(r"^/api/v1/mortgages/bulk$"), 20),
+    ("PATCH", re.compile(r"^/api/v1/mortgages$"), 20),
+    (None, re.compile(r"^/api/v1/projections$"), 20),
+    (None, re.compile(r"^/api/v1/(warnings|deadlines/upcoming)$"), 10),
+    (None, re.compile(r"^/api/v1/(changes|transitions)/stream$"), 10),
+    (None, re.compile(r"^/api/v1/mortgages/\d+/history$"), 5),
+    (None, re.compile(r"^/api/v1/mortgages/\d+/(scenarios|projection)$"), 3),
+]
+
+
+def route_cost(method: str, path: str) -> int:
+    for route_method, pattern, cost in ROUTE_COSTS:
+        if (route_method is None or route_method == method) and pattern.match(path):
+            return cost
+    return 1
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    # Seconds until the bucket is full again
+    reset: int
+    # Seconds until the request could be paid for; 0 when allowed
+    retry_after: int
+
+
+def _result(
+    allowed: bool, tokens: float, capacity: int, rate: float, cost: int
+) -> RateLimitResult:
+    return RateLimitResult(
+        allowed=allowed,
+        remaining=int(tokens),
+        reset=math.ceil((capacity - tokens) / rate),
+        retry_after=0 if allowed else math.ceil((cost - tokens) / rate),
+    )
+
+
+class RateLimitBackend(abc.ABC):
+    """Bucket storage. take() refills a bucket, then debits cost if it can pay."""
+
+    @abc.abstractmethod
+    async def take(self, key: str, cost: int, capacity: int, rate: float) -> RateLimitResult:
+        ...
+
+
+class MemoryBackend(RateLimitBackend):
+    """Buckets in process memory. Idle buckets are dropped once max_keys is exceeded."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [tokens, updated]; only touched from the event loop, so unlocked
+        self._buckets: Dict[str, List[float]] = {}
+
+    async def take(self, key: str, cost: int, capacity: int, rate: float) -> RateLimitResult:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._sweep(now, capacity, rate)
+            bucket = self._buckets[key] = [capacity, now]
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        bucket[0], bucket[1] = tokens, now
+        return _result(allowed, tokens, capacity, rate, cost)
+
+    def _sweep(self, now: float, capacity: int, rate: float) -> None:
+        # A bucket that has refilled completely is the same as no bucket
+        full_after = capacity / rate
+        idle = [key for key, (_, updated) in self._buckets.items() if now - updated >= full_after]
+        for key in idle:
+            del self._buckets[key]
+        # Still full of active clients: forget the oldest tenth rather than sweep every request
+        if len(self._buckets) >= self.max_keys:
+            for key in list(self._buckets)[: max(1, self.max_keys // 10)]:
+                del self._buckets[key]
+
+
+class RedisBackend(RateLimitBackend):
+    """Buckets shared through Redis, updated atomically by a Lua script."""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str):
+        # Optional dependency, only needed for a shared backend
+        try:
+            import redis.asyncio
+        except ImportError as exc:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL requires the redis package") from exc
+        self._client = redis.asyncio.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def take(self, key: str, cost: int, capacity: int, rate: float) -> RateLimitResult:
+        allowed, tokens = await self._script(
+            keys=[f"ratelimit:{key}"], args=[capacity, rate, cost]
+        )
+        return _result(bool(allowed), float(tokens), capacity, rate, cost)
+
+
+def create_backend() -> RateLimitBackend:
+    """Backend from environment settings."""
+    if RATE_LIMIT_REDIS_URL:
+        return RedisBackend(RATE_LIMIT_REDIS_URL)
+    return MemoryBackend()
+
+
+def client_key(scope: Scope, api_keys: Collection[str] = RATE_LIMIT_API_KEYS) -> str:
+    """
+    Known API key (hashed, so keys aren't held in plain text in the backend)
+    or client IP.
+    """
+    for name, value in scope["headers"]:
+        if name == API_KEY_HEADER and value.decode("latin-1") in api_keys:
+            return "key:" + hashlib.sha256(value).hexdigest()[:32]
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class RateLimitMiddleware:
+    """Charges each request its route's cost from the client's token bucket."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: Optional[RateLimitBackend] = None,
+        capacity: int = RATE_LIMIT_BURST,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        api_keys: Collection[str] = RATE_LIMIT_API_KEYS,
+    ):
+        self.app = app
+        self.backend = backend or MemoryBackend()
+        self.capacity = capacity
+        self.rate = rate
+        self.api_keys = api_keys
+
+    def headers(self, result: RateLimitResult) -> Dict[str, str]:
+        return {
+            "RateLimit-Limit": str(self.capacity),
+            "RateLimit-Remaining": str(result.remaining),
+            "RateLimit-Reset": str(result.reset),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cost = route_cost(scope["method"], scope["path"])
+        if cost == 0:
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.backend.take(client_key(scope, self.api_keys), cost, self.capacity, self.rate)
+        headers = self.headers(result)
+        if not result.allowed:
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={**headers, "Retry-After": str(result.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers.items():
+                    response_headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
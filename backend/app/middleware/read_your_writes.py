@@ -0,0 +1,37 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import READ_PRIMARY_COOKIE
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful write, set a short-lived cookie that routes the
+    client's reads to the primary until replicas have caught up. Browsers
+    don't send this SameSite=Lax cookie from another site, so cross-site
+    clients such as the SPA send X-Consistency: strong instead.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: int):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = int(time.time()) + self.window_seconds
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={until}; Max-Age={self.window_seconds}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,62 @@
+"""Schema migrations that create_all can't apply to existing tables.
+
+Each migration module defines NAME and upgrade(connection). init_db()
+applies the pending ones on startup, and each also runs on its own with
+python -m app.migrations.<module>. apply() records applied migrations in
+schema_migrations so running one twice is a no-op. On PostgreSQL it holds
+an advisory lock, so instances starting together apply each migration once.
+"""
+import logging
+from datetime import datetime
+from typing import Callable, Iterable
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key serializing migrations across processes
+MIGRATION_LOCK_KEY = 0x4D474D49
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("name", String(100), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def mark_applied(engine: Engine, names: Iterable[str]) -> None:
+    """Record migrations as applied, for databases created at the current layout."""
+    with engine.begin() as connection:
+        schema_migrations.create(connection, checkfirst=True)
+        applied = set(connection.scalars(select(schema_migrations.c.name)))
+        rows = [
+            {"name": name, "applied_at": datetime.utcnow()}
+            for name in names
+            if name not in applied
+        ]
+        if rows:
+            connection.execute(schema_migrations.insert(), rows)
+
+
+def apply(engine: Engine, name: str, upgrade: Callable[[Connection], None]) -> bool:
+    """Run upgrade in one transaction unless already applied. Returns whether it ran."""
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+        schema_migrations.create(connection, checkfirst=True)
+        applied = connection.scalar(
+            select(schema_migrations.c.name).where(schema_migrations.c.name == name)
+        )
+        if applied:
+            logger.info("Migration %s already applied", name)
+            return False
+        upgrade(connection)
+        connection.execute(
+            schema_migrations.insert().values(name=name, applied_at=datetime.utcnow())
+        )
+    logger.info("Applied migration %s", name)
+    return True
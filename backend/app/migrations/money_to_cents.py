@@ -0,0 +1,76 @@
+"""Convert mortgage amounts from float dollars to integer cents, and
+interest_rate from float percent to integer basis points.
+
+Usage: python -m app.migrations.money_to_cents
+
+PostgreSQL columns change type in place. SQLite can't alter column types,
+so values are rescaled in place; the Cents and BasisPoints column types
+read the resulting REAL-affinity values back as integers. Startup applies
+it to existing databases (see init_db); this command runs it on its own.
+"""
+import logging
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.database import engine
+from app.migrations import apply
+from app.money import to_cents
+
+NAME = "0001_money_to_cents"
+
+CENTS_COLUMNS = (
+    "loan_amount",
+    "current_balance",
+    "monthly_payment",
+    "monthly_income",
+    "monthly_expenses",
+    "property_value",
+)
+
+
+def upgrade(connection: Connection) -> None:
+    # Both scale by 100: dollars to cents, percent to basis points
+    columns = {name: "BIGINT" for name in CENTS_COLUMNS}
+    columns["interest_rate"] = "INTEGER"
+    if connection.dialect.name == "postgresql":
+        # numeric ROUND rounds half away from zero, i.e. half up for amounts
+        for name, sql_type in columns.items():
+            connection.execute(
+                text(
+                    f"ALTER TABLE mortgages ALTER COLUMN {name} TYPE {sql_type} "
+                    f"USING ROUND({name}::numeric * 100)::{sql_type}"
+                )
+            )
+        return
+
+    # Rescale in Python with the same half-up rounding the Cents type uses;
+    # SQLite's ROUND would see 0.285 * 100 as 28.4999...
+    names = list(columns)
+    rows = connection.execute(text(f"SELECT id, {', '.join(names)} FROM mortgages")).all()
+    if not rows:
+        return
+    connection.execute(
+        text(
+            f"UPDATE mortgages SET {', '.join(f'{name} = :{name}' for name in names)} "
+            "WHERE id = :id"
+        ),
+        [
+            {
+                "id": row[0],
+                **{
+                    name: None if value is None else to_cents(value)
+                    for name, value in zip(names, row[1:])
+                },
+            }
+            for row in rows
+        ],
+    )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    apply(engine, NAME, upgrade)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Optional PostgreSQL layout: mortgages LIST-partitioned by state.
+
+One partition per state in the StateService catalogue plus a DEFAULT
+partition, so queries filtered by state (per-state reports, the rescore
+job's state scans) touch only that partition. The table keeps its name and
+columns, so the ORM model is unchanged; the primary key becomes
+(id, state) because PostgreSQL requires the partition key in it, and ids
+still come from mortgages_id_seq. Indexes declared on the model are created
+on the parent and so exist locally on every partition.
+
+New PostgreSQL databases get this layout from init_db when
+MORTGAGE_PARTITIONING=state.
+Existing ones are converted with:
+
+    python -m app.migrations.partition_mortgages [--batch-size N] [--keep-old]
+
+which renames the current table, creates the partitioned one, copies rows
+across in id-ordered batches, checks the row counts, and drops the old
+table. It runs in one transaction; stop writers first.
+"""
+import argparse
+import functools
+import logging
+from typing import List
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex
+
+from app.database import engine
+from app.migrations import apply
+from app.models.mortgage import Mortgage
+from app.services.states import StateService
+
+logger = logging.getLogger(__name__)
+
+NAME = "0002_partition_mortgages_by_state"
+OLD_TABLE = "mortgages_unpartitioned"
+DEFAULT_BATCH_SIZE = 50000
+
+
+def partition_name(code: str) -> str:
+    return f"mortgages_{code.lower()}"
+
+
+def partition_ddl() -> List[str]:
+    """Statements creating the partitioned mortgages table and its partitions."""
+    dialect = postgresql.dialect()
+    table = Mortgage.__table__
+    columns = []
+    for column in table.columns:
+        if column.name == "id":
+            columns.append("id INTEGER NOT NULL DEFAULT nextval('mortgages_id_seq')")
+        else:
+            not_null = "" if column.nullable else " NOT NULL"
+            columns.append(f"{column.name} {column.type.compile(dialect=dialect)}{not_null}")
+
+    return [
+        "CREATE SEQUENCE IF NOT EXISTS mortgages_id_seq",
+        f"CREATE TABLE mortgages ({', '.join(columns)}, PRIMARY KEY (id, state)) "
+        "PARTITION BY LIST (state)",
+        "ALTER SEQUENCE mortgages_id_seq OWNED BY mortgages.id",
+        *(
+            f"CREATE TABLE {partition_name(state.code)} PARTITION OF mortgages "
+            f"FOR VALUES IN ('{state.code}')"
+            for state in StateService.get_all_states()
+        ),
+        "CREATE TABLE mortgages_default PARTITION OF mortgages DEFAULT",
+        *(str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes),
+    ]
+
+
+def create_partitioned_table(connection: Connection) -> bool:
+    """Create the partitioned layout if mortgages doesn't exist yet."""
+    if inspect(connection).has_table("mortgages"):
+        return False
+    for statement in partition_ddl():
+        connection.execute(text(statement))
+    return True
+
+
+def upgrade(
+    connection: Connection, batch_size: int = DEFAULT_BATCH_SIZE, keep_old: bool = False
+) -> None:
+    if connection.dialect.name != "postgresql":
+        raise RuntimeError("Partitioning mortgages requires PostgreSQL")
+
+    # Free the names the new table and its indexes will use
+    connection.execute(text(f"ALTER TABLE mortgages RENAME TO {OLD_TABLE}"))
+    connection.execute(
+        text(f"ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT mortgages_pkey TO {OLD_TABLE}_pkey")
+    )
+    for index in Mortgage.__table__.indexes:
+        connection.execute(
+            text(f"ALTER INDEX IF EXISTS {index.name} RENAME TO {OLD_TABLE}_{index.name}")
+        )
+    create_partitioned_table(connection)
+
+    names = ", ".join(column.name for column in Mortgage.__table__.columns)
+    max_id = connection.scalar(text(f"SELECT COALESCE(MAX(id), 0) FROM {OLD_TABLE}"))
+    for low in range(0, max_id, batch_size):
+        connection.execute(
+            text(
+                f"INSERT INTO mortgages ({names}) SELECT {names} FROM {OLD_TABLE} "
+                "WHERE id > :low AND id <= :high"
+            ),
+            {"low": low, "high": low + batch_size},
+        )
+        logger.info("Copied mortgages up to id %d of %d", min(low + batch_size, max_id), max_id)
+
+    copied = connection.scalar(text("SELECT COUNT(*) FROM mortgages"))
+    original = connection.scalar(text(f"SELECT COUNT(*) FROM {OLD_TABLE}"))
+    if copied != original:
+        raise RuntimeError(f"Copied {copied} of {original} mortgages; rolling back")
+    if not keep_old:
+        connection.execute(text(f"DROP TABLE {OLD_TABLE}"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Partition mortgages by state.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--keep-old", action="store_true", help=f"Keep the original table as {OLD_TABLE}"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    apply(
+        engine,
+        NAME,
+        functools.partial(upgrade, batch_size=args.batch_size, keep_old=args.keep_old),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,19 @@
 from app.models.mortgage import Mortgage
+from app.models.milestone import MortgageMilestone
+from app.models.score import MortgageScore
+from app.models.job_run import JobRun
+from app.models.event import MortgageEvent
+from app.models.transition import MortgageTransition
+from app.models.idempotency import IdempotencyKey
+from app.models.archive import ArchivedMortgage
 
-__all__ = ["Mortgage"]
+__all__ = [
+    "Mortgage",
+    "MortgageMilestone",
+    "MortgageScore",
+    "JobRun",
+    "MortgageEvent",
+    "MortgageTransition",
+    "IdempotencyKey",
+    "ArchivedMortgage",
+]
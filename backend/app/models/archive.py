@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, String
+from app.database import Base
+from app.models.mortgage import MortgageFields
+
+
+class ArchivedMortgage(MortgageFields, Base):
+    """
+    A paid-off or resolved loan moved out of the hot mortgages table. Rows
+    keep their original id; the primary key is the only index.
+    """
+
+    __tablename__ = "mortgages_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # ArchiveReason value
+    archive_reason = Column(String(20), nullable=False)
@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, JSON, String
+from app.database import Base
+
+
+class MortgageEvent(Base):
+    """Append-only log of mortgage changes, written with the change itself."""
+
+    __tablename__ = "mortgage_events"
+
+    # BIGINT on servers; SQLite only autoincrements INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    mortgage_id = Column(Integer, nullable=False)
+
+    event_type = Column(String(10), nullable=False)
+    # New values of the changed fields (a full snapshot on create and delete)
+    data = Column(JSON, nullable=False)
+    # Prior values of the changed fields, for updates
+    previous = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # One loan's history in id order, for the keyset scan in iter_history
+        Index("ix_mortgage_events_mortgage_id", "mortgage_id", "id"),
+    )
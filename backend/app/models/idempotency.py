@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, SmallInteger, String, Text
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response for a client-supplied Idempotency-Key."""
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    # SHA-256 of method, path and body, to catch a key reused for another request
+    fingerprint = Column(String(64), nullable=False)
+
+    status_code = Column(SmallInteger, nullable=False)
+    response_body = Column(Text, nullable=False)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
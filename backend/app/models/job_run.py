@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, String, DateTime
+from app.database import Base
+
+
+class JobRun(Base):
+    """Record of a background job run, with throughput metrics."""
+
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True)
+    job_name = Column(String(50), nullable=False, index=True)
+    status = Column(String(20), nullable=False)
+
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    rows_processed = Column(Integer, default=0)
+    rows_per_second = Column(Float, nullable=True)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Date, Index
+from app.database import Base
+
+
+class MortgageMilestone(Base):
+    """Materialized foreclosure milestone dates for delinquent mortgages."""
+
+    __tablename__ = "mortgage_milestones"
+
+    id = Column(Integer, primary_key=True)
+    mortgage_id = Column(Integer, nullable=False, index=True)
+
+    stage = Column(String(50), nullable=False)
+    days_from_first_missed = Column(Integer, nullable=False)
+    estimated_date = Column(Date, nullable=False)
+
+    __table_args__ = (
+        # Range scans over a date window, optionally narrowed to one stage
+        Index("ix_mortgage_milestones_date_stage", "estimated_date", "stage"),
+    )
@@ -1,20 +1,21 @@
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, Float, String, Date, DateTime
+from sqlalchemy import Column, Integer, String, Date, DateTime
 from app.database import Base
+from app.money import BasisPoints, Cents
 
 
-class Mortgage(Base):
-    __tablename__ = "mortgages"
+class MortgageFields:
+    """Columns shared by mortgages and mortgages_archive."""
 
     id = Column(Integer, primary_key=True, index=True)
 
-    # Loan details
-    loan_amount = Column(Float, nullable=False)
-    current_balance = Column(Float, nullable=False)
-    interest_rate = Column(Float, nullable=False)
+    # Loan details (amounts stored as cents, rates as basis points)
+    loan_amount = Column(Cents, nullable=False)
+    current_balance = Column(Cents, nullable=False)
+    interest_rate = Column(BasisPoints, nullable=False)
     loan_term_months = Column(Integer, nullable=False)
     remaining_months = Column(Integer, nullable=False)
-    monthly_payment = Column(Float, nullable=False)
+    monthly_payment = Column(Cents, nullable=False)
 
     # Dates
     loan_start_date = Column(Date, nullable=False)
@@ -24,9 +25,9 @@ class Mortgage(Base):
     missed_payments = Column(Integer, default=0)
 
     # Financial info
-    monthly_income = Column(Float, nullable=True)
-    monthly_expenses = Column(Float, default=0)
-    property_value = Column(Float, nullable=True)
+    monthly_income = Column(Cents, nullable=True)
+    monthly_expenses = Column(Cents, default=0)
+    property_value = Column(Cents, nullable=True)
 
     # Location
     state = Column(String(2), nullable=False)
@@ -35,3 +36,9 @@ class Mortgage(Base):
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Mortgage(MortgageFields, Base):
+    __tablename__ = "mortgages"
+    # Archived ids stay readable, so SQLite must never hand out the max id again
+    __table_args__ = {"sqlite_autoincrement": True}
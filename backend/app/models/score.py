@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Float, String, Date
+from app.database import Base
+
+
+class MortgageScore(Base):
+    """Materialized date-dependent risk data, refreshed by the daily re-score."""
+
+    __tablename__ = "mortgage_scores"
+
+    mortgage_id = Column(Integer, primary_key=True)
+
+    days_past_due = Column(Integer, nullable=False)
+    next_payment_due = Column(Date, nullable=False)
+    dti_ratio = Column(Float, nullable=False)
+    risk_level = Column(String(10), nullable=False, index=True)
+    foreclosure_stage = Column(String(20), nullable=False, index=True)
+    # Sorted, comma-separated WarningType values
+    warning_types = Column(String(200), nullable=False, default="")
+
+    scored_on = Column(Date, nullable=False)
@@ -0,0 +1,22 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+from app.database import Base
+
+
+class MortgageTransition(Base):
+    """Risk level, foreclosure stage or warning set changes found on rescore."""
+
+    __tablename__ = "mortgage_transitions"
+
+    # BIGINT on servers; SQLite only autoincrements INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    mortgage_id = Column(Integer, nullable=False, index=True)
+
+    risk_level = Column(String(10), nullable=False)
+    previous_risk_level = Column(String(10), nullable=False)
+    foreclosure_stage = Column(String(20), nullable=False)
+    previous_foreclosure_stage = Column(String(20), nullable=False)
+    warning_types = Column(String(200), nullable=False)
+    previous_warning_types = Column(String(200), nullable=False)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,77 @@
+"""Exact money: amounts as integer cents, interest rates as basis points.
+
+The database stores amounts as BIGINT cents and rates as INTEGER basis
+points (hundredths of a percent). The ORM attributes and the API keep
+working in dollars and percent; values are converted once at the column
+boundary with half-up rounding, so stored amounts, and sums over them, are
+exact. Calculations that add or multiply amounts do so in cents.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional
+from sqlalchemy import BigInteger, Integer
+from sqlalchemy.types import TypeDecorator
+
+
+def _scale_half_up(value: float, factor: int) -> int:
+    # str() gives the shortest repr, so 0.285 scales to exactly 28.5, not 28.4999...
+    return int((Decimal(str(value)) * factor).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_cents(dollars: float) -> int:
+    """Dollars to integer cents, rounding half up."""
+    return _scale_half_up(dollars, 100)
+
+
+def to_dollars(cents: int) -> float:
+    return cents / 100
+
+
+def round_cents(dollars: float) -> float:
+    """Round a computed dollar amount to the cent, half up."""
+    return to_dollars(to_cents(dollars))
+
+
+def to_bps(percent: float) -> int:
+    """Percent to integer basis points, rounding half up."""
+    return _scale_half_up(percent, 100)
+
+
+def to_percent(bps: int) -> float:
+    return bps / 100
+
+
+def round_bps(percent: float) -> float:
+    """Round a rate to the basis point, half up."""
+    return to_percent(to_bps(percent))
+
+
+def apply_bps(cents: int, bps: int) -> int:
+    """bps basis points of a non-negative amount, in cents, rounding half up."""
+    return (cents * bps + 5000) // 10000
+
+
+class Cents(TypeDecorator):
+    """Dollar amount stored as BIGINT cents."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        return None if value is None else to_cents(value)
+
+    def process_result_value(self, value, dialect) -> Optional[float]:
+        # int() as SQLite columns migrated in place keep REAL affinity
+        return None if value is None else to_dollars(int(value))
+
+
+class BasisPoints(TypeDecorator):
+    """Percentage rate stored as INTEGER basis points."""
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        return None if value is None else to_bps(value)
+
+    def process_result_value(self, value, dialect) -> Optional[float]:
+        return None if value is None else to_percent(int(value))
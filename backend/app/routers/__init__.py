@@ -1,4 +1,13 @@
 from app.routers.mortgages import router as mortgages_router
 from app.routers.calculations import router as calculations_router
+from app.routers.portfolio import router as portfolio_router
+from app.routers.changes import router as changes_router
+from app.routers.transitions import router as transitions_router
 
-__all__ = ["mortgages_router", "calculations_router"]
+__all__ = [
+    "mortgages_router",
+    "calculations_router",
+    "portfolio_router",
+    "changes_router",
+    "transitions_router",
+]
@@ -1,6 +1,10 @@
-from typing import List
-from fastapi import APIRouter
+from functools import lru_cache
+from typing import List, Optional
+from fastapi import APIRouter, Header
+from pydantic import TypeAdapter
 
+from app.compute import CALC_TIMEOUTS, compute_pool
+from app.middleware.compression import PrecompressedPayload
 from app.schemas.mortgage import (
     PaymentCalculationRequest,
     PaymentCalculationResponse,
@@ -13,23 +17,25 @@ router = APIRouter(prefix="/api/v1", tags=["calculations"])
 
 
 @router.post("/calculate/payment", response_model=PaymentCalculationResponse)
-def calculate_payment(request: PaymentCalculationRequest):
+async def calculate_payment(request: PaymentCalculationRequest):
     """Calculate monthly payment for given loan parameters."""
-    monthly_payment = CalculationService.calculate_monthly_payment(
-        request.principal, request.annual_rate, request.term_months
-    )
-    total_interest = CalculationService.calculate_total_interest(
-        request.principal, monthly_payment, request.term_months
+    return await compute_pool.run(
+        CalculationService.get_payment_calculation,
+        request.principal,
+        request.annual_rate,
+        request.term_months,
+        timeout=CALC_TIMEOUTS["payment"],
     )
 
-    return PaymentCalculationResponse(
-        monthly_payment=round(monthly_payment, 2),
-        total_interest=round(total_interest, 2),
-        total_cost=round(request.principal + total_interest, 2),
-    )
+
+@lru_cache(maxsize=1)
+def states_payload() -> PrecompressedPayload:
+    """The state catalogue never changes at runtime, so it is encoded once."""
+    states = StateService.get_all_states()
+    return PrecompressedPayload(TypeAdapter(List[StateInfo]).dump_json(states))
 
 
 @router.get("/states", response_model=List[StateInfo])
-def list_states():
+def list_states(accept_encoding: Optional[str] = Header(default=None)):
     """List all states with foreclosure information."""
-    return StateService.get_all_states()
+    return states_payload().response(accept_encoding)
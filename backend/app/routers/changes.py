@@ -0,0 +1,60 @@
+import asyncio
+import os
+import time
+from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.mortgage import ChangeFeedPage
+from app.services.changes import ChangeFeedService
+
+router = APIRouter(prefix="/api/v1/changes", tags=["changes"])
+
+# Seconds between checks for new events while a long-poll waits
+CHANGE_FEED_POLL_INTERVAL = float(os.getenv("CHANGE_FEED_POLL_INTERVAL", "0.5"))
+
+
+@router.get("", response_model=ChangeFeedPage)
+async def list_changes(
+    cursor: int = Query(default=0, ge=0),
+    limit: int = Query(default=ChangeFeedService.PAGE_SIZE, ge=1, le=5000),
+    wait: float = Query(default=0, ge=0, le=30, description="Seconds to wait for changes"),
+    db: Session = Depends(get_db),
+):
+    """
+    Mortgages created, updated or deleted after a cursor. Pass the returned
+    next_cursor on the following call; with wait, an empty page is held
+    open until a change arrives or the wait runs out.
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        page = await run_in_threadpool(ChangeFeedService.read, db, cursor, limit)
+        if page.changes or time.monotonic() >= deadline:
+            return page
+        # End the read transaction so the next poll sees newly committed events
+        await run_in_threadpool(db.rollback)
+        await asyncio.sleep(min(CHANGE_FEED_POLL_INTERVAL, max(0, deadline - time.monotonic())))
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def stream_changes(
+    cursor: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Stream every change after a cursor as newline-delimited JSON."""
+
+    def stream():
+        # The response outlives the get_db dependency, so close here too
+        try:
+            for change in ChangeFeedService.iter_changes(db, cursor):
+                yield change.model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -1,21 +1,40 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import Any, Callable, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import Table, null, select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.clock import get_today
+from app.compute import CALC_TIMEOUTS, compute_pool, detach
+from app.database import get_db, get_read_db
+from app.models.archive import ArchivedMortgage
 from app.models.mortgage import Mortgage
 from app.schemas.mortgage import (
+    ArchiveReason,
     MortgageCreate,
     MortgageUpdate,
     MortgageResponse,
+    MortgageEventResponse,
+    MortgageBulkCreateRequest,
+    MortgageBulkUpdateRequest,
+    MortgageBulkUpdateResult,
     PaymentDashboard,
     ModificationScenario,
     DeadlineInfo,
     Warning,
     GuidanceResponse,
+    RiskProjection,
 )
+from app.services.archive import ArchiveService
 from app.services.calculations import CalculationService
 from app.services.guidance import GuidanceService
+from app.services.events import EventService
+from app.services.idempotency import IdempotencyService
+from app.services.mortgages import MortgageService
+from app.singleflight import analytics_flight
 
 router = APIRouter(prefix="/api/v1/mortgages", tags=["mortgages"])
 
@@ -31,83 +50,304 @@ def get_mortgage_or_404(mortgage_id: int, db: Session) -> Mortgage:
     return mortgage
 
 
+def coalesce(
+    route: str,
+    mortgage_id: int,
+    today: date,
+    db: Session,
+    compute: Callable[[Mortgage, date], Any],
+) -> Any:
+    """
+    Run compute(mortgage, today) once for concurrent identical requests.
+    Only updated_at is read up front; it is part of the key, so a request
+    arriving after a write never shares a result computed before it.
+    """
+    updated_at = db.scalar(select(Mortgage.updated_at).where(Mortgage.id == mortgage_id))
+    if updated_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Mortgage not found",
+        )
+    return analytics_flight.do(
+        (route, mortgage_id, updated_at, today),
+        lambda: compute(get_mortgage_or_404(mortgage_id, db), today),
+    )
+
+
+MORTGAGE_FIELDS = tuple(MortgageResponse.model_fields)
+
+FieldsQuery = Query(
+    default=None,
+    description="Comma-separated fields to return, e.g. state,current_balance. "
+    "id is always included.",
+)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Requested fields in response order, always with id; None means all."""
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(MORTGAGE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    requested.add("id")
+    return [name for name in MORTGAGE_FIELDS if name in requested]
+
+
+def select_fields(table: Table, names: List[str]):
+    """
+    Core SELECT of just the requested columns, skipping ORM hydration.
+    Fields the table doesn't have (archive-only ones) come back null.
+    """
+    return select(
+        *(table.c[name] if name in table.c else null().label(name) for name in names)
+    )
+
+
 @router.get("", response_model=List[MortgageResponse])
-def list_mortgages(db: Session = Depends(get_db)):
+def list_mortgages(fields: Optional[str] = FieldsQuery, db: Session = Depends(get_read_db)):
     """List all mortgages."""
-    return db.query(Mortgage).all()
+    names = parse_fields(fields)
+    if names is None:
+        return db.query(Mortgage).all()
+    table = Mortgage.__table__
+    rows = db.execute(select_fields(table, names).order_by(table.c.id)).mappings()
+    return JSONResponse(jsonable_encoder([dict(row) for row in rows]))
+
+
+IdempotencyKeyHeader = Header(
+    default=None,
+    max_length=255,
+    description="Client-generated key; a retry with the same key replays the first response",
+)
 
 
 @router.post("", response_model=MortgageResponse, status_code=status.HTTP_201_CREATED)
-def create_mortgage(mortgage: MortgageCreate, db: Session = Depends(get_db)):
+def create_mortgage(
+    mortgage: MortgageCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+):
     """Create a new mortgage to track."""
-    db_mortgage = Mortgage(**mortgage.model_dump())
-    db.add(db_mortgage)
-    db.commit()
-    db.refresh(db_mortgage)
-    return db_mortgage
+
+    def write():
+        return MortgageResponse.model_validate(MortgageService.create(db, mortgage.model_dump()))
+
+    return IdempotencyService.run(
+        db,
+        idempotency_key,
+        IdempotencyService.fingerprint(request, mortgage),
+        status.HTTP_201_CREATED,
+        write,
+    )
+
+
+@router.post(
+    "/bulk", response_model=List[MortgageResponse], status_code=status.HTTP_201_CREATED
+)
+def bulk_create_mortgages(
+    bulk: MortgageBulkCreateRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+):
+    """Create many mortgages in one transaction."""
+
+    def write():
+        mortgages = MortgageService.bulk_create(db, [m.model_dump() for m in bulk.mortgages])
+        return [MortgageResponse.model_validate(mortgage) for mortgage in mortgages]
+
+    return IdempotencyService.run(
+        db,
+        idempotency_key,
+        IdempotencyService.fingerprint(request, bulk),
+        status.HTTP_201_CREATED,
+        write,
+    )
+
+
+@router.patch("", response_model=List[MortgageBulkUpdateResult])
+def bulk_update_mortgages(
+    bulk: MortgageBulkUpdateRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+):
+    """
+    Apply partial updates to many mortgages, keyed by id, in chunked
+    transactions. Returns a status per update in request order; updates
+    left when the deadline passes after a committed chunk are SKIPPED. With
+    an Idempotency-Key the whole batch and the key commit as one transaction.
+    """
+    updates = [item.model_dump(exclude_unset=True) for item in bulk.updates]
+    return IdempotencyService.run(
+        db,
+        idempotency_key,
+        IdempotencyService.fingerprint(request, updates),
+        status.HTTP_200_OK,
+        lambda: MortgageService.bulk_update(db, updates, commit=idempotency_key is None),
+    )
 
 
 @router.get("/{mortgage_id}", response_model=MortgageResponse)
-def get_mortgage(mortgage_id: int, db: Session = Depends(get_db)):
-    """Get mortgage details."""
-    return get_mortgage_or_404(mortgage_id, db)
+def get_mortgage(
+    mortgage_id: int, fields: Optional[str] = FieldsQuery, db: Session = Depends(get_read_db)
+):
+    """Get mortgage details, including archived loans."""
+    names = parse_fields(fields)
+    if names is None:
+        mortgage = ArchiveService.get(db, mortgage_id)
+        if mortgage is not None:
+            return mortgage
+    else:
+        for table in (Mortgage.__table__, ArchivedMortgage.__table__):
+            row = db.execute(
+                select_fields(table, names).where(table.c.id == mortgage_id)
+            ).mappings().first()
+            if row is not None:
+                return JSONResponse(jsonable_encoder(dict(row)))
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Mortgage not found",
+    )
 
 
 @router.put("/{mortgage_id}", response_model=MortgageResponse)
 def update_mortgage(
-    mortgage_id: int, mortgage_update: MortgageUpdate, db: Session = Depends(get_db)
+    mortgage_id: int,
+    mortgage_update: MortgageUpdate,
+    request: Request,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
 ):
     """Update an existing mortgage."""
-    db_mortgage = get_mortgage_or_404(mortgage_id, db)
-
     update_data = mortgage_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_mortgage, field, value)
 
-    db.commit()
-    db.refresh(db_mortgage)
-    return db_mortgage
+    def write():
+        db_mortgage = get_mortgage_or_404(mortgage_id, db)
+        MortgageService.update(db, db_mortgage, update_data)
+        db.flush()
+        return MortgageResponse.model_validate(db_mortgage)
+
+    return IdempotencyService.run(
+        db,
+        idempotency_key,
+        IdempotencyService.fingerprint(request, update_data),
+        status.HTTP_200_OK,
+        write,
+    )
 
 
 @router.delete("/{mortgage_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_mortgage(mortgage_id: int, db: Session = Depends(get_db)):
     """Delete a mortgage."""
     db_mortgage = get_mortgage_or_404(mortgage_id, db)
-    db.delete(db_mortgage)
+    MortgageService.delete(db, db_mortgage)
     db.commit()
     return None
 
 
+@router.post("/{mortgage_id}/archive", response_model=MortgageResponse)
+def archive_mortgage(mortgage_id: int, db: Session = Depends(get_db)):
+    """
+    Move a resolved loan to the archive. It stays readable by id but leaves
+    listings, portfolio reports and batch jobs.
+    """
+    db_mortgage = get_mortgage_or_404(mortgage_id, db)
+    archived = ArchiveService.archive(db, db_mortgage, ArchiveReason.RESOLVED)
+    db.commit()
+    return archived
+
+
+@router.get(
+    "/{mortgage_id}/history",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def get_history(mortgage_id: int, db: Session = Depends(get_db)):
+    """
+    Stream a mortgage's change events, oldest first, as newline-delimited
+    JSON. History outlives the mortgage, so deleted loans still have one.
+    """
+    if not EventService.has_history(db, mortgage_id):
+        get_mortgage_or_404(mortgage_id, db)
+
+    def stream():
+        # The response outlives the get_db dependency, so close here too
+        try:
+            for event in EventService.iter_history(db, mortgage_id):
+                yield MortgageEventResponse.model_validate(event).model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.get("/{mortgage_id}/dashboard", response_model=PaymentDashboard)
-def get_payment_dashboard(mortgage_id: int, db: Session = Depends(get_db)):
+def get_payment_dashboard(
+    mortgage_id: int, db: Session = Depends(get_read_db), today: date = Depends(get_today)
+):
     """Get payment dashboard for a mortgage."""
-    mortgage = get_mortgage_or_404(mortgage_id, db)
-    return CalculationService.get_payment_dashboard(mortgage)
+    return coalesce(
+        "dashboard", mortgage_id, today, db, CalculationService.get_payment_dashboard
+    )
 
 
 @router.get("/{mortgage_id}/scenarios", response_model=List[ModificationScenario])
-def get_modification_scenarios(mortgage_id: int, db: Session = Depends(get_db)):
+async def get_modification_scenarios(mortgage_id: int, db: Session = Depends(get_read_db)):
     """Get loan modification scenarios."""
-    mortgage = get_mortgage_or_404(mortgage_id, db)
-    return CalculationService.get_modification_scenarios(mortgage)
+    mortgage = await run_in_threadpool(get_mortgage_or_404, mortgage_id, db)
+    return await compute_pool.run(
+        CalculationService.get_modification_scenarios,
+        detach(mortgage),
+        timeout=CALC_TIMEOUTS["scenarios"],
+    )
 
 
 @router.get("/{mortgage_id}/deadlines", response_model=DeadlineInfo)
-def get_deadlines(mortgage_id: int, db: Session = Depends(get_db)):
+def get_deadlines(
+    mortgage_id: int, db: Session = Depends(get_read_db), today: date = Depends(get_today)
+):
     """Get foreclosure deadlines and timeline."""
-    mortgage = get_mortgage_or_404(mortgage_id, db)
-    return GuidanceService.get_deadline_info(mortgage)
+    return coalesce("deadlines", mortgage_id, today, db, GuidanceService.get_deadline_info)
 
 
 @router.get("/{mortgage_id}/warnings", response_model=List[Warning])
-def get_warnings(mortgage_id: int, db: Session = Depends(get_db)):
+def get_warnings(
+    mortgage_id: int, db: Session = Depends(get_read_db), today: date = Depends(get_today)
+):
     """Get active warnings for a mortgage."""
-    mortgage = get_mortgage_or_404(mortgage_id, db)
-    return GuidanceService.get_warnings(mortgage)
+    return coalesce("warnings", mortgage_id, today, db, GuidanceService.get_warnings)
+
+
+@router.get("/{mortgage_id}/projection", response_model=RiskProjection)
+def get_projection(
+    mortgage_id: int,
+    days: int = Query(default=180, ge=1, le=730),
+    db: Session = Depends(get_read_db),
+    today: date = Depends(get_today),
+):
+    """Project days past due and foreclosure stage for each of the next N days."""
+    # Imported on first use to keep NumPy off the startup path
+    from app.services.portfolio import PortfolioService
+
+    columns = PortfolioService.load(db, ids=[mortgage_id])
+    if not len(columns):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Mortgage not found",
+        )
+    return PortfolioService.project(columns, today, days)[0]
 
 
 @router.get("/{mortgage_id}/guidance", response_model=GuidanceResponse)
-def get_guidance(mortgage_id: int, db: Session = Depends(get_db)):
+def get_guidance(
+    mortgage_id: int, db: Session = Depends(get_read_db), today: date = Depends(get_today)
+):
     """Get step-by-step guidance for avoiding foreclosure."""
-    mortgage = get_mortgage_or_404(mortgage_id, db)
-    return GuidanceService.get_guidance(mortgage)
+    return coalesce("guidance", mortgage_id, today, db, GuidanceService.get_guidance)
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.clock import Clock, get_clock, get_today
+from app.database import get_read_db
+from app.deadlines import check_deadline
+from app.schemas.mortgage import (
+    PortfolioWarning,
+    ProjectionRequest,
+    RiskProjection,
+    UpcomingMilestone,
+    WarningSeverity,
+)
+from app.services.milestones import MilestoneService
+
+router = APIRouter(prefix="/api/v1", tags=["portfolio"])
+
+
+@router.get("/deadlines/upcoming", response_model=List[UpcomingMilestone])
+def list_upcoming_deadlines(
+    days: int = Query(default=14, ge=0, le=365),
+    start: Optional[date] = None,
+    stage: Optional[str] = None,
+    state: Optional[str] = Query(default=None, min_length=2, max_length=2),
+    db: Session = Depends(get_read_db),
+    clock: Clock = Depends(get_clock),
+):
+    """List mortgages crossing a foreclosure milestone in the next N days."""
+    start = start or clock.today()
+    end = start + timedelta(days=days)
+    return MilestoneService.find_upcoming(db, start, end, stage=stage, state=state)
+
+
+@router.get("/warnings", response_model=List[PortfolioWarning])
+def list_warnings(
+    severity: Optional[List[WarningSeverity]] = Query(default=None),
+    state: Optional[str] = Query(default=None, min_length=2, max_length=2),
+    db: Session = Depends(get_read_db),
+    today: date = Depends(get_today),
+):
+    """List active warnings across all mortgages, optionally by severity."""
+    # Imported on first use to keep NumPy off the startup path
+    from app.services.portfolio import PortfolioService
+
+    warnings = []
+    for chunk in PortfolioService.iter_chunks(db, state=state):
+        warnings.extend(PortfolioService.find_warnings(chunk, today, severities=severity))
+    return warnings
+
+
+@router.post("/projections", response_model=List[RiskProjection])
+def project_mortgages(
+    request: ProjectionRequest,
+    db: Session = Depends(get_read_db),
+    clock: Clock = Depends(get_clock),
+):
+    """Project risk and foreclosure stage for a batch of mortgages over N days."""
+    # Imported on first use to keep NumPy off the startup path
+    from app.services.portfolio import PortfolioService
+
+    columns = PortfolioService.load(db, ids=request.mortgage_ids)
+    check_deadline()
+    return PortfolioService.project(columns, request.start or clock.today(), request.days)
@@ -0,0 +1,38 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.transitions import TransitionService
+from app.streaming import transition_broadcaster
+
+router = APIRouter(prefix="/api/v1/transitions", tags=["transitions"])
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_transitions(
+    state: Optional[List[str]] = Query(default=None),
+    mortgage_id: Optional[List[int]] = Query(default=None),
+    last_event_id: Optional[int] = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    """
+    Server-sent events for risk level, foreclosure stage and warning set
+    changes, optionally filtered by state or mortgage ids. Reconnect with
+    Last-Event-ID to resume. Without it the stream starts with the
+    transitions of the last CURSOR_SETTLE_SECONDS.
+    """
+    if last_event_id is None:
+        last_event_id = await run_in_threadpool(TransitionService.latest_id, db)
+    subscription = transition_broadcaster.subscribe(last_event_id, state, mortgage_id)
+    return StreamingResponse(
+        transition_broadcaster.events(db, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,14 +2,29 @@ from app.schemas.mortgage import (
     MortgageCreate,
     MortgageUpdate,
     MortgageResponse,
+    MortgageBulkCreateRequest,
+    MortgageBulkUpdateItem,
+    MortgageBulkUpdateRequest,
+    MortgageBulkUpdateResult,
+    BulkUpdateStatus,
+    MortgageEventType,
+    ArchiveReason,
+    MortgageEventResponse,
+    MortgageChange,
+    ChangeFeedPage,
+    RiskTransition,
     PaymentDashboard,
     ModificationScenario,
     DeadlineInfo,
     Milestone,
+    UpcomingMilestone,
     Warning,
+    PortfolioWarning,
     GuidanceResponse,
     GuidanceStep,
     Resource,
+    RiskProjection,
+    ProjectionRequest,
     PaymentCalculationRequest,
     PaymentCalculationResponse,
     StateInfo,
@@ -20,14 +35,29 @@ __all__ = [
     "MortgageCreate",
     "MortgageUpdate",
     "MortgageResponse",
+    "MortgageBulkCreateRequest",
+    "MortgageBulkUpdateItem",
+    "MortgageBulkUpdateRequest",
+    "MortgageBulkUpdateResult",
+    "BulkUpdateStatus",
+    "MortgageEventType",
+    "ArchiveReason",
+    "MortgageEventResponse",
+    "MortgageChange",
+    "ChangeFeedPage",
+    "RiskTransition",
     "PaymentDashboard",
     "ModificationScenario",
     "DeadlineInfo",
     "Milestone",
+    "UpcomingMilestone",
     "Warning",
+    "PortfolioWarning",
     "GuidanceResponse",
     "GuidanceStep",
     "Resource",
+    "RiskProjection",
+    "ProjectionRequest",
     "PaymentCalculationRequest",
     "PaymentCalculationResponse",
     "StateInfo",
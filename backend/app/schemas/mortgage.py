@@ -1,8 +1,10 @@
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from enum import Enum
 from pydantic import BaseModel, Field, field_validator
 
+from app.money import round_bps, round_cents
+
 
 class RiskLevel(str, Enum):
     LOW = "LOW"
@@ -74,6 +76,36 @@ class ResourceType(str, Enum):
     FINANCIAL = "FINANCIAL"
 
 
+class BulkUpdateStatus(str, Enum):
+    UPDATED = "UPDATED"
+    UNCHANGED = "UNCHANGED"
+    NOT_FOUND = "NOT_FOUND"
+    # Not applied: the request deadline passed after earlier chunks committed
+    SKIPPED = "SKIPPED"
+
+
+class MortgageEventType(str, Enum):
+    CREATED = "CREATED"
+    UPDATED = "UPDATED"
+    DELETED = "DELETED"
+    ARCHIVED = "ARCHIVED"
+
+
+class ArchiveReason(str, Enum):
+    PAID_OFF = "PAID_OFF"
+    RESOLVED = "RESOLVED"
+
+
+MONEY_FIELDS = (
+    "loan_amount",
+    "current_balance",
+    "monthly_payment",
+    "monthly_income",
+    "monthly_expenses",
+    "property_value",
+)
+
+
 # Request/Response Schemas
 class MortgageCreate(BaseModel):
     loan_amount: float = Field(..., gt=0, le=10000000)
@@ -91,6 +123,18 @@ class MortgageCreate(BaseModel):
     state: str = Field(..., min_length=2, max_length=2)
     property_address: Optional[str] = None
 
+    @field_validator(*MONEY_FIELDS)
+    @classmethod
+    def round_money(cls, v: Optional[float]) -> Optional[float]:
+        # Round to what the database stores, so responses, events and
+        # scoring see the same values a later read returns
+        return None if v is None else round_cents(v)
+
+    @field_validator("interest_rate")
+    @classmethod
+    def round_rate(cls, v: float) -> float:
+        return round_bps(v)
+
     @field_validator("state")
     @classmethod
     def validate_state(cls, v: str) -> str:
@@ -105,9 +149,10 @@ class MortgageCreate(BaseModel):
 
 
 class MortgageUpdate(BaseModel):
-    current_balance: Optional[float] = Field(default=None, gt=0)
+    # Zero balance or remaining term marks a loan paid off
+    current_balance: Optional[float] = Field(default=None, ge=0)
     interest_rate: Optional[float] = Field(default=None, ge=0.1, le=25)
-    remaining_months: Optional[int] = Field(default=None, ge=1)
+    remaining_months: Optional[int] = Field(default=None, ge=0)
     monthly_payment: Optional[float] = Field(default=None, gt=0)
     last_payment_date: Optional[date] = None
     missed_payments: Optional[int] = Field(default=None, ge=0)
@@ -116,16 +161,89 @@ class MortgageUpdate(BaseModel):
     property_value: Optional[float] = Field(default=None, ge=0)
     property_address: Optional[str] = None
 
+    @field_validator(*MONEY_FIELDS[1:])
+    @classmethod
+    def round_money(cls, v: Optional[float]) -> Optional[float]:
+        return None if v is None else round_cents(v)
+
+    @field_validator("interest_rate")
+    @classmethod
+    def round_rate(cls, v: Optional[float]) -> Optional[float]:
+        return None if v is None else round_bps(v)
+
+
+class MortgageBulkCreateRequest(BaseModel):
+    mortgages: List[MortgageCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class MortgageBulkUpdateItem(MortgageUpdate):
+    id: int
+
+
+class MortgageBulkUpdateRequest(BaseModel):
+    updates: List[MortgageBulkUpdateItem] = Field(..., min_length=1, max_length=50000)
+
+
+class MortgageBulkUpdateResult(BaseModel):
+    id: int
+    status: BulkUpdateStatus
+
 
 class MortgageResponse(MortgageCreate):
     id: int
+    # Paid-off loans reach zero, which creation doesn't allow
+    current_balance: float = Field(..., ge=0)
+    remaining_months: int = Field(..., ge=0)
     created_at: datetime
     updated_at: datetime
+    # Set once the loan has moved to the archive
+    archived_at: Optional[datetime] = None
+    archive_reason: Optional[ArchiveReason] = None
+
+    class Config:
+        from_attributes = True
+
+
+class MortgageEventResponse(BaseModel):
+    id: int
+    mortgage_id: int
+    event_type: MortgageEventType
+    data: Dict[str, Any]
+    previous: Optional[Dict[str, Any]] = None
+    created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class MortgageChange(BaseModel):
+    cursor: int
+    mortgage_id: int
+    change_type: MortgageEventType
+    changed_at: datetime
+    # Current row; omitted for deletes and archives
+    mortgage: Optional[MortgageResponse] = None
+
+
+class ChangeFeedPage(BaseModel):
+    changes: List[MortgageChange]
+    next_cursor: int
+    has_more: bool
+
+
+class RiskTransition(BaseModel):
+    id: int
+    mortgage_id: int
+    state: Optional[str] = None
+    risk_level: RiskLevel
+    previous_risk_level: RiskLevel
+    foreclosure_stage: ForeclosureStage
+    previous_foreclosure_stage: ForeclosureStage
+    warnings: List[WarningType]
+    previous_warnings: List[WarningType]
+    created_at: datetime
+
+
 class PaymentDashboard(BaseModel):
     mortgage_id: int
     current_monthly_payment: float
@@ -170,6 +288,15 @@ class DeadlineInfo(BaseModel):
     milestones: List[Milestone]
 
 
+class UpcomingMilestone(BaseModel):
+    mortgage_id: int
+    state: str
+    stage: str
+    days_from_first_missed: int
+    estimated_date: date
+    days_until: int
+
+
 class Warning(BaseModel):
     type: WarningType
     severity: WarningSeverity
@@ -179,6 +306,10 @@ class Warning(BaseModel):
     deadline: Optional[date] = None
 
 
+class PortfolioWarning(Warning):
+    mortgage_id: int
+
+
 class GuidanceStep(BaseModel):
     step_number: int
     title: str
@@ -206,6 +337,23 @@ class GuidanceResponse(BaseModel):
     lender_script: Optional[str] = None
 
 
+class RiskProjection(BaseModel):
+    """Day-by-day projection; entry i of each list is for start + i days."""
+
+    mortgage_id: int
+    start: date
+    risk_level: RiskLevel
+    days_past_due: List[int]
+    foreclosure_stage: List[ForeclosureStage]
+    notice_of_sale_date: Optional[date] = None
+
+
+class ProjectionRequest(BaseModel):
+    mortgage_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    start: Optional[date] = None
+    days: int = Field(default=180, ge=1, le=730)
+
+
 class PaymentCalculationRequest(BaseModel):
     principal: float = Field(..., gt=0)
     annual_rate: float = Field(..., ge=0.1, le=25)
@@ -0,0 +1,20 @@
+"""Production server worker for gunicorn (see gunicorn.conf.py)."""
+import os
+
+from uvicorn.workers import UvicornWorker as BaseUvicornWorker
+
+
+# Comma-separated proxy addresses whose X-Forwarded-For is trusted; the
+# client IP it carries keys the rate limiter, so "*" lets anyone pick theirs
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """Uvicorn worker pinned to the uvloop event loop and httptools parser."""
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "proxy_headers": True,
+        "forwarded_allow_ips": FORWARDED_ALLOW_IPS,
+    }
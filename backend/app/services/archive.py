@@ -0,0 +1,116 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional, Union
+from sqlalchemy import DateTime, String, and_, delete, insert, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.archive import ArchivedMortgage
+from app.models.mortgage import Mortgage
+from app.models.score import MortgageScore
+from app.schemas.mortgage import ArchiveReason, MortgageEventType
+from app.services.events import EventService
+from app.services.milestones import MilestoneService
+
+# Paid-off loans move to the archive once untouched for this many days
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+
+
+class ArchiveService:
+    """
+    Moves inactive loans from mortgages to mortgages_archive so list
+    endpoints, batch jobs and the table's indexes only cover active loans.
+    Archived loans drop their derived rows (scores, milestones) and keep
+    their id and event history.
+    """
+
+    BATCH_SIZE = 1000
+    AFTER = timedelta(days=ARCHIVE_AFTER_DAYS)
+    COLUMNS = tuple(Mortgage.__table__.columns.keys())
+
+    @classmethod
+    def archivable(cls, now: datetime):
+        """Paid-off loans with nothing owed in arrears, unchanged since the cutoff."""
+        return and_(
+            or_(Mortgage.current_balance <= 0, Mortgage.remaining_months <= 0),
+            Mortgage.missed_payments == 0,
+            Mortgage.updated_at < now - cls.AFTER,
+        )
+
+    @classmethod
+    def move(
+        cls,
+        db: Session,
+        mortgage_ids: List[int],
+        reason: ArchiveReason,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        Copy mortgages to the archive and remove them and their derived rows,
+        in the caller's transaction. Rows are copied server-side with
+        INSERT ... SELECT, so stored cents aren't converted on the way.
+        """
+        now = now or datetime.utcnow()
+        table = Mortgage.__table__
+        events = [
+            EventService.build(
+                mortgage.id, MortgageEventType.ARCHIVED, EventService.snapshot(mortgage)
+            )
+            for mortgage in db.scalars(select(Mortgage).where(Mortgage.id.in_(mortgage_ids)))
+        ]
+        db.execute(
+            insert(ArchivedMortgage).from_select(
+                [*cls.COLUMNS, "archived_at", "archive_reason"],
+                select(
+                    *(table.c[name] for name in cls.COLUMNS),
+                    literal(now, DateTime),
+                    literal(reason.value, String),
+                ).where(table.c.id.in_(mortgage_ids)),
+            )
+        )
+        MilestoneService.replace(db, mortgage_ids, [])
+        db.execute(delete(MortgageScore).where(MortgageScore.mortgage_id.in_(mortgage_ids)))
+        EventService.record(db, events)
+        db.execute(
+            delete(Mortgage).where(Mortgage.id.in_(mortgage_ids)),
+            execution_options={"synchronize_session": False},
+        )
+
+    @classmethod
+    def archive(cls, db: Session, mortgage: Mortgage, reason: ArchiveReason) -> ArchivedMortgage:
+        """Archive one mortgage in the caller's transaction."""
+        mortgage_id = mortgage.id
+        db.flush()
+        cls.move(db, [mortgage_id], reason)
+        db.expunge(mortgage)
+        return db.get(ArchivedMortgage, mortgage_id)
+
+    @classmethod
+    def archive_inactive(
+        cls, db: Session, batch_size: Optional[int] = None, now: Optional[datetime] = None
+    ) -> int:
+        """
+        Archive every paid-off loan past the cutoff, one transaction per batch
+        so locks stay short. Returns the number archived.
+        """
+        batch_size = batch_size or cls.BATCH_SIZE
+        now = now or datetime.utcnow()
+        archived = 0
+        last_id = 0
+        while True:
+            ids = db.scalars(
+                select(Mortgage.id)
+                .where(cls.archivable(now), Mortgage.id > last_id)
+                .order_by(Mortgage.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                return archived
+            cls.move(db, ids, ArchiveReason.PAID_OFF, now)
+            db.commit()
+            archived += len(ids)
+            last_id = ids[-1]
+
+    @staticmethod
+    def get(db: Session, mortgage_id: int) -> Optional[Union[Mortgage, ArchivedMortgage]]:
+        """A mortgage by id, from the hot table or else the archive."""
+        return db.get(Mortgage, mortgage_id) or db.get(ArchivedMortgage, mortgage_id)
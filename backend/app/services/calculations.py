@@ -1,18 +1,56 @@
 from datetime import date, timedelta
+from functools import lru_cache
 from typing import List, Optional
 from app.models.mortgage import Mortgage
+from app.money import apply_bps, round_cents, to_bps, to_cents, to_dollars, to_percent
 from app.schemas.mortgage import (
     PaymentDashboard,
+    PaymentCalculationResponse,
     ModificationScenario,
     RiskLevel,
     ScenarioType,
 )
 
 
+# Date-derived values are pure functions of their inputs and today's date,
+# so repeated calls within a day (across requests too) reuse the result.
+@lru_cache(maxsize=8192)
+def _days_past_due(
+    last_payment_date: Optional[date], missed_payments: int, today: date
+) -> int:
+    if missed_payments == 0:
+        return 0
+
+    if last_payment_date:
+        # Assume monthly payments, so each missed payment is ~30 days
+        days_since_last = (today - last_payment_date).days
+        return max(0, days_since_last - 30)  # Subtract grace period
+    else:
+        # No payment date, estimate based on missed payments
+        return missed_payments * 30
+
+
+@lru_cache(maxsize=8192)
+def _next_payment_due(last_payment_date: Optional[date], today: date) -> date:
+    if last_payment_date:
+        # Assume monthly payments every 30 days: the first due date on or
+        # after today, and at least one period after the last payment
+        elapsed = (today - last_payment_date).days
+        periods = max(1, -(-elapsed // 30))
+        return last_payment_date + timedelta(days=30 * periods)
+    else:
+        # No payment history, assume due on 1st of next month
+        if today.day == 1:
+            return today
+        if today.month == 12:
+            return date(today.year + 1, 1, 1)
+        return date(today.year, today.month + 1, 1)
+
+
 class CalculationService:
     """Service for mortgage payment and risk calculations."""
 
-    LATE_FEE_PERCENTAGE = 0.05  # 5% of monthly payment
+    LATE_FEE_BPS = 500  # 5% of monthly payment
 
     @staticmethod
     def calculate_monthly_payment(
@@ -34,25 +72,47 @@ class CalculationService:
     def calculate_total_interest(
         principal: float, monthly_payment: float, term_months: int
     ) -> float:
-        """Calculate total interest over the life of the loan."""
-        total_paid = monthly_payment * term_months
-        return total_paid - principal
+        """Calculate total interest over the life of the loan, in exact cents."""
+        total_paid = to_cents(monthly_payment) * term_months
+        return to_dollars(total_paid - to_cents(principal))
+
+    @classmethod
+    def get_payment_calculation(
+        cls, principal: float, annual_rate: float, term_months: int
+    ) -> PaymentCalculationResponse:
+        """Calculate payment, total interest and total cost for a loan."""
+        monthly_payment = round_cents(
+            cls.calculate_monthly_payment(principal, annual_rate, term_months)
+        )
+        total_interest = cls.calculate_total_interest(
+            principal, monthly_payment, term_months
+        )
+        return PaymentCalculationResponse(
+            monthly_payment=monthly_payment,
+            total_interest=total_interest,
+            total_cost=to_dollars(to_cents(principal) + to_cents(total_interest)),
+        )
 
     @staticmethod
     def calculate_dti_ratio(
         monthly_payment: float, monthly_expenses: float, monthly_income: float
     ) -> float:
-        """Calculate debt-to-income ratio."""
-        if monthly_income <= 0:
+        """
+        Calculate debt-to-income ratio. Computed from whole cents, so it
+        matches the int64 batch path exactly.
+        """
+        income = to_cents(monthly_income)
+        if income <= 0:
             return 100.0
-        return ((monthly_payment + monthly_expenses) / monthly_income) * 100
+        return (to_cents(monthly_payment) + to_cents(monthly_expenses)) * 100 / income
 
     @staticmethod
     def calculate_ltv_ratio(current_balance: float, property_value: float) -> float:
-        """Calculate loan-to-value ratio."""
-        if property_value <= 0:
+        """Calculate loan-to-value ratio from whole cents."""
+        value = to_cents(property_value)
+        if value <= 0:
             return 100.0
-        return (current_balance / property_value) * 100
+        return to_cents(current_balance) * 100 / value
 
     @classmethod
     def calculate_risk_level(
@@ -75,52 +135,39 @@ class CalculationService:
 
     @classmethod
     def calculate_days_past_due(
-        cls, last_payment_date: Optional[date], missed_payments: int
+        cls,
+        last_payment_date: Optional[date],
+        missed_payments: int,
+        today: Optional[date] = None,
     ) -> int:
         """Calculate days past due based on last payment and missed payments."""
-        if missed_payments == 0:
-            return 0
-
-        if last_payment_date:
-            # Assume monthly payments, so each missed payment is ~30 days
-            days_since_last = (date.today() - last_payment_date).days
-            return max(0, days_since_last - 30)  # Subtract grace period
-        else:
-            # No payment date, estimate based on missed payments
-            return missed_payments * 30
+        return _days_past_due(last_payment_date, missed_payments, today or date.today())
 
     @classmethod
     def calculate_arrears(cls, monthly_payment: float, missed_payments: int) -> float:
         """Calculate total amount in arrears."""
-        return monthly_payment * missed_payments
+        return to_dollars(to_cents(monthly_payment) * missed_payments)
 
     @classmethod
     def calculate_late_fees(
         cls, monthly_payment: float, missed_payments: int
     ) -> float:
         """Estimate late fees accrued."""
-        return monthly_payment * cls.LATE_FEE_PERCENTAGE * missed_payments
+        return to_dollars(
+            apply_bps(to_cents(monthly_payment) * missed_payments, cls.LATE_FEE_BPS)
+        )
 
     @classmethod
-    def get_next_payment_due(cls, last_payment_date: Optional[date]) -> date:
+    def get_next_payment_due(
+        cls, last_payment_date: Optional[date], today: Optional[date] = None
+    ) -> date:
         """Calculate next payment due date."""
-        if last_payment_date:
-            # Assume monthly payments on the same day
-            next_due = last_payment_date + timedelta(days=30)
-            while next_due < date.today():
-                next_due += timedelta(days=30)
-            return next_due
-        else:
-            # No payment history, assume due on 1st of next month
-            today = date.today()
-            if today.day == 1:
-                return today
-            if today.month == 12:
-                return date(today.year + 1, 1, 1)
-            return date(today.year, today.month + 1, 1)
+        return _next_payment_due(last_payment_date, today or date.today())
 
     @classmethod
-    def get_payment_dashboard(cls, mortgage: Mortgage) -> PaymentDashboard:
+    def get_payment_dashboard(
+        cls, mortgage: Mortgage, today: Optional[date] = None
+    ) -> PaymentDashboard:
         """Generate complete payment dashboard for a mortgage."""
         dti_ratio = cls.calculate_dti_ratio(
             mortgage.monthly_payment,
@@ -136,153 +183,119 @@ class CalculationService:
 
         return PaymentDashboard(
             mortgage_id=mortgage.id,
-            current_monthly_payment=round(mortgage.monthly_payment, 2),
+            current_monthly_payment=mortgage.monthly_payment,
             days_past_due=cls.calculate_days_past_due(
-                mortgage.last_payment_date, mortgage.missed_payments
+                mortgage.last_payment_date, mortgage.missed_payments, today
             ),
-            total_arrears=round(
-                cls.calculate_arrears(mortgage.monthly_payment, mortgage.missed_payments),
-                2,
+            total_arrears=cls.calculate_arrears(
+                mortgage.monthly_payment, mortgage.missed_payments
             ),
-            late_fees_estimate=round(
-                cls.calculate_late_fees(
-                    mortgage.monthly_payment, mortgage.missed_payments
-                ),
-                2,
+            late_fees_estimate=cls.calculate_late_fees(
+                mortgage.monthly_payment, mortgage.missed_payments
             ),
             risk_level=cls.calculate_risk_level(mortgage.missed_payments, dti_ratio),
             dti_ratio=round(dti_ratio, 1),
-            next_payment_due=cls.get_next_payment_due(mortgage.last_payment_date),
+            next_payment_due=cls.get_next_payment_due(mortgage.last_payment_date, today),
             ltv_ratio=round(ltv_ratio, 1) if ltv_ratio else None,
         )
 
+    @classmethod
+    def _build_scenario(
+        cls,
+        mortgage: Mortgage,
+        scenario_type: ScenarioType,
+        description: str,
+        principal_cents: int,
+        rate_bps: int,
+        term_months: int,
+        target_payment_cents: int,
+        deferred_cents: int = 0,
+    ) -> ModificationScenario:
+        """Price one scenario; every amount after the payment itself is exact cents."""
+        payment_cents = to_cents(
+            cls.calculate_monthly_payment(
+                to_dollars(principal_cents), to_percent(rate_bps), term_months
+            )
+        )
+        interest_cents = payment_cents * term_months - principal_cents
+        return ModificationScenario(
+            scenario_type=scenario_type,
+            description=description,
+            new_interest_rate=to_percent(rate_bps),
+            new_monthly_payment=to_dollars(payment_cents),
+            payment_change=to_dollars(payment_cents - to_cents(mortgage.monthly_payment)),
+            new_term_months=term_months,
+            term_change_months=term_months - mortgage.remaining_months,
+            total_interest=to_dollars(interest_cents),
+            total_cost=to_dollars(principal_cents + interest_cents + deferred_cents),
+            meets_affordability=payment_cents <= target_payment_cents,
+        )
+
     @classmethod
     def get_modification_scenarios(
         cls, mortgage: Mortgage
     ) -> List[ModificationScenario]:
-        """Generate loan modification scenarios."""
-        scenarios = []
+        """Generate loan modification scenarios; none for a paid-off or matured loan."""
+        balance = to_cents(mortgage.current_balance)
+        rate = to_bps(mortgage.interest_rate)
+        term = mortgage.remaining_months
+        if balance <= 0 or term <= 0:
+            return []
         monthly_income = mortgage.monthly_income or mortgage.monthly_payment * 4
 
         # Target: payment should be <= 31% of income for affordability
-        target_payment = monthly_income * 0.31
-
-        # Scenario 1: 1% Rate Reduction
-        new_rate_1 = max(0.1, mortgage.interest_rate - 1)
-        new_payment_1 = cls.calculate_monthly_payment(
-            mortgage.current_balance, new_rate_1, mortgage.remaining_months
-        )
-        total_interest_1 = cls.calculate_total_interest(
-            mortgage.current_balance, new_payment_1, mortgage.remaining_months
-        )
-        scenarios.append(
-            ModificationScenario(
-                scenario_type=ScenarioType.RATE_REDUCTION_1,
-                description="1% Interest Rate Reduction",
-                new_interest_rate=round(new_rate_1, 2),
-                new_monthly_payment=round(new_payment_1, 2),
-                payment_change=round(new_payment_1 - mortgage.monthly_payment, 2),
-                new_term_months=mortgage.remaining_months,
-                term_change_months=0,
-                total_interest=round(total_interest_1, 2),
-                total_cost=round(mortgage.current_balance + total_interest_1, 2),
-                meets_affordability=new_payment_1 <= target_payment,
-            )
-        )
+        target_payment = apply_bps(to_cents(monthly_income), 3100)
 
-        # Scenario 2: 2% Rate Reduction
-        new_rate_2 = max(0.1, mortgage.interest_rate - 2)
-        new_payment_2 = cls.calculate_monthly_payment(
-            mortgage.current_balance, new_rate_2, mortgage.remaining_months
-        )
-        total_interest_2 = cls.calculate_total_interest(
-            mortgage.current_balance, new_payment_2, mortgage.remaining_months
-        )
-        scenarios.append(
-            ModificationScenario(
-                scenario_type=ScenarioType.RATE_REDUCTION_2,
-                description="2% Interest Rate Reduction",
-                new_interest_rate=round(new_rate_2, 2),
-                new_monthly_payment=round(new_payment_2, 2),
-                payment_change=round(new_payment_2 - mortgage.monthly_payment, 2),
-                new_term_months=mortgage.remaining_months,
-                term_change_months=0,
-                total_interest=round(total_interest_2, 2),
-                total_cost=round(mortgage.current_balance + total_interest_2, 2),
-                meets_affordability=new_payment_2 <= target_payment,
-            )
-        )
-
-        # Scenario 3: 10-Year Term Extension
-        new_term_10 = mortgage.remaining_months + 120
-        new_payment_10 = cls.calculate_monthly_payment(
-            mortgage.current_balance, mortgage.interest_rate, new_term_10
-        )
-        total_interest_10 = cls.calculate_total_interest(
-            mortgage.current_balance, new_payment_10, new_term_10
-        )
-        scenarios.append(
-            ModificationScenario(
-                scenario_type=ScenarioType.TERM_EXTENSION_10,
-                description="10-Year Term Extension",
-                new_interest_rate=mortgage.interest_rate,
-                new_monthly_payment=round(new_payment_10, 2),
-                payment_change=round(new_payment_10 - mortgage.monthly_payment, 2),
-                new_term_months=new_term_10,
-                term_change_months=120,
-                total_interest=round(total_interest_10, 2),
-                total_cost=round(mortgage.current_balance + total_interest_10, 2),
-                meets_affordability=new_payment_10 <= target_payment,
-            )
-        )
-
-        # Scenario 4: 20-Year Term Extension
-        new_term_20 = mortgage.remaining_months + 240
-        new_payment_20 = cls.calculate_monthly_payment(
-            mortgage.current_balance, mortgage.interest_rate, new_term_20
-        )
-        total_interest_20 = cls.calculate_total_interest(
-            mortgage.current_balance, new_payment_20, new_term_20
-        )
-        scenarios.append(
-            ModificationScenario(
-                scenario_type=ScenarioType.TERM_EXTENSION_20,
-                description="20-Year Term Extension",
-                new_interest_rate=mortgage.interest_rate,
-                new_monthly_payment=round(new_payment_20, 2),
-                payment_change=round(new_payment_20 - mortgage.monthly_payment, 2),
-                new_term_months=new_term_20,
-                term_change_months=240,
-                total_interest=round(total_interest_20, 2),
-                total_cost=round(mortgage.current_balance + total_interest_20, 2),
-                meets_affordability=new_payment_20 <= target_payment,
-            )
-        )
-
-        # Scenario 5: Principal Forbearance (10% deferred)
-        forbearance_amount = mortgage.current_balance * 0.10
-        reduced_principal = mortgage.current_balance - forbearance_amount
-        new_payment_forb = cls.calculate_monthly_payment(
-            reduced_principal, mortgage.interest_rate, mortgage.remaining_months
-        )
-        total_interest_forb = cls.calculate_total_interest(
-            reduced_principal, new_payment_forb, mortgage.remaining_months
-        )
-        scenarios.append(
-            ModificationScenario(
-                scenario_type=ScenarioType.PRINCIPAL_FORBEARANCE,
-                description="10% Principal Forbearance (balloon at end)",
-                new_interest_rate=mortgage.interest_rate,
-                new_monthly_payment=round(new_payment_forb, 2),
-                payment_change=round(new_payment_forb - mortgage.monthly_payment, 2),
-                new_term_months=mortgage.remaining_months,
-                term_change_months=0,
-                total_interest=round(total_interest_forb, 2),
-                total_cost=round(
-                    reduced_principal + total_interest_forb + forbearance_amount, 2
-                ),
-                meets_affordability=new_payment_forb <= target_payment,
-            )
-        )
+        # Rate reductions floor at 0.1% (10 bps)
+        min_rate = 10
+        # 10% of principal deferred to a balloon at the end
+        forbearance = apply_bps(balance, 1000)
 
-        return scenarios
+        return [
+            cls._build_scenario(
+                mortgage,
+                ScenarioType.RATE_REDUCTION_1,
+                "1% Interest Rate Reduction",
+                balance,
+                max(min_rate, rate - 100),
+                term,
+                target_payment,
+            ),
+            cls._build_scenario(
+                mortgage,
+                ScenarioType.RATE_REDUCTION_2,
+                "2% Interest Rate Reduction",
+                balance,
+                max(min_rate, rate - 200),
+                term,
+                target_payment,
+            ),
+            cls._build_scenario(
+                mortgage,
+                ScenarioType.TERM_EXTENSION_10,
+                "10-Year Term Extension",
+                balance,
+                rate,
+                term + 120,
+                target_payment,
+            ),
+            cls._build_scenario(
+                mortgage,
+                ScenarioType.TERM_EXTENSION_20,
+                "20-Year Term Extension",
+                balance,
+                rate,
+                term + 240,
+                target_payment,
+            ),
+            cls._build_scenario(
+                mortgage,
+                ScenarioType.PRINCIPAL_FORBEARANCE,
+                "10% Principal Forbearance (balloon at end)",
+                balance - forbearance,
+                rate,
+                term,
+                target_payment,
+                deferred_cents=forbearance,
+            ),
+        ]
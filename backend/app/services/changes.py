@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.cursors import settled
+from app.models.event import MortgageEvent
+from app.models.mortgage import Mortgage
+from app.schemas.mortgage import ChangeFeedPage, MortgageChange, MortgageEventType
+
+
+class ChangeFeedService:
+    """
+    Incremental change feed over the mortgage event log. The cursor is the
+    event id. Events are served only once no uncommitted event can still
+    appear below them (see app.cursors), so a consumer that stores the last
+    cursor it saw can resume from it.
+    """
+
+    PAGE_SIZE = 500
+
+    @classmethod
+    def read(
+        cls,
+        db: Session,
+        cursor: int = 0,
+        limit: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> ChangeFeedPage:
+        """
+        Changes after a cursor. Several events for one mortgage within a
+        page collapse into one change carrying its current row; mortgages
+        that no longer exist come back as DELETED tombstones, or ARCHIVED
+        when they moved to the archive.
+        """
+        limit = limit or cls.PAGE_SIZE
+        events = db.execute(
+            select(
+                MortgageEvent.id,
+                MortgageEvent.mortgage_id,
+                MortgageEvent.event_type,
+                MortgageEvent.created_at,
+            )
+            .where(MortgageEvent.id > cursor)
+            .order_by(MortgageEvent.id)
+            .limit(limit)
+        ).all()
+        fetched = len(events)
+        events = settled(events, cursor, now)
+        if not events:
+            return ChangeFeedPage(changes=[], next_cursor=cursor, has_more=False)
+
+        # Last event per mortgage, ordered by that event's cursor
+        latest = {}
+        created = set()
+        for event in events:
+            latest.pop(event.mortgage_id, None)
+            latest[event.mortgage_id] = event
+            if event.event_type == MortgageEventType.CREATED.value:
+                created.add(event.mortgage_id)
+        mortgages = {
+            mortgage.id: mortgage
+            for mortgage in db.scalars(select(Mortgage).where(Mortgage.id.in_(latest)))
+        }
+
+        changes = []
+        for mortgage_id, event in latest.items():
+            mortgage = mortgages.get(mortgage_id)
+            if mortgage is None:
+                change_type = (
+                    MortgageEventType.ARCHIVED
+                    if event.event_type == MortgageEventType.ARCHIVED.value
+                    else MortgageEventType.DELETED
+                )
+            elif mortgage_id in created:
+                change_type = MortgageEventType.CREATED
+            else:
+                change_type = MortgageEventType.UPDATED
+            changes.append(
+                MortgageChange(
+                    cursor=event.id,
+                    mortgage_id=mortgage_id,
+                    change_type=change_type,
+                    changed_at=event.created_at,
+                    mortgage=mortgage,
+                )
+            )
+        return ChangeFeedPage(
+            changes=changes, next_cursor=events[-1].id, has_more=len(events) == fetched == limit
+        )
+
+    @classmethod
+    def iter_changes(
+        cls, db: Session, cursor: int = 0, limit: Optional[int] = None
+    ) -> Iterator[MortgageChange]:
+        """Yield every change after a cursor, page by page, until caught up."""
+        while True:
+            page = cls.read(db, cursor, limit)
+            yield from page.changes
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
@@ -0,0 +1,102 @@
+from datetime import date
+from typing import Iterator, List, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models.event import MortgageEvent
+from app.models.mortgage import Mortgage
+from app.schemas.mortgage import MortgageCreate, MortgageEventType
+
+
+def _json_value(value):
+    """JSON-safe form of a column value."""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class EventService:
+    """Service for the append-only mortgage change log."""
+
+    TRACKED_FIELDS = tuple(MortgageCreate.model_fields)
+    HISTORY_BATCH_SIZE = 500
+
+    @classmethod
+    def snapshot(cls, mortgage: Mortgage) -> dict:
+        """All tracked field values of a mortgage."""
+        return {field: _json_value(getattr(mortgage, field)) for field in cls.TRACKED_FIELDS}
+
+    @staticmethod
+    def build(
+        mortgage_id: int,
+        event_type: MortgageEventType,
+        data: dict,
+        previous: Optional[dict] = None,
+    ) -> dict:
+        """Build an event row for record()."""
+        return {
+            "mortgage_id": mortgage_id,
+            "event_type": event_type.value,
+            "data": data,
+            "previous": previous,
+        }
+
+    @classmethod
+    def created(cls, mortgage: Mortgage) -> dict:
+        """Event for a new mortgage; call after flush so the id is set."""
+        return cls.build(mortgage.id, MortgageEventType.CREATED, cls.snapshot(mortgage))
+
+    @classmethod
+    def deleted(cls, mortgage: Mortgage) -> dict:
+        """Tombstone carrying the mortgage's last values."""
+        return cls.build(mortgage.id, MortgageEventType.DELETED, cls.snapshot(mortgage))
+
+    @classmethod
+    def updated(cls, mortgage: Mortgage, changes: dict) -> Optional[dict]:
+        """
+        Build an update event from the values about to be applied, keeping
+        only fields whose value actually changes. Call before applying them.
+        """
+        data = {}
+        previous = {}
+        for field, value in changes.items():
+            current = getattr(mortgage, field)
+            if current != value:
+                data[field] = _json_value(value)
+                previous[field] = _json_value(current)
+        if not data:
+            return None
+        return cls.build(mortgage.id, MortgageEventType.UPDATED, data, previous)
+
+    @staticmethod
+    def record(db: Session, events: List[Optional[dict]]) -> None:
+        """Append events with one bulk INSERT in the caller's transaction."""
+        events = [event for event in events if event]
+        if events:
+            db.execute(insert(MortgageEvent), events)
+
+    @staticmethod
+    def has_history(db: Session, mortgage_id: int) -> bool:
+        """Whether any event exists for a mortgage, deleted or not."""
+        return db.scalar(
+            select(MortgageEvent.id).where(MortgageEvent.mortgage_id == mortgage_id).limit(1)
+        ) is not None
+
+    @classmethod
+    def iter_history(
+        cls, db: Session, mortgage_id: int, batch_size: Optional[int] = None
+    ) -> Iterator[MortgageEvent]:
+        """Yield a mortgage's events oldest first, fetched in keyset batches."""
+        batch_size = batch_size or cls.HISTORY_BATCH_SIZE
+        last_id = 0
+        while True:
+            events = db.scalars(
+                select(MortgageEvent)
+                .where(MortgageEvent.mortgage_id == mortgage_id, MortgageEvent.id > last_id)
+                .order_by(MortgageEvent.id)
+                .limit(batch_size)
+            ).all()
+            if not events:
+                return
+            yield from events
+            last_id = events[-1].id
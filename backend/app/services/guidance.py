@@ -1,5 +1,5 @@
 from datetime import date, timedelta
-from typing import List
+from typing import List, Optional, Tuple
 from app.models.mortgage import Mortgage
 from app.schemas.mortgage import (
     GuidanceResponse,
@@ -9,213 +9,71 @@ from app.schemas.mortgage import (
     DeadlineInfo,
     Milestone,
     RiskLevel,
-    WarningType,
-    WarningSeverity,
     Priority,
     ResourceType,
     ForeclosureStage,
     MilestoneStatus,
+    StateInfo,
 )
 from app.services.calculations import CalculationService
 from app.services.states import StateService
+from app.services.warning_rules import WARNING_RULES
 
 
 class GuidanceService:
     """Service for generating foreclosure prevention guidance."""
 
     @classmethod
-    def get_warnings(cls, mortgage: Mortgage) -> List[Warning]:
+    def get_warnings(
+        cls, mortgage: Mortgage, today: Optional[date] = None
+    ) -> List[Warning]:
         """Generate warnings based on mortgage status."""
-        warnings = []
-        dashboard = CalculationService.get_payment_dashboard(mortgage)
-
-        # Payment due warning
-        next_due = CalculationService.get_next_payment_due(mortgage.last_payment_date)
-        days_until_due = (next_due - date.today()).days
-        if 0 < days_until_due <= 7:
-            warnings.append(
-                Warning(
-                    type=WarningType.PAYMENT_DUE,
-                    severity=WarningSeverity.INFO,
-                    title="Payment Due Soon",
-                    message=f"Your next payment of ${mortgage.monthly_payment:,.2f} is due in {days_until_due} days.",
-                    action_required=True,
-                    deadline=next_due,
-                )
-            )
-
-        # Late notice (15+ days)
-        if 15 <= dashboard.days_past_due < 30:
-            warnings.append(
-                Warning(
-                    type=WarningType.LATE_NOTICE,
-                    severity=WarningSeverity.WARNING,
-                    title="Payment is Late",
-                    message=(
-                        f"Your payment is {dashboard.days_past_due} days late. "
-                        "Late fees are accruing. Contact your lender to make arrangements."
-                    ),
-                    action_required=True,
-                )
-            )
-
-        # Default warning (30+ days)
-        if 30 <= dashboard.days_past_due < 90:
-            warnings.append(
-                Warning(
-                    type=WarningType.DEFAULT_WARNING,
-                    severity=WarningSeverity.URGENT,
-                    title="Default Warning",
-                    message=(
-                        f"You are {dashboard.days_past_due} days past due. "
-                        "Your loan may be reported to credit bureaus. "
-                        "Contact your lender immediately to discuss options."
-                    ),
-                    action_required=True,
-                )
-            )
-
-        # Pre-foreclosure (90+ days)
-        if 90 <= dashboard.days_past_due < 120:
-            warnings.append(
-                Warning(
-                    type=WarningType.PRE_FORECLOSURE,
-                    severity=WarningSeverity.CRITICAL,
-                    title="Pre-Foreclosure Stage",
-                    message=(
-                        "You are in the pre-foreclosure stage. Your lender may file "
-                        "a Notice of Default. Time is critical - contact a HUD-approved "
-                        "housing counselor immediately."
-                    ),
-                    action_required=True,
-                )
-            )
-
-        # Foreclosure notice (120+ days)
-        if dashboard.days_past_due >= 120:
-            warnings.append(
-                Warning(
-                    type=WarningType.FORECLOSURE_NOTICE,
-                    severity=WarningSeverity.CRITICAL,
-                    title="Foreclosure Process May Begin",
-                    message=(
-                        "Your lender may initiate formal foreclosure proceedings. "
-                        "Seek legal assistance immediately. You may still have options "
-                        "including loan modification, short sale, or deed in lieu."
-                    ),
-                    action_required=True,
-                )
-            )
-
-        # High DTI warning
-        if dashboard.dti_ratio > 43:
-            warnings.append(
-                Warning(
-                    type=WarningType.HIGH_DTI,
-                    severity=WarningSeverity.WARNING,
-                    title="High Debt-to-Income Ratio",
-                    message=(
-                        f"Your debt-to-income ratio is {dashboard.dti_ratio:.1f}%. "
-                        "This exceeds the recommended 43% maximum. Consider ways to "
-                        "reduce expenses or increase income."
-                    ),
-                    action_required=False,
-                )
-            )
-
-        # Underwater warning (LTV > 100%)
-        if dashboard.ltv_ratio and dashboard.ltv_ratio > 100:
-            warnings.append(
-                Warning(
-                    type=WarningType.UNDERWATER,
-                    severity=WarningSeverity.WARNING,
-                    title="Underwater Mortgage",
-                    message=(
-                        f"Your loan-to-value ratio is {dashboard.ltv_ratio:.1f}%. "
-                        "You owe more than your home is worth. This may affect your "
-                        "refinancing options but does not prevent loan modification."
-                    ),
-                    action_required=False,
-                )
-            )
-
-        return warnings
+        today = today or date.today()
+        dashboard = CalculationService.get_payment_dashboard(mortgage, today)
+        next_due = dashboard.next_payment_due
+
+        context = {
+            "days_past_due": dashboard.days_past_due,
+            "days_until_due": (next_due - today).days,
+            "next_payment_due": next_due,
+            "dti_ratio": dashboard.dti_ratio,
+            "ltv_ratio": dashboard.ltv_ratio if dashboard.ltv_ratio else float("nan"),
+            "monthly_payment": mortgage.monthly_payment,
+        }
+        return [rule.build(context) for rule in WARNING_RULES if rule.condition(context)]
 
     @classmethod
-    def get_deadline_info(cls, mortgage: Mortgage) -> DeadlineInfo:
+    def get_deadline_info(
+        cls, mortgage: Mortgage, today: Optional[date] = None
+    ) -> DeadlineInfo:
         """Get foreclosure timeline and deadlines."""
-        state_info = StateService.get_state(mortgage.state)
-        if not state_info:
-            # Default to judicial if state not found
-            state_info = StateService.get_state("NY")
+        today = today or date.today()
+        state_info = cls.get_state_info(mortgage.state)
 
         # Determine current stage
         days_past_due = CalculationService.calculate_days_past_due(
-            mortgage.last_payment_date, mortgage.missed_payments
+            mortgage.last_payment_date, mortgage.missed_payments, today
+        )
+        current_stage = cls.get_foreclosure_stage(
+            days_past_due, state_info.timeline_days_max
         )
 
-        if days_past_due == 0:
-            current_stage = ForeclosureStage.CURRENT
-        elif days_past_due <= 15:
-            current_stage = ForeclosureStage.GRACE_PERIOD
-        elif days_past_due <= 30:
-            current_stage = ForeclosureStage.LATE
-        elif days_past_due <= 90:
-            current_stage = ForeclosureStage.DEFAULT
-        elif days_past_due <= 120:
-            current_stage = ForeclosureStage.PRE_FORECLOSURE
-        elif days_past_due <= state_info.timeline_days_max:
-            current_stage = ForeclosureStage.FORECLOSURE
-        else:
-            current_stage = ForeclosureStage.AUCTION
-
-        # Calculate first missed payment date
-        if mortgage.last_payment_date:
-            first_missed = mortgage.last_payment_date + timedelta(days=30)
-        else:
-            first_missed = date.today() - timedelta(days=days_past_due)
+        first_missed = cls.get_first_missed_date(mortgage, days_past_due, today)
 
         # Build milestones
         milestones = [
             Milestone(
-                stage="Grace Period Ends",
-                days_from_first_missed=15,
-                estimated_date=first_missed + timedelta(days=15),
-                description="Late fees begin to accrue",
-                status=cls._get_milestone_status(days_past_due, 15),
-            ),
-            Milestone(
-                stage="Reported to Credit Bureau",
-                days_from_first_missed=30,
-                estimated_date=first_missed + timedelta(days=30),
-                description="Delinquency reported, credit score impact",
-                status=cls._get_milestone_status(days_past_due, 30),
-            ),
-            Milestone(
-                stage="Notice of Default",
-                days_from_first_missed=90,
-                estimated_date=first_missed + timedelta(days=90),
-                description="Formal notice filed by lender",
-                status=cls._get_milestone_status(days_past_due, 90),
-            ),
-            Milestone(
-                stage="Notice of Sale",
-                days_from_first_missed=state_info.timeline_days_min,
-                estimated_date=first_missed + timedelta(days=state_info.timeline_days_min),
-                description="Property scheduled for foreclosure sale",
-                status=cls._get_milestone_status(days_past_due, state_info.timeline_days_min),
-            ),
-            Milestone(
-                stage="Foreclosure Sale",
-                days_from_first_missed=state_info.timeline_days_max,
-                estimated_date=first_missed + timedelta(days=state_info.timeline_days_max),
-                description="Property sold at auction",
-                status=cls._get_milestone_status(days_past_due, state_info.timeline_days_max),
-            ),
+                stage=stage,
+                days_from_first_missed=days,
+                estimated_date=first_missed + timedelta(days=days),
+                description=description,
+                status=cls._get_milestone_status(days_past_due, days),
+            )
+            for stage, days, description in cls.get_milestone_schedule(state_info)
         ]
 
         # Calculate days until next stage
-        stage_thresholds = [15, 30, 90, state_info.timeline_days_min, state_info.timeline_days_max]
+        stage_thresholds = [m.days_from_first_missed for m in milestones]
         days_until_next = None
         for threshold in stage_thresholds:
             if days_past_due < threshold:
@@ -233,6 +91,61 @@ class GuidanceService:
             milestones=milestones,
         )
 
+    @staticmethod
+    def get_state_info(code: str) -> StateInfo:
+        """Get state info, defaulting to judicial (NY) if state not found."""
+        return StateService.get_state(code) or StateService.get_state("NY")
+
+    @staticmethod
+    def get_foreclosure_stage(
+        days_past_due: int, timeline_days_max: int
+    ) -> ForeclosureStage:
+        """Determine foreclosure stage from days past due."""
+        if days_past_due == 0:
+            return ForeclosureStage.CURRENT
+        if days_past_due <= 15:
+            return ForeclosureStage.GRACE_PERIOD
+        if days_past_due <= 30:
+            return ForeclosureStage.LATE
+        if days_past_due <= 90:
+            return ForeclosureStage.DEFAULT
+        if days_past_due <= 120:
+            return ForeclosureStage.PRE_FORECLOSURE
+        if days_past_due <= timeline_days_max:
+            return ForeclosureStage.FORECLOSURE
+        return ForeclosureStage.AUCTION
+
+    @staticmethod
+    def get_first_missed_date(
+        mortgage: Mortgage, days_past_due: int, today: Optional[date] = None
+    ) -> date:
+        """Estimate the date of the first missed payment."""
+        if mortgage.last_payment_date:
+            return mortgage.last_payment_date + timedelta(days=30)
+        return (today or date.today()) - timedelta(days=days_past_due)
+
+    @staticmethod
+    def get_milestone_schedule(state_info: StateInfo) -> List[Tuple[str, int, str]]:
+        """
+        Get (stage, days_from_first_missed, description) for each milestone,
+        in timeline order.
+        """
+        return [
+            ("Grace Period Ends", 15, "Late fees begin to accrue"),
+            ("Reported to Credit Bureau", 30, "Delinquency reported, credit score impact"),
+            ("Notice of Default", 90, "Formal notice filed by lender"),
+            (
+                "Notice of Sale",
+                state_info.timeline_days_min,
+                "Property scheduled for foreclosure sale",
+            ),
+            (
+                "Foreclosure Sale",
+                state_info.timeline_days_max,
+                "Property sold at auction",
+            ),
+        ]
+
     @staticmethod
     def _get_milestone_status(days_past_due: int, milestone_days: int) -> MilestoneStatus:
         """Determine milestone status based on days past due."""
@@ -244,9 +157,11 @@ class GuidanceService:
             return MilestoneStatus.UPCOMING
 
     @classmethod
-    def get_guidance(cls, mortgage: Mortgage) -> GuidanceResponse:
+    def get_guidance(
+        cls, mortgage: Mortgage, today: Optional[date] = None
+    ) -> GuidanceResponse:
         """Generate personalized guidance based on mortgage status."""
-        dashboard = CalculationService.get_payment_dashboard(mortgage)
+        dashboard = CalculationService.get_payment_dashboard(mortgage, today)
         risk_level = dashboard.risk_level
 
         # Generate summary
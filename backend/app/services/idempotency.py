@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+from fastapi import HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.idempotency import IdempotencyKey
+
+# How long a key's response is replayed; older keys are purged daily
+IDEMPOTENCY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+
+
+class IdempotencyService:
+    """Replay of stored responses for retried writes."""
+
+    TTL = timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+
+    @staticmethod
+    def fingerprint(request: Request, body: Any) -> str:
+        """Hash of method, path and body identifying the request a key belongs to."""
+        payload = json.dumps(jsonable_encoder(body), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(
+            f"{request.method} {request.url.path}\n{payload}".encode()
+        ).hexdigest()
+
+    @classmethod
+    def lookup(cls, db: Session, key: str, fingerprint: str) -> Optional[IdempotencyKey]:
+        """
+        Stored response for a live key, or None. Raises 422 when the key was
+        used for a different request.
+        """
+        stored = db.get(IdempotencyKey, key)
+        if stored is None or stored.created_at < datetime.utcnow() - cls.TTL:
+            return None
+        if stored.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        return stored
+
+    @staticmethod
+    def replay(stored: IdempotencyKey) -> JSONResponse:
+        return JSONResponse(
+            content=json.loads(stored.response_body),
+            status_code=stored.status_code,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    @classmethod
+    def run(
+        cls,
+        db: Session,
+        key: Optional[str],
+        fingerprint: str,
+        status_code: int,
+        write: Callable[[], Any],
+    ) -> Any:
+        """
+        Run a write at most once per key. write() makes its changes and returns
+        the response body; the key is stored in the same transaction, so a
+        concurrent duplicate fails on the key's primary key and rolls back
+        its own changes before replaying the winner's response.
+        """
+        if key is None:
+            body = write()
+            db.commit()
+            return body
+
+        stored = cls.lookup(db, key, fingerprint)
+        if stored is not None:
+            return cls.replay(stored)
+
+        body = write()
+        # An expired row for this key is replaced. A live one, committed by a
+        # concurrent duplicate since the lookup, stays and fails the insert
+        db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.created_at < datetime.utcnow() - cls.TTL,
+            )
+        )
+        db.add(
+            IdempotencyKey(
+                key=key,
+                fingerprint=fingerprint,
+                status_code=status_code,
+                response_body=json.dumps(jsonable_encoder(body)),
+            )
+        )
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            stored = cls.lookup(db, key, fingerprint)
+            if stored is None:
+                raise
+            return cls.replay(stored)
+        return body
+
+    @classmethod
+    def purge_expired(cls, db: Session, now: Optional[datetime] = None) -> int:
+        """Delete keys past their TTL. Returns the number removed."""
+        cutoff = (now or datetime.utcnow()) - cls.TTL
+        result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff))
+        db.commit()
+        return result.rowcount
@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+from typing import List, Optional
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.mortgage import Mortgage
+from app.models.milestone import MortgageMilestone
+from app.schemas.mortgage import UpcomingMilestone
+from app.services.calculations import CalculationService
+from app.services.guidance import GuidanceService
+
+
+class MilestoneService:
+    """Service for materializing and querying foreclosure milestone dates."""
+
+    REFRESH_CHUNK_SIZE = 1000
+
+    @classmethod
+    def build_rows(cls, mortgage, today: Optional[date] = None) -> List[dict]:
+        """
+        Build milestone rows for a mortgage.
+        Only delinquent mortgages have milestones; current loans get none.
+        """
+        if not mortgage.missed_payments:
+            return []
+
+        state_info = GuidanceService.get_state_info(mortgage.state)
+        days_past_due = CalculationService.calculate_days_past_due(
+            mortgage.last_payment_date, mortgage.missed_payments, today
+        )
+        first_missed = GuidanceService.get_first_missed_date(mortgage, days_past_due, today)
+
+        return [
+            {
+                "mortgage_id": mortgage.id,
+                "stage": stage,
+                "days_from_first_missed": days,
+                "estimated_date": first_missed + timedelta(days=days),
+            }
+            for stage, days, _ in GuidanceService.get_milestone_schedule(state_info)
+        ]
+
+    @classmethod
+    def refresh(cls, db: Session, mortgage: Mortgage) -> None:
+        """Rebuild milestones for one mortgage in the caller's transaction."""
+        cls.clear(db, mortgage.id)
+        rows = cls.build_rows(mortgage)
+        if rows:
+            db.execute(insert(MortgageMilestone), rows)
+
+    @staticmethod
+    def clear(db: Session, mortgage_id: int) -> None:
+        """Remove milestones for a mortgage in the caller's transaction."""
+        db.execute(
+            delete(MortgageMilestone).where(MortgageMilestone.mortgage_id == mortgage_id)
+        )
+
+    @staticmethod
+    def replace(db: Session, mortgage_ids: List[int], rows: List[dict]) -> None:
+        """Replace milestones for a set of mortgages with prebuilt rows."""
+        db.execute(
+            delete(MortgageMilestone).where(MortgageMilestone.mortgage_id.in_(mortgage_ids))
+        )
+        if rows:
+            db.execute(insert(MortgageMilestone), rows)
+
+    @classmethod
+    def refresh_all(
+        cls, db: Session, chunk_size: Optional[int] = None, today: Optional[date] = None
+    ) -> int:
+        """
+        Rebuild milestones for the whole portfolio, one transaction per chunk.
+        Dates for loans without a last payment date are relative to today,
+        so this runs daily. Returns the number of mortgages processed.
+        """
+        chunk_size = chunk_size or cls.REFRESH_CHUNK_SIZE
+        columns = (
+            Mortgage.id,
+            Mortgage.state,
+            Mortgage.last_payment_date,
+            Mortgage.missed_payments,
+        )
+        processed = 0
+        last_id = 0
+        while True:
+            chunk = db.execute(
+                select(*columns)
+                .where(Mortgage.id > last_id)
+                .order_by(Mortgage.id)
+                .limit(chunk_size)
+            ).all()
+            if not chunk:
+                break
+
+            ids = [row.id for row in chunk]
+            rows = [milestone for row in chunk for milestone in cls.build_rows(row, today)]
+            cls.replace(db, ids, rows)
+            db.commit()
+
+            processed += len(chunk)
+            last_id = ids[-1]
+        return processed
+
+    @staticmethod
+    def find_upcoming(
+        db: Session,
+        start: date,
+        end: date,
+        stage: Optional[str] = None,
+        state: Optional[str] = None,
+    ) -> List[UpcomingMilestone]:
+        """Range-scan milestones falling between start and end (inclusive)."""
+        query = (
+            select(
+                MortgageMilestone.mortgage_id,
+                Mortgage.state,
+                MortgageMilestone.stage,
+                MortgageMilestone.days_from_first_missed,
+                MortgageMilestone.estimated_date,
+            )
+            .join(Mortgage, Mortgage.id == MortgageMilestone.mortgage_id)
+            .where(MortgageMilestone.estimated_date.between(start, end))
+        )
+        if stage:
+            query = query.where(MortgageMilestone.stage == stage)
+        if state:
+            query = query.where(Mortgage.state == state.upper())
+        query = query.order_by(
+            MortgageMilestone.estimated_date, MortgageMilestone.mortgage_id
+        )
+
+        return [
+            UpcomingMilestone(
+                mortgage_id=row.mortgage_id,
+                state=row.state,
+                stage=row.stage,
+                days_from_first_missed=row.days_from_first_missed,
+                estimated_date=row.estimated_date,
+                days_until=(row.estimated_date - start).days,
+            )
+            for row in db.execute(query)
+        ]
@@ -0,0 +1,168 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.compute import detach
+from app.deadlines import check_deadline, deadline_exceeded
+from app.models.mortgage import Mortgage
+from app.schemas.mortgage import BulkUpdateStatus, MortgageBulkUpdateResult
+from app.services.events import EventService
+from app.services.milestones import MilestoneService
+from app.services.scoring import ScoringService
+
+
+class MortgageService:
+    """
+    Write side of the mortgages table. Each write keeps the derived tables
+    (milestones, scores) and the event log in step, in the caller's
+    transaction; callers commit.
+    """
+
+    BULK_UPDATE_CHUNK_SIZE = 1000
+
+    @staticmethod
+    def create(db: Session, data: dict) -> Mortgage:
+        mortgage = Mortgage(**data)
+        db.add(mortgage)
+        db.flush()
+        MilestoneService.refresh(db, mortgage)
+        ScoringService.refresh(db, mortgage)
+        EventService.record(db, [EventService.created(mortgage)])
+        return mortgage
+
+    @staticmethod
+    def bulk_create(db: Session, items: List[dict]) -> List[Mortgage]:
+        """Create many mortgages with batched inserts for rows and derived data."""
+        mortgages = [Mortgage(**data) for data in items]
+        db.add_all(mortgages)
+        db.flush()
+        ScoringService.save(db, [ScoringService.score(mortgage) for mortgage in mortgages])
+        MilestoneService.replace(
+            db,
+            [mortgage.id for mortgage in mortgages],
+            [row for mortgage in mortgages for row in MilestoneService.build_rows(mortgage)],
+        )
+        EventService.record(db, [EventService.created(mortgage) for mortgage in mortgages])
+        return mortgages
+
+    @staticmethod
+    def update(db: Session, mortgage: Mortgage, changes: dict) -> Mortgage:
+        event = EventService.updated(mortgage, changes)
+        for field, value in changes.items():
+            setattr(mortgage, field, value)
+        MilestoneService.refresh(db, mortgage)
+        ScoringService.refresh(db, mortgage)
+        EventService.record(db, [event])
+        return mortgage
+
+    @staticmethod
+    def delete(db: Session, mortgage: Mortgage) -> None:
+        MilestoneService.clear(db, mortgage.id)
+        ScoringService.clear(db, mortgage.id)
+        EventService.record(db, [EventService.deleted(mortgage)])
+        db.delete(mortgage)
+
+    @classmethod
+    def bulk_update(
+        cls,
+        db: Session,
+        updates: List[dict],
+        chunk_size: Optional[int] = None,
+        commit: bool = True,
+    ) -> List[MortgageBulkUpdateResult]:
+        """
+        Apply many partial updates, each a dict with an "id" key, committing
+        one transaction per chunk. Per chunk: one SELECT of the affected rows,
+        one bulk UPDATE by primary key, and bulk writes of scores, milestones
+        and events. With commit=False every chunk stays in the caller's
+        transaction. Returns a status per update, in request order.
+
+        The request deadline is checked before the first chunk. Once a chunk
+        has committed, running out of time stops the batch instead of failing
+        it, and the updates not applied are reported as SKIPPED.
+        """
+        chunk_size = chunk_size or cls.BULK_UPDATE_CHUNK_SIZE
+        check_deadline()
+        results = []
+        for start in range(0, len(updates), chunk_size):
+            partial = commit and start > 0
+            if partial and deadline_exceeded():
+                results.extend(cls._skipped(updates[start:]))
+                break
+            chunk = updates[start:start + chunk_size]
+            try:
+                chunk_results = cls._update_chunk(db, chunk)
+                if commit:
+                    db.commit()
+            except OperationalError:
+                # A statement cancelled by the deadline rolls back this chunk only
+                if not (partial and deadline_exceeded()):
+                    raise
+                db.rollback()
+                results.extend(cls._skipped(updates[start:]))
+                break
+            results.extend(chunk_results)
+        return results
+
+    @staticmethod
+    def _skipped(updates: List[dict]) -> List[MortgageBulkUpdateResult]:
+        return [
+            MortgageBulkUpdateResult(id=item["id"], status=BulkUpdateStatus.SKIPPED)
+            for item in updates
+        ]
+
+    @staticmethod
+    def _update_chunk(db: Session, chunk: List[dict]) -> List[MortgageBulkUpdateResult]:
+        results = []
+        ids = {item["id"] for item in chunk}
+        # Values as of the previous update in this chunk, so repeated ids apply in order
+        current = {
+            mortgage.id: detach(mortgage)
+            for mortgage in db.scalars(
+                # Bulk UPDATEs of earlier chunks bypass the identity map
+                select(Mortgage)
+                .where(Mortgage.id.in_(ids))
+                .execution_options(populate_existing=True)
+            )
+        }
+
+        mappings = []
+        events = []
+        changed = {}
+        now = datetime.utcnow()
+        for item in chunk:
+            mortgage_id = item["id"]
+            changes = {field: value for field, value in item.items() if field != "id"}
+            mortgage = current.get(mortgage_id)
+            if mortgage is None:
+                results.append(
+                    MortgageBulkUpdateResult(id=mortgage_id, status=BulkUpdateStatus.NOT_FOUND)
+                )
+                continue
+            event = EventService.updated(mortgage, changes)
+            if event is None:
+                results.append(
+                    MortgageBulkUpdateResult(id=mortgage_id, status=BulkUpdateStatus.UNCHANGED)
+                )
+                continue
+            for field, value in changes.items():
+                setattr(mortgage, field, value)
+            mappings.append({**changes, "id": mortgage_id, "updated_at": now})
+            events.append(event)
+            changed[mortgage_id] = mortgage
+            results.append(
+                MortgageBulkUpdateResult(id=mortgage_id, status=BulkUpdateStatus.UPDATED)
+            )
+
+        if mappings:
+            db.execute(update(Mortgage), mappings)
+            ScoringService.save(db, [ScoringService.score(m) for m in changed.values()])
+            MilestoneService.replace(
+                db,
+                list(changed),
+                [row for m in changed.values() for row in MilestoneService.build_rows(m)],
+            )
+            EventService.record(db, events)
+        return results
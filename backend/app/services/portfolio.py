@@ -0,0 +1,404 @@
+"""Columnar, read-only mortgage data for batch jobs.
+
+Batch jobs only read a handful of numeric fields, so instead of hydrating
+ORM instances they load rows with a Core select into one NumPy array per
+column. MortgageRow gives attribute access to a single row, so the scalar
+CalculationService/GuidanceService methods accept it in place of a Mortgage.
+
+Money columns are read as the stored integer cents (and interest_rate as
+basis points), so batch arithmetic runs on exact int64 values; MortgageRow
+converts back to dollars and percent like the ORM does.
+"""
+from datetime import date
+from typing import Collection, Iterator, List, Optional, Sequence
+import numpy as np
+from sqlalchemy import BigInteger, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.deadlines import check_deadline
+from app.models.mortgage import Mortgage
+from app.schemas.mortgage import (
+    ForeclosureStage,
+    PortfolioWarning,
+    RiskLevel,
+    RiskProjection,
+    WarningSeverity,
+)
+from app.services.calculations import CalculationService
+from app.services.guidance import GuidanceService
+from app.services.warning_rules import WARNING_RULES
+
+# Loaded columns and their array dtypes. Nullable dates use NaT; state
+# codes are stored as 2-byte strings.
+COLUMN_DTYPES = {
+    "id": np.int64,
+    "loan_amount": np.int64,
+    "current_balance": np.int64,
+    "interest_rate": np.int64,
+    "loan_term_months": np.int16,
+    "remaining_months": np.int16,
+    "monthly_payment": np.int64,
+    "loan_start_date": "datetime64[D]",
+    "last_payment_date": "datetime64[D]",
+    "missed_payments": np.int16,
+    "monthly_income": np.int64,
+    "monthly_expenses": np.int64,
+    "property_value": np.int64,
+    "state": "S2",
+}
+
+# Columns holding cents, and interest_rate holding basis points; both
+# convert back by dividing by 100
+SCALED_COLUMNS = frozenset(
+    ("loan_amount", "current_balance", "interest_rate", "monthly_payment",
+     "monthly_income", "monthly_expenses", "property_value")
+)
+# Stands in for NULL in nullable amount columns (amounts are never negative)
+MISSING_CENTS = -1
+
+
+class MortgageColumns:
+    """Struct-of-arrays container holding one array per mortgage column."""
+
+    __slots__ = tuple(COLUMN_DTYPES)
+
+    def __init__(self, **arrays: np.ndarray):
+        for name in COLUMN_DTYPES:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple]) -> "MortgageColumns":
+        """Build columns from rows ordered like COLUMN_DTYPES."""
+        if not rows:
+            return cls.empty()
+        arrays = {}
+        for (name, dtype), values in zip(COLUMN_DTYPES.items(), zip(*rows)):
+            if name == "missed_payments":
+                values = [value or 0 for value in values]
+            elif name in SCALED_COLUMNS:
+                values = [MISSING_CENTS if value is None else value for value in values]
+            arrays[name] = np.array(values, dtype=dtype)
+        return cls(**arrays)
+
+    @classmethod
+    def empty(cls) -> "MortgageColumns":
+        return cls(**{name: np.empty(0, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()})
+
+    @classmethod
+    def concat(cls, parts: List["MortgageColumns"]) -> "MortgageColumns":
+        if not parts:
+            return cls.empty()
+        return cls(
+            **{
+                name: np.concatenate([getattr(part, name) for part in parts])
+                for name in COLUMN_DTYPES
+            }
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the column arrays."""
+        return sum(getattr(self, name).nbytes for name in COLUMN_DTYPES)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __getitem__(self, index: int) -> "MortgageRow":
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return MortgageRow(self, index % len(self))
+
+    def __iter__(self) -> Iterator["MortgageRow"]:
+        for index in range(len(self)):
+            yield MortgageRow(self, index)
+
+
+def _column_property(name: str, dtype) -> property:
+    """Build a MortgageRow attribute that converts to a Python value."""
+    if dtype == "S2":
+        def getter(row):
+            return getattr(row._columns, name)[row._index].decode()
+    elif name in SCALED_COLUMNS:
+        def getter(row):
+            value = int(getattr(row._columns, name)[row._index])
+            return None if value == MISSING_CENTS else value / 100
+    else:
+        # Integers, and dates where NaT becomes None
+        def getter(row):
+            return getattr(row._columns, name)[row._index].item()
+    return property(getter)
+
+
+class MortgageRow:
+    """Read-only view of one row in a MortgageColumns container."""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: MortgageColumns, index: int):
+        self._columns = columns
+        self._index = index
+
+    def __repr__(self) -> str:
+        return f"MortgageRow(id={self.id})"
+
+
+for _name, _dtype in COLUMN_DTYPES.items():
+    setattr(MortgageRow, _name, _column_property(_name, _dtype))
+
+
+class PortfolioService:
+    """Service for loading and scoring the mortgage portfolio as columns."""
+
+    CHUNK_SIZE = 10000
+
+    # Array codes index into these tuples
+    RISK_LEVELS = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL)
+    STAGES = tuple(ForeclosureStage)
+
+    # Threshold tables mirroring CalculationService.calculate_risk_level:
+    # missed payments at or above each value raise the level by one
+    RISK_MISSED_PAYMENTS = np.array([1, 3, 6])
+    # Upper bounds (inclusive) of the fixed stages in
+    # GuidanceService.get_foreclosure_stage; FORECLOSURE runs to the state's
+    # timeline_days_max and AUCTION is beyond it
+    STAGE_DAYS = np.array([0, 15, 30, 90, 120])
+
+    @staticmethod
+    def _select(state: Optional[str] = None, ids: Optional[Sequence[int]] = None):
+        table = Mortgage.__table__
+        # Bypass the Cents/BasisPoints types to read the stored integers
+        query = select(
+            *(
+                type_coerce(table.c[name], BigInteger()).label(name)
+                if name in SCALED_COLUMNS
+                else table.c[name]
+                for name in COLUMN_DTYPES
+            )
+        )
+        if state:
+            query = query.where(table.c.state == state.upper())
+        if ids is not None:
+            query = query.where(table.c.id.in_(ids))
+        return query
+
+    @classmethod
+    def iter_chunks(
+        cls,
+        db: Session,
+        chunk_size: Optional[int] = None,
+        state: Optional[str] = None,
+    ) -> Iterator[MortgageColumns]:
+        """
+        Yield the portfolio in id order, one MortgageColumns per chunk.
+        Each chunk is a separate keyset query, so callers may commit between
+        chunks.
+        """
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        id_column = Mortgage.__table__.c.id
+        last_id = 0
+        while True:
+            check_deadline()
+            rows = db.execute(
+                cls._select(state)
+                .where(id_column > last_id)
+                .order_by(id_column)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                return
+            yield MortgageColumns.from_rows(rows)
+            last_id = rows[-1][0]
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        state: Optional[str] = None,
+        ids: Optional[Sequence[int]] = None,
+    ) -> MortgageColumns:
+        """Load mortgages (optionally filtered by state or ids) as columns."""
+        if ids is not None:
+            rows = db.execute(cls._select(state, ids).order_by(Mortgage.__table__.c.id)).all()
+            return MortgageColumns.from_rows(rows)
+        return MortgageColumns.concat(list(cls.iter_chunks(db, state=state)))
+
+    @staticmethod
+    def dti_ratios(columns: MortgageColumns) -> np.ndarray:
+        """Vectorized CalculationService.calculate_dti_ratio, from int64 cents."""
+        # MISSING_CENTS clips to zero, like the scalar `or 0`
+        income = np.maximum(columns.monthly_income, 0)
+        expenses = np.maximum(columns.monthly_expenses, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = ((columns.monthly_payment + expenses) * 100) / income
+        return np.where(income <= 0, 100.0, ratios)
+
+    @classmethod
+    def risk_levels(cls, missed_payments: np.ndarray, dti_ratios: np.ndarray) -> np.ndarray:
+        """
+        Vectorized CalculationService.calculate_risk_level. Returns codes
+        indexing RISK_LEVELS: the higher of the missed-payment and DTI levels.
+        """
+        missed_level = np.searchsorted(cls.RISK_MISSED_PAYMENTS, missed_payments, side="right")
+        dti_level = np.select(
+            [dti_ratios > 50, dti_ratios > 43, dti_ratios >= 36], [3, 2, 1], default=0
+        )
+        return np.maximum(missed_level, dti_level).astype(np.int8)
+
+    @classmethod
+    def days_past_due(cls, columns: MortgageColumns, today: Optional[date] = None) -> np.ndarray:
+        """Vectorized CalculationService.calculate_days_past_due."""
+        return cls._days_past_due_on(columns, np.datetime64(today or date.today(), "D"))
+
+    @staticmethod
+    def _days_past_due_on(columns: MortgageColumns, on: np.ndarray) -> np.ndarray:
+        """
+        Days past due on a date, or on each of a 1-D array of dates giving a
+        (mortgages x dates) result.
+        """
+        missed = columns.missed_payments.astype(np.int64)
+        last_payment = columns.last_payment_date
+        if np.ndim(on):
+            missed = missed[:, None]
+            last_payment = last_payment[:, None]
+        has_last_payment = ~np.isnat(last_payment)
+        days_since_last = (on - np.where(has_last_payment, last_payment, on)).astype(np.int64)
+        days = np.where(
+            has_last_payment, np.maximum(0, days_since_last - 30), missed * 30
+        )
+        return np.where(missed == 0, 0, days)
+
+    @staticmethod
+    def timeline_days(states: np.ndarray, field: str = "timeline_days_max") -> np.ndarray:
+        """Per-row state timeline days, looked up once per distinct state."""
+        codes, inverse = np.unique(states, return_inverse=True)
+        table = np.array(
+            [getattr(GuidanceService.get_state_info(code.decode()), field) for code in codes],
+            dtype=np.int64,
+        )
+        return table[inverse.reshape(-1)]
+
+    @classmethod
+    def foreclosure_stages(
+        cls, days_past_due: np.ndarray, timeline_days_max: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized GuidanceService.get_foreclosure_stage. Returns codes
+        indexing STAGES.
+        """
+        stages = np.searchsorted(cls.STAGE_DAYS, days_past_due, side="left")
+        auction = (stages == len(cls.STAGE_DAYS)) & (days_past_due > timeline_days_max)
+        return np.where(auction, stages + 1, stages).astype(np.int8)
+
+    @classmethod
+    def classify(cls, columns: MortgageColumns, today: Optional[date] = None) -> dict:
+        """
+        Compute DTI, days past due, risk level codes and stage codes for
+        every mortgage in one pass.
+        """
+        dti_ratios = cls.dti_ratios(columns)
+        days_past_due = cls.days_past_due(columns, today)
+        return {
+            "dti_ratio": dti_ratios,
+            "days_past_due": days_past_due,
+            "risk_level": cls.risk_levels(columns.missed_payments, dti_ratios),
+            "foreclosure_stage": cls.foreclosure_stages(
+                days_past_due, cls.timeline_days(columns.state)
+            ),
+        }
+
+    @staticmethod
+    def next_payment_due(columns: MortgageColumns, today: Optional[date] = None) -> np.ndarray:
+        """Vectorized CalculationService.get_next_payment_due."""
+        today = today or date.today()
+        last_payment = columns.last_payment_date
+        missing = np.isnat(last_payment)
+
+        # First 30-day period boundary on or after today
+        elapsed = np.where(missing, 0, (np.datetime64(today, "D") - last_payment).astype(np.int64))
+        periods = np.maximum(1, -(-elapsed // 30))
+        due = last_payment + (periods * 30).astype("timedelta64[D]")
+
+        no_history_due = CalculationService.get_next_payment_due(None, today)
+        return np.where(missing, np.datetime64(no_history_due, "D"), due)
+
+    @classmethod
+    def warning_context(cls, columns: MortgageColumns, today: Optional[date] = None) -> dict:
+        """Build the WARNING_RULES context as arrays, matching get_warnings."""
+        today = today or date.today()
+        next_due = cls.next_payment_due(columns, today)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ltv_ratios = np.where(
+                columns.property_value > 0,
+                (columns.current_balance * 100) / columns.property_value,
+                np.nan,
+            )
+        return {
+            "days_past_due": cls.days_past_due(columns, today),
+            "days_until_due": (next_due - np.datetime64(today, "D")).astype(np.int64),
+            "next_payment_due": next_due,
+            "dti_ratio": np.round(cls.dti_ratios(columns), 1),
+            "ltv_ratio": np.round(ltv_ratios, 1),
+            "monthly_payment": columns.monthly_payment / 100,
+        }
+
+    @classmethod
+    def find_warnings(
+        cls,
+        columns: MortgageColumns,
+        today: Optional[date] = None,
+        severities: Optional[Collection[WarningSeverity]] = None,
+    ) -> List[PortfolioWarning]:
+        """
+        Evaluate every warning rule as a mask over the portfolio and build
+        warnings only for the rows that trigger. Results are ordered by
+        mortgage id, then rule order.
+        """
+        context = cls.warning_context(columns, today)
+        triggered = []
+        for order, rule in enumerate(WARNING_RULES):
+            if severities and rule.severity not in severities:
+                continue
+            for index in np.flatnonzero(rule.condition(context)):
+                triggered.append((int(columns.id[index]), order, rule, index))
+        triggered.sort(key=lambda item: item[:2])
+
+        return [
+            rule.build(
+                {key: values[index].item() for key, values in context.items()},
+                model=PortfolioWarning,
+                mortgage_id=mortgage_id,
+            )
+            for mortgage_id, _, rule, index in triggered
+        ]
+
+    @classmethod
+    def project(cls, columns: MortgageColumns, start: date, days: int) -> List[RiskProjection]:
+        """
+        Project days past due and foreclosure stage for every mortgage on each
+        of `days` consecutive dates from start, as one (mortgages x dates)
+        array pass. Missed payments and DTI are held at their current values,
+        so the risk level is the same on every date.
+        """
+        dates = np.datetime64(start, "D") + np.arange(days)
+        days_past_due = cls._days_past_due_on(columns, dates)
+        stages = cls.foreclosure_stages(
+            days_past_due, cls.timeline_days(columns.state)[:, None]
+        )
+        risk_levels = cls.risk_levels(columns.missed_payments, cls.dti_ratios(columns))
+
+        # First projected date on or past the state's Notice of Sale milestone
+        past_notice = days_past_due >= cls.timeline_days(columns.state, "timeline_days_min")[:, None]
+        notice_index = past_notice.argmax(axis=1)
+        has_notice = past_notice.any(axis=1)
+
+        return [
+            RiskProjection(
+                mortgage_id=int(columns.id[i]),
+                start=start,
+                risk_level=cls.RISK_LEVELS[risk_levels[i]],
+                days_past_due=days_past_due[i].tolist(),
+                foreclosure_stage=[cls.STAGES[code] for code in stages[i]],
+                notice_of_sale_date=dates[notice_index[i]].item() if has_notice[i] else None,
+            )
+            for i in range(len(columns))
+        ]
@@ -0,0 +1,128 @@
+from datetime import date
+from typing import Iterable, List, Optional
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.mortgage import Mortgage
+from app.models.score import MortgageScore
+from app.models.transition import MortgageTransition
+from app.schemas.mortgage import WarningType
+from app.services.calculations import CalculationService
+from app.services.guidance import GuidanceService
+
+
+class ScoringService:
+    """Service for computing and storing date-dependent risk scores."""
+
+    @staticmethod
+    def score(mortgage: Mortgage, today: Optional[date] = None) -> dict:
+        """
+        Compute the materialized score row for one mortgage.
+        Accepts a Mortgage or a columnar MortgageRow.
+        """
+        today = today or date.today()
+        missed_payments = mortgage.missed_payments or 0
+        dti_ratio = CalculationService.calculate_dti_ratio(
+            mortgage.monthly_payment,
+            mortgage.monthly_expenses or 0,
+            mortgage.monthly_income or 0,
+        )
+        days_past_due = CalculationService.calculate_days_past_due(
+            mortgage.last_payment_date, missed_payments, today
+        )
+        state_info = GuidanceService.get_state_info(mortgage.state)
+
+        return {
+            "mortgage_id": mortgage.id,
+            "days_past_due": days_past_due,
+            "next_payment_due": CalculationService.get_next_payment_due(
+                mortgage.last_payment_date, today
+            ),
+            "dti_ratio": round(dti_ratio, 1),
+            "risk_level": CalculationService.calculate_risk_level(
+                missed_payments, dti_ratio
+            ).value,
+            "foreclosure_stage": GuidanceService.get_foreclosure_stage(
+                days_past_due, state_info.timeline_days_max
+            ).value,
+            "warning_types": ScoringService.join_warning_types(
+                warning.type for warning in GuidanceService.get_warnings(mortgage, today)
+            ),
+            "scored_on": today,
+        }
+
+    @staticmethod
+    def join_warning_types(types: Iterable[WarningType]) -> str:
+        """Canonical stored form of a warning set."""
+        return ",".join(sorted({warning_type.value for warning_type in types}))
+
+    @staticmethod
+    def transition(previous, score: dict) -> Optional[dict]:
+        """
+        Transition row when a score changes risk level, foreclosure stage or
+        warning set relative to the stored row, else None.
+        """
+        if (
+            previous.risk_level == score["risk_level"]
+            and previous.foreclosure_stage == score["foreclosure_stage"]
+            and previous.warning_types == score["warning_types"]
+        ):
+            return None
+        return {
+            "mortgage_id": score["mortgage_id"],
+            "risk_level": score["risk_level"],
+            "previous_risk_level": previous.risk_level,
+            "foreclosure_stage": score["foreclosure_stage"],
+            "previous_foreclosure_stage": previous.foreclosure_stage,
+            "warning_types": score["warning_types"],
+            "previous_warning_types": previous.warning_types,
+        }
+
+    @staticmethod
+    def save(db: Session, scores: List[dict]) -> None:
+        """
+        Write scores with bulk statements: one executemany UPDATE for rows
+        that already exist and one INSERT for new mortgages. Changes in risk
+        level, stage or warnings against the stored rows are recorded as
+        transitions in the same transaction.
+        """
+        if not scores:
+            return
+        ids = [score["mortgage_id"] for score in scores]
+        existing = {
+            row.mortgage_id: row
+            for row in db.execute(
+                select(
+                    MortgageScore.mortgage_id,
+                    MortgageScore.risk_level,
+                    MortgageScore.foreclosure_stage,
+                    MortgageScore.warning_types,
+                ).where(MortgageScore.mortgage_id.in_(ids))
+            )
+        }
+        updates = [score for score in scores if score["mortgage_id"] in existing]
+        inserts = [score for score in scores if score["mortgage_id"] not in existing]
+        transitions = [
+            transition
+            for transition in (
+                ScoringService.transition(existing[score["mortgage_id"]], score)
+                for score in updates
+            )
+            if transition
+        ]
+        if updates:
+            db.execute(update(MortgageScore), updates)
+        if inserts:
+            db.execute(insert(MortgageScore), inserts)
+        if transitions:
+            db.execute(insert(MortgageTransition), transitions)
+
+    @classmethod
+    def refresh(cls, db: Session, mortgage: Mortgage) -> None:
+        """Rescore one mortgage in the caller's transaction."""
+        cls.save(db, [cls.score(mortgage)])
+
+    @staticmethod
+    def clear(db: Session, mortgage_id: int) -> None:
+        """Remove the score for a mortgage in the caller's transaction."""
+        db.execute(delete(MortgageScore).where(MortgageScore.mortgage_id == mortgage_id))
@@ -1,13 +1,12 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from app.schemas.mortgage import StateInfo, ForeclosureType
 
 
-class StateService:
-    """Service for state-specific foreclosure information."""
-
+def _build_states() -> Dict[str, StateInfo]:
+    """Build the state catalogue. Called on first use rather than at import."""
     # State foreclosure data
     # Sources: Various state statutes and legal resources
-    STATES = {
+    return {
         "AL": StateInfo(
             code="AL",
             name="Alabama",
@@ -418,15 +417,31 @@ class StateService:
         ),
     }
 
+
+class StateService:
+    """Service for state-specific foreclosure information."""
+
+    _states: Optional[Dict[str, StateInfo]] = None
+    _sorted_states: Optional[List[StateInfo]] = None
+
+    @classmethod
+    def _get_states(cls) -> Dict[str, StateInfo]:
+        """Get the state catalogue, building it on first use."""
+        if cls._states is None:
+            cls._states = _build_states()
+        return cls._states
+
     @classmethod
     def get_state(cls, code: str) -> Optional[StateInfo]:
         """Get state information by code."""
-        return cls.STATES.get(code.upper())
+        return cls._get_states().get(code.upper())
 
     @classmethod
     def get_all_states(cls) -> List[StateInfo]:
         """Get all states with foreclosure information."""
-        return sorted(cls.STATES.values(), key=lambda s: s.name)
+        if cls._sorted_states is None:
+            cls._sorted_states = sorted(cls._get_states().values(), key=lambda s: s.name)
+        return list(cls._sorted_states)
 
     @classmethod
     def get_foreclosure_type_description(cls, ftype: ForeclosureType) -> str:
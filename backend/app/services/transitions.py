@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.cursors import CURSOR_SETTLE_SECONDS, settled
+from app.models.mortgage import Mortgage
+from app.models.transition import MortgageTransition
+from app.schemas.mortgage import RiskTransition
+
+
+def _split(warning_types: str) -> List[str]:
+    return warning_types.split(",") if warning_types else []
+
+
+class TransitionService:
+    """Service for reading recorded risk transitions."""
+
+    FETCH_LIMIT = 1000
+
+    @classmethod
+    def fetch(
+        cls,
+        db: Session,
+        after_id: int = 0,
+        limit: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> List[RiskTransition]:
+        """
+        Settled transitions after an id (see app.cursors), oldest first, with
+        the mortgage's state.
+        """
+        rows = db.execute(
+            select(MortgageTransition, Mortgage.state)
+            .outerjoin(Mortgage, Mortgage.id == MortgageTransition.mortgage_id)
+            .where(MortgageTransition.id > after_id)
+            .order_by(MortgageTransition.id)
+            .limit(limit or cls.FETCH_LIMIT)
+        ).all()
+        transitions = [
+            RiskTransition(
+                id=transition.id,
+                mortgage_id=transition.mortgage_id,
+                state=state,
+                risk_level=transition.risk_level,
+                previous_risk_level=transition.previous_risk_level,
+                foreclosure_stage=transition.foreclosure_stage,
+                previous_foreclosure_stage=transition.previous_foreclosure_stage,
+                warnings=_split(transition.warning_types),
+                previous_warnings=_split(transition.previous_warning_types),
+                created_at=transition.created_at,
+            )
+            for transition, state in rows
+        ]
+        return settled(transitions, after_id, now)
+
+    @staticmethod
+    def latest_id(db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Newest id older than the settle time, below which every transition
+        has committed. Newer ones are replayed to a client starting here.
+        """
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=CURSOR_SETTLE_SECONDS)
+        return db.scalar(
+            select(MortgageTransition.id)
+            .where(MortgageTransition.created_at <= cutoff)
+            .order_by(MortgageTransition.id.desc())
+            .limit(1)
+        ) or 0
@@ -0,0 +1,125 @@
+"""Warning rules shared by per-mortgage and portfolio warning evaluation.
+
+Each rule's condition is written with comparison and & operators only, so
+the same rule evaluates a single mortgage (Python scalars) or a whole
+portfolio at once (NumPy arrays, giving a boolean mask).
+
+Context keys: days_past_due, days_until_due, next_payment_due, dti_ratio,
+ltv_ratio (NaN when unknown) and monthly_payment.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, List, Mapping, Optional, Type
+
+from app.schemas.mortgage import Warning, WarningSeverity, WarningType
+
+
+@dataclass(frozen=True)
+class WarningRule:
+    type: WarningType
+    severity: WarningSeverity
+    title: str
+    message: str  # str.format template over the context
+    condition: Callable[[Mapping[str, Any]], Any]
+    action_required: bool = False
+    deadline_key: Optional[str] = None
+
+    def build(
+        self, context: Mapping[str, Any], model: Type[Warning] = Warning, **fields: Any
+    ) -> Warning:
+        """Materialize the warning for one mortgage's context."""
+        return model(
+            type=self.type,
+            severity=self.severity,
+            title=self.title,
+            message=self.message.format(**context),
+            action_required=self.action_required,
+            deadline=context[self.deadline_key] if self.deadline_key else None,
+            **fields,
+        )
+
+
+WARNING_RULES: List[WarningRule] = [
+    WarningRule(
+        type=WarningType.PAYMENT_DUE,
+        severity=WarningSeverity.INFO,
+        title="Payment Due Soon",
+        message="Your next payment of ${monthly_payment:,.2f} is due in {days_until_due} days.",
+        condition=lambda c: (0 < c["days_until_due"]) & (c["days_until_due"] <= 7),
+        action_required=True,
+        deadline_key="next_payment_due",
+    ),
+    # Late notice (15+ days)
+    WarningRule(
+        type=WarningType.LATE_NOTICE,
+        severity=WarningSeverity.WARNING,
+        title="Payment is Late",
+        message=(
+            "Your payment is {days_past_due} days late. "
+            "Late fees are accruing. Contact your lender to make arrangements."
+        ),
+        condition=lambda c: (15 <= c["days_past_due"]) & (c["days_past_due"] < 30),
+        action_required=True,
+    ),
+    # Default warning (30+ days)
+    WarningRule(
+        type=WarningType.DEFAULT_WARNING,
+        severity=WarningSeverity.URGENT,
+        title="Default Warning",
+        message=(
+            "You are {days_past_due} days past due. "
+            "Your loan may be reported to credit bureaus. "
+            "Contact your lender immediately to discuss options."
+        ),
+        condition=lambda c: (30 <= c["days_past_due"]) & (c["days_past_due"] < 90),
+        action_required=True,
+    ),
+    # Pre-foreclosure (90+ days)
+    WarningRule(
+        type=WarningType.PRE_FORECLOSURE,
+        severity=WarningSeverity.CRITICAL,
+        title="Pre-Foreclosure Stage",
+        message=(
+            "You are in the pre-foreclosure stage. Your lender may file "
+            "a Notice of Default. Time is critical - contact a HUD-approved "
+            "housing counselor immediately."
+        ),
+        condition=lambda c: (90 <= c["days_past_due"]) & (c["days_past_due"] < 120),
+        action_required=True,
+    ),
+    # Foreclosure notice (120+ days)
+    WarningRule(
+        type=WarningType.FORECLOSURE_NOTICE,
+        severity=WarningSeverity.CRITICAL,
+        title="Foreclosure Process May Begin",
+        message=(
+            "Your lender may initiate formal foreclosure proceedings. "
+            "Seek legal assistance immediately. You may still have options "
+            "including loan modification, short sale, or deed in lieu."
+        ),
+        condition=lambda c: c["days_past_due"] >= 120,
+        action_required=True,
+    ),
+    WarningRule(
+        type=WarningType.HIGH_DTI,
+        severity=WarningSeverity.WARNING,
+        title="High Debt-to-Income Ratio",
+        message=(
+            "Your debt-to-income ratio is {dti_ratio:.1f}%. "
+            "This exceeds the recommended 43% maximum. Consider ways to "
+            "reduce expenses or increase income."
+        ),
+        condition=lambda c: c["dti_ratio"] > 43,
+    ),
+    # Underwater (LTV > 100%); NaN LTV never matches
+    WarningRule(
+        type=WarningType.UNDERWATER,
+        severity=WarningSeverity.WARNING,
+        title="Underwater Mortgage",
+        message=(
+            "Your loan-to-value ratio is {ltv_ratio:.1f}%. "
+            "You owe more than your home is worth. This may affect your "
+            "refinancing options but does not prevent loan modification."
+        ),
+        condition=lambda c: c["ltv_ratio"] > 100,
+    ),
+]
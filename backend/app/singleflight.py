@@ -0,0 +1,55 @@
+"""In-process coalescing of concurrent identical computations.
+
+Concurrent callers with the same key share one in-flight call: the first
+runs it and the rest wait for its result (or exception). Nothing is cached;
+once the call finishes the next caller starts a fresh one. Keys must capture
+everything the result depends on.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Shares one call among concurrent callers on threads of this process."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        # Callers served by another caller's call, for tests and metrics
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return fn()'s result, running it only if no call for key is in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+analytics_flight = SingleFlight()
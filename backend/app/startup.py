@@ -0,0 +1,29 @@
+"""Startup time breakdown, reported once the app is ready to serve."""
+import time
+from typing import Dict
+
+
+class StartupTimer:
+    """Records elapsed milliseconds for each named startup phase."""
+
+    def __init__(self):
+        self._last = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """Close the current phase under the given name."""
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 1)
+        self._last = now
+
+    def resume(self) -> None:
+        """Start a new phase now, excluding time spent outside startup."""
+        self._last = time.perf_counter()
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(self.phases.values()), 1)
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name}={ms}ms" for name, ms in self.phases.items())
+        return f"{self.total_ms}ms ({phases})"
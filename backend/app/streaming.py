@@ -0,0 +1,177 @@
+"""Server-sent event fan-out of risk transitions.
+
+Transitions are recorded in mortgage_transitions by whichever process
+rescored the loan (a request worker or the daily job). One poller per
+server process tails that table and pushes new rows into each connection's
+bounded buffer, so the database sees one query per poll interval however
+many clients are connected. A client that falls behind gets an overflow
+event and is disconnected; reconnecting with Last-Event-ID replays what it
+missed from the table.
+"""
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Set
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.schemas.mortgage import RiskTransition
+from app.services.transitions import TransitionService
+
+logger = logging.getLogger(__name__)
+
+TRANSITION_POLL_INTERVAL = float(os.getenv("TRANSITION_POLL_INTERVAL", "1"))
+TRANSITION_BUFFER_SIZE = int(os.getenv("TRANSITION_BUFFER_SIZE", "100"))
+# Comment line sent on idle connections so proxies keep them open
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+
+def format_event(transition: RiskTransition) -> str:
+    return f"id: {transition.id}\nevent: transition\ndata: {transition.model_dump_json()}\n\n"
+
+
+class Subscription:
+    """One connection's filters and bounded buffer."""
+
+    def __init__(
+        self,
+        states: Optional[Iterable[str]],
+        mortgage_ids: Optional[Iterable[int]],
+        after_id: int,
+        buffer_size: int,
+    ):
+        self.states = {state.upper() for state in states} if states else None
+        self.mortgage_ids = set(mortgage_ids) if mortgage_ids else None
+        self.after_id = after_id
+        # Transitions up to this id predate the subscription and are replayed
+        # from the table; later ones arrive through the queue
+        self.replay_until = after_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.overflowed = False
+
+    def matches(self, transition: RiskTransition) -> bool:
+        if self.states is not None and transition.state not in self.states:
+            return False
+        if self.mortgage_ids is not None and transition.mortgage_id not in self.mortgage_ids:
+            return False
+        return True
+
+    def offer(self, transition: RiskTransition) -> None:
+        """Buffer a transition, or mark the subscription overflowed when full."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(transition)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class TransitionBroadcaster:
+    """Shared table poller feeding every open transition stream."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        poll_interval: float,
+        buffer_size: int,
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.buffer_size = buffer_size
+        self._subscriptions: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_id = 0
+        self._poll_lock = asyncio.Lock()
+
+    def subscribe(
+        self,
+        after_id: int,
+        states: Optional[Iterable[str]] = None,
+        mortgage_ids: Optional[Iterable[int]] = None,
+    ) -> Subscription:
+        """Register a connection that has seen transitions up to after_id."""
+        subscription = Subscription(states, mortgage_ids, after_id, self.buffer_size)
+        if self._task is None or self._task.done():
+            self._last_id = after_id
+            self._task = asyncio.create_task(self._run())
+        subscription.replay_until = max(after_id, self._last_id)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def _fetch(self) -> List[RiskTransition]:
+        db = self.session_factory()
+        try:
+            return TransitionService.fetch(db, self._last_id)
+        finally:
+            db.close()
+
+    async def poll(self) -> int:
+        """Fetch new transitions once and fan them out. Returns the count."""
+        async with self._poll_lock:
+            transitions = await run_in_threadpool(self._fetch)
+            for transition in transitions:
+                for subscription in list(self._subscriptions):
+                    if (
+                        transition.id > subscription.replay_until
+                        and subscription.matches(transition)
+                    ):
+                        subscription.offer(transition)
+            if transitions:
+                self._last_id = transitions[-1].id
+            return len(transitions)
+
+    async def _run(self) -> None:
+        # Stops when the last subscriber leaves; the next one restarts it
+        while self._subscriptions:
+            try:
+                fetched = await self.poll()
+            except Exception:
+                logger.exception("Transition poll failed")
+                fetched = 0
+            if fetched < TransitionService.FETCH_LIMIT:
+                await asyncio.sleep(self.poll_interval)
+
+    async def events(self, db: Session, subscription: Subscription) -> AsyncIterator[str]:
+        """
+        SSE stream for a subscription: replays missed transitions from the
+        table, then relays live ones. Ends with an overflow event if the
+        client falls a full buffer behind.
+        """
+        try:
+            after_id = subscription.after_id
+            while after_id < subscription.replay_until:
+                batch = await run_in_threadpool(TransitionService.fetch, db, after_id)
+                if not batch:
+                    break
+                for transition in batch:
+                    if transition.id > subscription.replay_until:
+                        break
+                    if subscription.matches(transition):
+                        yield format_event(transition)
+                after_id = batch[-1].id
+            await run_in_threadpool(db.close)
+
+            while True:
+                if subscription.overflowed and subscription.queue.empty():
+                    yield "event: overflow\ndata: {}\n\n"
+                    return
+                try:
+                    transition = await asyncio.wait_for(
+                        subscription.queue.get(), SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(transition)
+        finally:
+            self.unsubscribe(subscription)
+            db.close()
+
+
+transition_broadcaster = TransitionBroadcaster(
+    SessionLocal, TRANSITION_POLL_INTERVAL, TRANSITION_BUFFER_SIZE
+)
@@ -0,0 +1,45 @@
+# Gunicorn configuration for production
+# Usage: gunicorn -c gunicorn.conf.py app.main:app
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Async workers each serve many requests; CPU-bound work goes to the
+# calculation pool, which splits the cores between them (see app/compute.py).
+# Two fit a small instance's memory; WEB_CONCURRENCY overrides (Render sets it)
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "app.server.UvicornWorker"
+
+# Import the app once in the master so workers fork with it loaded
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+# Restart and shutdown behaviour
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+# Keep idle client connections open slightly longer than the load balancer's
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+
+accesslog = "-"
+errorlog = "-"
+
+# With SCHEDULER_ENABLED every worker starts the daily scheduler, and the one
+# holding the database's scheduler lock runs the jobs (see app/jobs/scheduler.py).
+
+
+def on_starting(server):
+    """Bring the schema up to date once in the master, before workers start."""
+    from app.database import init_db
+
+    init_db()
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the master process."""
+    from app.database import engine
+
+    engine.dispose(close=False)
@@ -1,3 +1,4 @@
+import os
 import pytest
 from datetime import date, timedelta
 from fastapi.testclient import TestClient
@@ -5,8 +6,11 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+# The suite shares one client address; rate limiting is tested on its own
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db
 
 
 # Create test database
@@ -43,6 +47,7 @@ def db():
 def client(db):
     """Create test client with database override."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     Base.metadata.create_all(bind=engine)
     with TestClient(app) as c:
         yield c
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from app.models.archive import ArchivedMortgage
+from app.models.milestone import MortgageMilestone
+from app.models.mortgage import Mortgage
+from app.models.score import MortgageScore
+from app.services.archive import ArchiveService
+from app.services.portfolio import PortfolioService
+
+
+class TestArchive:
+    """Tests for moving inactive loans to the archive."""
+
+    def pay_off(self, client, mortgage_id):
+        client.put(
+            f"/api/v1/mortgages/{mortgage_id}", json={"current_balance": 0, "missed_payments": 0}
+        )
+
+    def test_archive_inactive(self, client, db, sample_mortgage_data, sample_mortgage_current):
+        """Only paid-off loans past the cutoff move, in batches, keeping their values."""
+        ids = [
+            client.post("/api/v1/mortgages", json=data).json()["id"]
+            for data in (sample_mortgage_data, sample_mortgage_current, sample_mortgage_current)
+        ]
+        self.pay_off(client, ids[0])
+        self.pay_off(client, ids[2])
+        client.put(f"/api/v1/mortgages/{ids[1]}", json={"remaining_months": 0, "missed_payments": 1})
+
+        assert ArchiveService.archive_inactive(db) == 0
+        later = datetime.utcnow() + ArchiveService.AFTER + timedelta(days=1)
+        assert ArchiveService.archive_inactive(db, batch_size=1, now=later) == 2
+
+        assert list(PortfolioService.load(db).id) == [ids[1]]
+        archived = db.get(ArchivedMortgage, ids[2])
+        assert archived.archive_reason == "PAID_OFF"
+        assert archived.interest_rate == sample_mortgage_current["interest_rate"]
+        assert db.query(MortgageScore).filter(MortgageScore.mortgage_id.in_(ids[::2])).count() == 0
+
+    def test_get_archived(self, client, db, sample_mortgage_data):
+        """Archived loans stay readable by id but leave listings."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        self.pay_off(client, mortgage_id)
+        ArchiveService.archive_inactive(db, now=datetime.utcnow() + ArchiveService.AFTER * 2)
+
+        response = client.get(f"/api/v1/mortgages/{mortgage_id}")
+        assert response.status_code == 200
+        assert response.json()["current_balance"] == 0
+        assert response.json()["archive_reason"] == "PAID_OFF"
+        assert client.get("/api/v1/mortgages").json() == []
+        assert client.get(f"/api/v1/mortgages/{mortgage_id}/dashboard").status_code == 404
+
+    def test_archived_ids_not_reused(self, client, db, sample_mortgage_data):
+        """A loan created after archiving the newest one gets a fresh id."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        max_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        client.post(f"/api/v1/mortgages/{max_id}/archive")
+
+        new_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+
+        assert new_id > max_id
+        assert client.get(f"/api/v1/mortgages/{max_id}").json()["archive_reason"] == "RESOLVED"
+
+    def test_archive_resolved(self, client, db, sample_mortgage_data):
+        """A resolved loan is archived on request and the change feed reports it."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+
+        response = client.post(f"/api/v1/mortgages/{mortgage_id}/archive")
+
+        assert response.status_code == 200
+        assert response.json()["archive_reason"] == "RESOLVED"
+        assert db.get(Mortgage, mortgage_id) is None
+        assert db.query(MortgageMilestone).count() == 0
+        changes = client.get("/api/v1/changes").json()["changes"]
+        assert [c["change_type"] for c in changes] == ["ARCHIVED"]
+        history = client.get(f"/api/v1/mortgages/{mortgage_id}/history").text.splitlines()
+        assert len(history) == 2
+        assert client.post(f"/api/v1/mortgages/{mortgage_id}/archive").status_code == 404
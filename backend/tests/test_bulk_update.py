@@ -0,0 +1,101 @@
+from app.models.event import MortgageEvent
+from app.models.milestone import MortgageMilestone
+from app.models.mortgage import Mortgage
+from app.models.score import MortgageScore
+from app.services.mortgages import MortgageService
+
+
+class TestBulkUpdate:
+    """Tests for bulk partial updates."""
+
+    def test_bulk_patch_statuses(self, client, sample_mortgage_data, sample_mortgage_current):
+        """Each update gets a status, in request order."""
+        first_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        second_id = client.post("/api/v1/mortgages", json=sample_mortgage_current).json()["id"]
+
+        response = client.patch(
+            "/api/v1/mortgages",
+            json={
+                "updates": [
+                    {"id": first_id, "missed_payments": 3, "current_balance": 270000},
+                    {"id": 9999, "missed_payments": 1},
+                    {"id": second_id, "missed_payments": 0},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": first_id, "status": "UPDATED"},
+            {"id": 9999, "status": "NOT_FOUND"},
+            {"id": second_id, "status": "UNCHANGED"},
+        ]
+        mortgage = client.get(f"/api/v1/mortgages/{first_id}").json()
+        assert mortgage["missed_payments"] == 3
+        assert mortgage["current_balance"] == 270000
+        assert mortgage["monthly_income"] == sample_mortgage_data["monthly_income"]
+
+    def test_derived_data_refreshed(self, client, db, sample_mortgage_current):
+        """Scores, milestones and events follow the bulk update."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_current).json()["id"]
+
+        MortgageService.bulk_update(db, [{"id": mortgage_id, "missed_payments": 6}])
+
+        assert db.get(MortgageScore, mortgage_id).risk_level == "CRITICAL"
+        assert db.query(MortgageMilestone).filter_by(mortgage_id=mortgage_id).count() == 5
+        event = db.query(MortgageEvent).order_by(MortgageEvent.id.desc()).first()
+        assert event.event_type == "UPDATED"
+        assert event.previous == {"missed_payments": 0}
+
+    def test_chunks_and_repeated_ids(self, client, db, sample_mortgage_data):
+        """Updates apply in order across chunks, including repeats of one id."""
+        ids = [
+            client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+            for _ in range(3)
+        ]
+        updates = [{"id": i, "missed_payments": 4} for i in ids]
+        updates.append({"id": ids[0], "missed_payments": 5})
+
+        results = MortgageService.bulk_update(db, updates, chunk_size=2)
+
+        assert [r.status.value for r in results] == ["UPDATED"] * 4
+        db.expire_all()
+        assert [client.get(f"/api/v1/mortgages/{i}").json()["missed_payments"] for i in ids] == [5, 4, 4]
+        assert db.query(MortgageEvent).filter_by(event_type="UPDATED").count() == 4
+
+    def test_single_transaction(self, client, db, sample_mortgage_data):
+        """With commit=False every chunk rolls back together."""
+        ids = [
+            client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+            for _ in range(2)
+        ]
+        updates = [{"id": i, "missed_payments": 4} for i in ids]
+        updates.append({"id": ids[0], "missed_payments": 5})
+
+        results = MortgageService.bulk_update(db, updates, chunk_size=1, commit=False)
+        assert [r.status.value for r in results] == ["UPDATED"] * 3
+        assert db.get(Mortgage, ids[0]).missed_payments == 5
+        db.rollback()
+
+        assert [db.get(Mortgage, i).missed_payments for i in ids] == [2, 2]
+        assert db.query(MortgageEvent).filter_by(event_type="UPDATED").count() == 0
+
+    def test_idempotent_patch(self, client, db, sample_mortgage_data):
+        """A keyed PATCH is applied once and replayed after."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        body = {"updates": [{"id": mortgage_id, "missed_payments": 4}]}
+        headers = {"Idempotency-Key": "patch-1"}
+
+        first = client.patch("/api/v1/mortgages", json=body, headers=headers)
+        replayed = client.patch("/api/v1/mortgages", json=body, headers=headers)
+
+        assert replayed.json() == first.json() == [{"id": mortgage_id, "status": "UPDATED"}]
+        assert replayed.headers["Idempotent-Replayed"] == "true"
+        assert db.query(MortgageEvent).filter_by(event_type="UPDATED").count() == 1
+
+    def test_validation_error(self, client):
+        """Invalid field values reject the request."""
+        response = client.patch(
+            "/api/v1/mortgages", json={"updates": [{"id": 1, "missed_payments": -1}]}
+        )
+        assert response.status_code == 422
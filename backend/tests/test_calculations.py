@@ -1,5 +1,9 @@
 import pytest
-from app.services.calculations import CalculationService
+from datetime import date, timedelta
+
+from app.clock import FixedClock, get_clock
+from app.main import app
+from app.services.calculations import CalculationService, _days_past_due
 from app.schemas.mortgage import RiskLevel
 
 
@@ -94,6 +98,63 @@ class TestCalculationService:
         # 5% per missed payment
         assert round(fees, 2) == 189.62
 
+    def test_next_payment_due_matches_period_walk(self):
+        """Test O(1) next due date equals walking forward 30 days at a time."""
+        today = date(2024, 3, 15)
+        for days_ago in range(-40, 1200, 3):
+            last_payment = today - timedelta(days=days_ago)
+            expected = last_payment + timedelta(days=30)
+            while expected < today:
+                expected += timedelta(days=30)
+            assert CalculationService.get_next_payment_due(last_payment, today) == expected
+
+    def test_next_payment_due_no_history(self):
+        """Test next due date without payment history is the 1st of next month."""
+        assert CalculationService.get_next_payment_due(None, date(2024, 12, 10)) == date(2025, 1, 1)
+        assert CalculationService.get_next_payment_due(None, date(2024, 5, 1)) == date(2024, 5, 1)
+
+    def test_days_past_due_as_of(self):
+        """Test days past due is computed relative to the given date."""
+        last_payment = date(2024, 1, 1)
+        assert CalculationService.calculate_days_past_due(last_payment, 2, date(2024, 3, 1)) == 30
+        assert CalculationService.calculate_days_past_due(last_payment, 2, date(2024, 1, 15)) == 0
+
+    def test_days_past_due_memoized(self):
+        """Test repeated calls on the same day reuse the cached value."""
+        last_payment = date(2019, 7, 4)
+        today = date(2024, 3, 15)
+        CalculationService.calculate_days_past_due(last_payment, 3, today)
+        hits = _days_past_due.cache_info().hits
+        CalculationService.calculate_days_past_due(last_payment, 3, today)
+        assert _days_past_due.cache_info().hits == hits + 1
+
+
+class TestClock:
+    """Tests for the injectable clock."""
+
+    def test_fixed_clock_dashboard(self, client, sample_mortgage_data):
+        """Test endpoints use the clock dependency for today's date."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        today = client.get(f"/api/v1/mortgages/{mortgage_id}/dashboard").json()
+
+        app.dependency_overrides[get_clock] = lambda: FixedClock(date.today() + timedelta(days=10))
+        later = client.get(f"/api/v1/mortgages/{mortgage_id}/dashboard").json()
+
+        assert later["days_past_due"] == today["days_past_due"] + 10
+
+    def test_as_of_query(self, client, sample_mortgage_data):
+        """Test an as_of query parameter overrides today's date."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        last_payment = date.fromisoformat(sample_mortgage_data["last_payment_date"])
+        as_of = last_payment + timedelta(days=100)
+
+        params = {"as_of": as_of.isoformat()}
+
+        dashboard = client.get(f"/api/v1/mortgages/{mortgage_id}/dashboard", params=params)
+        assert dashboard.json()["days_past_due"] == 70
+        deadlines = client.get(f"/api/v1/mortgages/{mortgage_id}/deadlines", params=params)
+        assert deadlines.json()["current_stage"] == "DEFAULT"
+
 
 class TestPaymentCalculationEndpoint:
     """Tests for payment calculation API endpoint."""
@@ -0,0 +1,87 @@
+import json
+from datetime import datetime, timedelta
+
+from app.cursors import CURSOR_SETTLE_SECONDS
+from app.models.event import MortgageEvent
+from app.services.changes import ChangeFeedService
+
+
+class TestChangeFeed:
+    """Tests for the incremental change feed."""
+
+    def test_changes_since_cursor(self, client, sample_mortgage_data, sample_mortgage_current):
+        """Only changes after the cursor are returned, with current rows."""
+        first_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        page = client.get("/api/v1/changes").json()
+        assert [c["change_type"] for c in page["changes"]] == ["CREATED"]
+        assert page["changes"][0]["mortgage"]["id"] == first_id
+
+        second_id = client.post("/api/v1/mortgages", json=sample_mortgage_current).json()["id"]
+        client.put(f"/api/v1/mortgages/{first_id}", json={"missed_payments": 4})
+        client.delete(f"/api/v1/mortgages/{second_id}")
+
+        delta = client.get("/api/v1/changes", params={"cursor": page["next_cursor"]}).json()
+
+        assert [(c["mortgage_id"], c["change_type"]) for c in delta["changes"]] == [
+            (first_id, "UPDATED"),
+            (second_id, "DELETED"),
+        ]
+        assert delta["changes"][0]["mortgage"]["missed_payments"] == 4
+        assert delta["changes"][1]["mortgage"] is None
+        assert delta["has_more"] is False
+
+    def test_collapses_within_page(self, client, sample_mortgage_data):
+        """Several events for one mortgage in a page become one change."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        for missed in range(3, 6):
+            client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": missed})
+
+        page = client.get("/api/v1/changes").json()
+
+        assert len(page["changes"]) == 1
+        assert page["changes"][0]["change_type"] == "CREATED"
+        assert page["changes"][0]["mortgage"]["missed_payments"] == 5
+        assert page["next_cursor"] == page["changes"][0]["cursor"]
+
+    def test_paging(self, client, db, sample_mortgage_data):
+        """Pages follow next_cursor until has_more is false."""
+        ids = [
+            client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+            for _ in range(5)
+        ]
+
+        first = ChangeFeedService.read(db, 0, limit=2)
+        assert first.has_more is True
+        assert [c.mortgage_id for c in ChangeFeedService.iter_changes(db, 0, limit=2)] == ids
+
+    def test_holds_back_behind_gap(self, client, db, sample_mortgage_data):
+        """Events after a missing id wait until it can no longer commit."""
+        for _ in range(3):
+            client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        # Stands in for an event whose transaction is still open
+        db.query(MortgageEvent).filter_by(id=2).delete()
+        db.commit()
+
+        page = ChangeFeedService.read(db, 0)
+        assert [c.cursor for c in page.changes] == [1]
+        assert page.next_cursor == 1
+        assert page.has_more is False
+        assert ChangeFeedService.read(db, 1).changes == []
+
+        later = datetime.utcnow() + timedelta(seconds=CURSOR_SETTLE_SECONDS + 1)
+        assert [c.cursor for c in ChangeFeedService.read(db, 1, now=later).changes] == [3]
+
+    def test_stream(self, client, sample_mortgage_data):
+        """The stream endpoint returns every change as NDJSON."""
+        for _ in range(3):
+            client.post("/api/v1/mortgages", json=sample_mortgage_data)
+
+        response = client.get("/api/v1/changes/stream", params={"cursor": 1})
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line)["cursor"] for line in response.text.splitlines()] == [2, 3]
+
+    def test_long_poll_times_out_empty(self, client):
+        """A long-poll with no changes returns an empty page at the deadline."""
+        page = client.get("/api/v1/changes", params={"cursor": 0, "wait": 0.2}).json()
+        assert page == {"changes": [], "next_cursor": 0, "has_more": False}
@@ -0,0 +1,120 @@
+import gzip
+import zlib
+
+import pytest
+
+from app.middleware.compression import ENCODERS, PrecompressedPayload, compress, negotiate
+
+
+# Optional encodings and the packages that provide them
+OPTIONAL_PACKAGES = {"br": "brotli", "zstd": "zstandard"}
+
+
+def decompress(raw, encoding):
+    package = pytest.importorskip(OPTIONAL_PACKAGES[encoding])
+    if encoding == "br":
+        return package.decompress(raw)
+    # Streamed frames don't record their size, so decode incrementally
+    return package.ZstdDecompressor().decompressobj().decompress(raw)
+
+
+class TestNegotiation:
+    """Tests for Accept-Encoding negotiation."""
+
+    def test_negotiate(self):
+        """Highest q-value wins; ties go to the server's preference."""
+        available = ["br", "zstd", "gzip"]
+        assert negotiate("gzip, deflate, br", available) == "br"
+        assert negotiate("gzip;q=1.0, br;q=0.5", available) == "gzip"
+        assert negotiate("br;q=0, *", available) == "zstd"
+        assert negotiate("deflate", available) is None
+        assert negotiate(None, available) is None
+
+    def test_unavailable_encodings_skipped(self):
+        """Encodings without their optional package are never chosen."""
+        assert negotiate("br, gzip;q=0.5", ["gzip"]) == "gzip"
+        assert "gzip" in ENCODERS
+
+    @pytest.mark.parametrize("encoding", list(ENCODERS))
+    def test_payload_variants(self, encoding):
+        """Precompressed variants match the selected encoding."""
+        body = b'{"state": "CA"}' * 100
+        payload = PrecompressedPayload(body)
+
+        response = payload.response(encoding)
+
+        assert response.headers["Content-Encoding"] == encoding
+        assert len(response.body) < len(body)
+        assert payload.response(None).body == body
+
+
+class TestCompressionMiddleware:
+    """Tests for compressing API responses."""
+
+    def test_large_response_compressed(self, client, sample_mortgage_data):
+        """Large JSON responses are gzip encoded; small ones are not."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+
+        guidance = client.get(
+            f"/api/v1/mortgages/{mortgage_id}/guidance", headers={"Accept-Encoding": "gzip"}
+        )
+        assert guidance.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in guidance.headers["Vary"]
+
+        small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in small.headers
+
+        identity = client.get(
+            f"/api/v1/mortgages/{mortgage_id}/guidance", headers={"Accept-Encoding": "identity"}
+        )
+        assert "Content-Encoding" not in identity.headers
+        assert guidance.json() == identity.json()
+
+    def test_stream_compressed_per_chunk(self, client, sample_mortgage_data):
+        """Streamed NDJSON is compressed without a Content-Length and decodes in full."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 3})
+
+        with client.stream(
+            "GET", f"/api/v1/mortgages/{mortgage_id}/history", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert "Content-Length" not in response.headers
+            raw = b"".join(response.iter_raw())
+
+        assert len(gzip.decompress(raw).splitlines()) == 2
+
+    def test_states_precompressed(self, client):
+        """The state catalogue is served from precompressed bytes."""
+        plain = client.get("/api/v1/states", headers={"Accept-Encoding": "identity"})
+        with client.stream("GET", "/api/v1/states", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert zlib.decompress(raw, 31) == plain.content
+        assert len(raw) * 4 < len(plain.content)
+        assert len(plain.json()) == 51
+        assert raw == compress(plain.content, "gzip", ENCODERS["gzip"][2])
+
+    @pytest.mark.parametrize("encoding", ["br", "zstd"])
+    def test_optional_encodings_round_trip(self, client, sample_mortgage_data, encoding):
+        """br and zstd responses and streams decode to the identity body."""
+        pytest.importorskip(OPTIONAL_PACKAGES[encoding])
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 3})
+        headers = {"Accept-Encoding": encoding}
+
+        for path in (f"/api/v1/mortgages/{mortgage_id}/guidance", "/api/v1/states"):
+            plain = client.get(path, headers={"Accept-Encoding": "identity"})
+            with client.stream("GET", path, headers=headers) as response:
+                raw = b"".join(response.iter_raw())
+            assert response.headers["Content-Encoding"] == encoding
+            assert decompress(raw, encoding) == plain.content
+
+        with client.stream(
+            "GET", f"/api/v1/mortgages/{mortgage_id}/history", headers=headers
+        ) as response:
+            raw = b"".join(response.iter_raw())
+        assert response.headers["Content-Encoding"] == encoding
+        assert "Content-Length" not in response.headers
+        assert len(decompress(raw, encoding).splitlines()) == 2
@@ -0,0 +1,37 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+
+from app.compute import ComputePool
+
+
+class TestComputePool:
+    """Tests for the calculation worker pool."""
+
+    def test_run(self):
+        """Work runs in the pool and returns its result."""
+        pool = ComputePool(workers=0, max_pending=2, retry_after=1)
+        try:
+            assert asyncio.run(pool.run(pow, 2, 10, timeout=5)) == 1024
+            assert pool.pending == 0
+        finally:
+            pool.shutdown()
+
+    def test_saturated_returns_503(self):
+        """Requests beyond the pending limit are rejected with Retry-After."""
+        pool = ComputePool(workers=0, max_pending=0, retry_after=3)
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(pool.run(pow, 2, 10, timeout=5))
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "3"
+
+    def test_timeout_returns_504(self):
+        """Calls exceeding their timeout fail with 504."""
+        pool = ComputePool(workers=0, max_pending=2, retry_after=1)
+        try:
+            with pytest.raises(HTTPException) as exc_info:
+                asyncio.run(pool.run(time.sleep, 0.5, timeout=0.05))
+            assert exc_info.value.status_code == 504
+        finally:
+            pool.shutdown()
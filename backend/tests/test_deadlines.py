@@ -0,0 +1,100 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.deadlines import reset_deadline, set_deadline
+from app.middleware.deadline import REQUEST_TIMEOUT_DEFAULT, route_timeout
+from app.models.mortgage import Mortgage
+from app.services.milestones import MilestoneService
+from app.services.mortgages import MortgageService
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) "
+    "SELECT COUNT(*) FROM n"
+)
+
+
+class TestDeadlines:
+    """Tests for per-request deadlines."""
+
+    def test_route_timeouts(self):
+        """Streams have no default deadline; batch routes get longer ones."""
+        assert route_timeout("/api/v1/mortgages/1/dashboard") == REQUEST_TIMEOUT_DEFAULT
+        assert route_timeout("/api/v1/changes/stream") is None
+        assert route_timeout("/api/v1/projections") == 60
+
+    def test_sqlite_query_interrupted(self, db):
+        """A query running past the deadline is cancelled and the connection reset."""
+        token = set_deadline(0.05)
+        try:
+            with pytest.raises(OperationalError, match="interrupted"):
+                db.execute(SLOW_QUERY)
+            db.rollback()
+        finally:
+            reset_deadline(token)
+        db.close()
+
+        assert db.execute(text("SELECT 1")).scalar() == 1
+
+    def test_request_timeout_header(self, client, sample_mortgage_data):
+        """An expired client deadline ends the request with 504."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+
+        response = client.get("/api/v1/warnings", headers={"X-Request-Timeout": "0.000001"})
+        assert response.status_code == 504
+        assert client.get("/api/v1/warnings", headers={"X-Request-Timeout": "5"}).status_code == 200
+        assert client.get("/health", headers={"X-Request-Timeout": "0.000001"}).status_code == 200
+
+    def test_cancelled_query_returns_504(self, client, monkeypatch):
+        """A query cancelled mid-request maps to 504, not a server error."""
+        monkeypatch.setattr(
+            MilestoneService,
+            "find_upcoming",
+            lambda db, start, end, **filters: db.execute(SLOW_QUERY).all(),
+        )
+
+        response = client.get("/api/v1/deadlines/upcoming", headers={"X-Request-Timeout": "0.05"})
+        assert response.status_code == 504
+
+    def test_bulk_update_stops_after_committed_chunk(
+        self, client, db, sample_mortgage_data, monkeypatch
+    ):
+        """Running out of time between chunks keeps committed ones and skips the rest."""
+        ids = [
+            client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+            for _ in range(3)
+        ]
+        update_chunk = MortgageService._update_chunk
+
+        def slow_chunk(db, chunk):
+            results = update_chunk(db, chunk)
+            time.sleep(0.05)
+            return results
+
+        monkeypatch.setattr(MortgageService, "_update_chunk", staticmethod(slow_chunk))
+        token = set_deadline(0.02)
+        try:
+            results = MortgageService.bulk_update(
+                db, [{"id": i, "missed_payments": 4} for i in ids], chunk_size=1
+            )
+        finally:
+            reset_deadline(token)
+
+        assert [r.status.value for r in results] == ["UPDATED", "SKIPPED", "SKIPPED"]
+        db.expire_all()
+        assert [db.get(Mortgage, i).missed_payments for i in ids] == [4, 2, 2]
+
+    def test_bulk_update_expired_before_start(self, client, db, sample_mortgage_data):
+        """An already expired deadline fails the batch before anything is written."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        token = set_deadline(0)
+        try:
+            with pytest.raises(HTTPException) as exc_info:
+                MortgageService.bulk_update(db, [{"id": mortgage_id, "missed_payments": 4}])
+        finally:
+            reset_deadline(token)
+
+        assert exc_info.value.status_code == 504
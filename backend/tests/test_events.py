@@ -0,0 +1,55 @@
+import json
+
+from app.models.event import MortgageEvent
+from app.services.events import EventService
+
+
+def read_history(client, mortgage_id):
+    response = client.get(f"/api/v1/mortgages/{mortgage_id}/history")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestMortgageEvents:
+    """Tests for the append-only mortgage event log."""
+
+    def test_create_update_delete_recorded(self, client, sample_mortgage_data):
+        """Every write appends an event with new and prior values."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        client.put(
+            f"/api/v1/mortgages/{mortgage_id}",
+            json={"missed_payments": 3, "current_balance": 270000},
+        )
+        client.delete(f"/api/v1/mortgages/{mortgage_id}")
+
+        history = read_history(client, mortgage_id)
+
+        assert [e["event_type"] for e in history] == ["CREATED", "UPDATED", "DELETED"]
+        assert history[0]["data"]["missed_payments"] == 2
+        assert history[0]["data"]["last_payment_date"] == sample_mortgage_data["last_payment_date"]
+        assert history[1]["data"] == {"missed_payments": 3, "current_balance": 270000}
+        assert history[1]["previous"] == {"missed_payments": 2, "current_balance": 275000}
+        assert history[2]["data"]["missed_payments"] == 3
+
+    def test_noop_update_not_recorded(self, client, db, sample_mortgage_data):
+        """An update that changes nothing appends no event."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 2})
+
+        assert db.query(MortgageEvent).count() == 1
+
+    def test_history_batches(self, client, db, sample_mortgage_data):
+        """History is read in keyset batches, oldest first."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        for missed in range(3, 8):
+            client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": missed})
+
+        events = list(EventService.iter_history(db, mortgage_id, batch_size=2))
+
+        assert len(events) == 6
+        assert [e.id for e in events] == sorted(e.id for e in events)
+
+    def test_history_not_found(self, client):
+        """Loans with no mortgage and no history return 404."""
+        assert client.get("/api/v1/mortgages/9999/history").status_code == 404
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from app.models.idempotency import IdempotencyKey
+from app.models.mortgage import Mortgage
+from app.schemas.mortgage import MortgageCreate
+from app.services.idempotency import IdempotencyService
+from app.services.mortgages import MortgageService
+
+
+class TestIdempotency:
+    """Tests for Idempotency-Key handling on writes."""
+
+    def test_create_replayed(self, client, db, sample_mortgage_data):
+        """A retried create returns the first response without a duplicate."""
+        headers = {"Idempotency-Key": "create-1"}
+        first = client.post("/api/v1/mortgages", json=sample_mortgage_data, headers=headers)
+        retry = client.post("/api/v1/mortgages", json=sample_mortgage_data, headers=headers)
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.json() == first.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert db.query(Mortgage).count() == 1
+
+    def test_without_key_not_deduplicated(self, client, db, sample_mortgage_data):
+        """Requests without a key behave as before."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        assert db.query(Mortgage).count() == 2
+        assert db.query(IdempotencyKey).count() == 0
+
+    def test_key_reused_for_other_request(self, client, sample_mortgage_data):
+        """A key reused with a different body is rejected."""
+        headers = {"Idempotency-Key": "create-2"}
+        client.post("/api/v1/mortgages", json=sample_mortgage_data, headers=headers)
+        response = client.post(
+            "/api/v1/mortgages", json={**sample_mortgage_data, "state": "TX"}, headers=headers
+        )
+        assert response.status_code == 422
+
+    def test_bulk_create_and_update_replayed(self, client, db, sample_mortgage_data):
+        """Bulk create and update replay their stored responses."""
+        headers = {"Idempotency-Key": "bulk-1"}
+        body = {"mortgages": [sample_mortgage_data, sample_mortgage_data]}
+        created = client.post("/api/v1/mortgages/bulk", json=body, headers=headers)
+        replayed = client.post("/api/v1/mortgages/bulk", json=body, headers=headers)
+        assert created.status_code == 201
+        assert replayed.json() == created.json()
+        assert db.query(Mortgage).count() == 2
+
+        mortgage_id = created.json()[0]["id"]
+        headers = {"Idempotency-Key": "update-1"}
+        updated = client.put(
+            f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 4}, headers=headers
+        )
+        client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 5})
+        replayed = client.put(
+            f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 4}, headers=headers
+        )
+        assert replayed.json() == updated.json()
+        assert client.get(f"/api/v1/mortgages/{mortgage_id}").json()["missed_payments"] == 5
+
+    def test_concurrent_duplicate_replays_winner(self, client, db, sample_mortgage_data):
+        """A duplicate whose lookup ran before the first request committed replays it."""
+        first = Session(bind=db.get_bind())
+        second = Session(bind=db.get_bind())
+        data = MortgageCreate(**sample_mortgage_data).model_dump()
+
+        def create(session):
+            mortgage = MortgageService.create(session, data)
+            return {"id": mortgage.id}
+
+        def first_commits_then_create():
+            # The first request finishes after the second one's lookup
+            IdempotencyService.run(first, "race-1", "fp", 201, lambda: create(first))
+            return create(second)
+
+        response = IdempotencyService.run(second, "race-1", "fp", 201, first_commits_then_create)
+
+        assert response.headers["Idempotent-Replayed"] == "true"
+        assert db.query(Mortgage).count() == 1
+        first.close()
+        second.close()
+
+    def test_expired_keys(self, client, db, sample_mortgage_data):
+        """Expired keys are not replayed and are purged."""
+        headers = {"Idempotency-Key": "create-3"}
+        client.post("/api/v1/mortgages", json=sample_mortgage_data, headers=headers)
+        db.query(IdempotencyKey).update(
+            {"created_at": datetime.utcnow() - IdempotencyService.TTL - timedelta(minutes=1)}
+        )
+        db.commit()
+
+        client.post("/api/v1/mortgages", json=sample_mortgage_data, headers=headers)
+        assert db.query(Mortgage).count() == 2
+
+        assert IdempotencyService.purge_expired(db, datetime.utcnow() + IdempotencyService.TTL) == 1
+        assert db.query(IdempotencyKey).count() == 0
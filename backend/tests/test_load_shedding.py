@@ -0,0 +1,111 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.main import app
+from app.middleware.load_shedding import (
+    LatencyWindow,
+    LoadSheddingMiddleware,
+    Priority,
+    route_priority,
+)
+
+
+class TestLoadShedding:
+    """Tests for priority-based admission control."""
+
+    def test_route_priorities(self):
+        """CRUD and health are protected; calculators and exports go first."""
+        assert route_priority("/health") == Priority.CRITICAL
+        assert route_priority("/api/v1/mortgages") == Priority.CRITICAL
+        assert route_priority("/api/v1/mortgages/12") == Priority.CRITICAL
+        assert route_priority("/api/v1/mortgages/bulk") == Priority.CRITICAL
+        assert route_priority("/api/v1/mortgages/12/guidance") == Priority.NORMAL
+        assert route_priority("/api/v1/calculate/payment") == Priority.LOW
+        assert route_priority("/api/v1/mortgages/12/history") == Priority.LOW
+        assert route_priority("/api/v1/changes/stream") == Priority.LOW
+
+    def test_latency_window_expires(self):
+        """Mean latency only covers recent samples."""
+        window = LatencyWindow(window_seconds=10)
+        window.record(3.0, now=100)
+        window.record(1.0, now=105)
+        assert window.mean(now=106) == 2.0
+        assert window.mean(now=112) == 1.0
+        assert window.mean(now=200) == 0.0
+
+    def test_latency_window_min_samples(self):
+        """Too few samples don't count as latency."""
+        window = LatencyWindow(window_seconds=10, min_samples=3)
+        window.record(5.0, now=100)
+        window.record(5.0, now=100)
+        assert window.mean(now=101) == 0.0
+        window.record(2.0, now=101)
+        assert window.mean(now=101) == 4.0
+
+    @pytest.mark.parametrize(
+        "pressure, payment, guidance, crud",
+        [(0.5, 200, 200, 200), (1.2, 503, 200, 200), (2.0, 503, 503, 200)],
+    )
+    def test_sheds_by_priority(
+        self, client, sample_mortgage_data, monkeypatch, pressure, payment, guidance, crud
+    ):
+        """Rising pressure sheds LOW then NORMAL routes, never CRUD."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        middleware = LoadSheddingMiddleware(app)
+        monkeypatch.setattr(middleware, "pressure", lambda: pressure)
+        shed_client = TestClient(middleware)
+
+        response = shed_client.post(
+            "/api/v1/calculate/payment",
+            json={"principal": 275000, "annual_rate": 6.5, "term_months": 324},
+        )
+        assert response.status_code == payment
+        if payment == 503:
+            assert response.headers["Retry-After"] == "2"
+        assert shed_client.get(f"/api/v1/mortgages/{mortgage_id}/guidance").status_code == guidance
+        assert shed_client.get(f"/api/v1/mortgages/{mortgage_id}").status_code == crud
+        assert shed_client.get("/health").status_code == 200
+
+    def test_latency_raises_pressure(self, client):
+        """Recent slow responses push pressure past the limit."""
+        middleware = LoadSheddingMiddleware(app, target_latency_ms=100, min_samples=2)
+        shed_client = TestClient(middleware)
+        assert shed_client.get("/health").status_code == 200
+        assert middleware.in_flight == 0
+
+        middleware.latency.record(0.5)
+        middleware.latency.record(0.5)
+
+        response = shed_client.post(
+            "/api/v1/calculate/payment",
+            json={"principal": 275000, "annual_rate": 6.5, "term_months": 324},
+        )
+        assert response.status_code == 503
+        assert middleware.shed == 1
+
+    def test_low_routes_not_sampled(self, client):
+        """Calculator and export latency doesn't feed the signal."""
+        middleware = LoadSheddingMiddleware(app)
+        shed_client = TestClient(middleware)
+
+        shed_client.post(
+            "/api/v1/calculate/payment",
+            json={"principal": 275000, "annual_rate": 6.5, "term_months": 324},
+        )
+        assert len(middleware.latency._samples) == 0
+        shed_client.get("/api/v1/mortgages")
+        assert len(middleware.latency._samples) == 1
+
+    def test_pool_utilization(self, tmp_path):
+        """Checked-out connections count against the pool's size plus overflow."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1, max_overflow=1
+        )
+        middleware = LoadSheddingMiddleware(app, engine=engine, max_overflow=1)
+
+        with engine.connect():
+            assert middleware.pool_utilization() == 0.5
+            with engine.connect():
+                assert middleware.pool_utilization() == 1.0
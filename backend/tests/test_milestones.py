@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+
+from app.models.milestone import MortgageMilestone
+from app.services.milestones import MilestoneService
+
+
+class TestMilestoneService:
+    """Tests for MilestoneService."""
+
+    def test_build_rows_current_mortgage(self):
+        """Current mortgages have no materialized milestones."""
+
+        class Row:
+            id = 1
+            state = "TX"
+            last_payment_date = date.today() - timedelta(days=5)
+            missed_payments = 0
+
+        assert MilestoneService.build_rows(Row()) == []
+
+    def test_build_rows_match_deadline_info(self, client, sample_mortgage_data):
+        """Materialized dates match the deadlines endpoint."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        deadlines = client.get(f"/api/v1/mortgages/{mortgage_id}/deadlines").json()
+
+        response = client.get(
+            "/api/v1/deadlines/upcoming",
+            params={"start": str(date.today() - timedelta(days=60)), "days": 365},
+        )
+        assert response.status_code == 200
+        materialized = {(m["stage"], m["estimated_date"]) for m in response.json()}
+        expected = {(m["stage"], m["estimated_date"]) for m in deadlines["milestones"]}
+        assert materialized == expected
+
+    def test_refresh_all(self, db, client, sample_mortgage_data):
+        """Daily refresh rebuilds milestones for every delinquent mortgage."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        db.query(MortgageMilestone).delete()
+        db.commit()
+
+        assert MilestoneService.refresh_all(db, chunk_size=1) == 2
+        assert db.query(MortgageMilestone).count() == 10
+
+
+class TestUpcomingDeadlinesEndpoint:
+    """Tests for upcoming deadlines endpoint."""
+
+    def test_upcoming_window(self, client, sample_mortgage_data):
+        """Only milestones inside the window are returned."""
+        # CA, first missed payment 15 days ago: Notice of Sale at day 120
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        start = date.today() + timedelta(days=100)
+
+        response = client.get(
+            "/api/v1/deadlines/upcoming",
+            params={"start": str(start), "days": 14},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [m["stage"] for m in data] == ["Notice of Sale"]
+        assert data[0]["mortgage_id"] == mortgage_id
+        assert data[0]["state"] == "CA"
+        assert data[0]["days_until"] == 5
+
+    def test_upcoming_filters(self, client, sample_mortgage_data):
+        """Stage and state filters narrow the results."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        params = {"start": str(date.today()), "days": 365}
+
+        data = client.get(
+            "/api/v1/deadlines/upcoming", params={**params, "stage": "Foreclosure Sale"}
+        ).json()
+        assert [m["stage"] for m in data] == ["Foreclosure Sale"]
+
+        data = client.get(
+            "/api/v1/deadlines/upcoming", params={**params, "state": "TX"}
+        ).json()
+        assert data == []
+
+    def test_upcoming_tracks_updates(self, client, sample_mortgage_data):
+        """Milestones are removed when a loan becomes current or is deleted."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        params = {"start": str(date.today()), "days": 365}
+        assert len(client.get("/api/v1/deadlines/upcoming", params=params).json()) > 0
+
+        client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 0})
+        assert client.get("/api/v1/deadlines/upcoming", params=params).json() == []
+
+        client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 2})
+        assert len(client.get("/api/v1/deadlines/upcoming", params=params).json()) > 0
+
+        client.delete(f"/api/v1/mortgages/{mortgage_id}")
+        assert client.get("/api/v1/deadlines/upcoming", params=params).json() == []
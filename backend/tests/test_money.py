@@ -0,0 +1,172 @@
+import json
+
+import numpy as np
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app import database
+from app.migrations import apply, money_to_cents, schema_migrations
+from app.models.mortgage import Mortgage
+from app.money import apply_bps, round_cents, to_bps, to_cents
+from app.services.calculations import CalculationService
+from app.services.portfolio import MortgageColumns, PortfolioService
+
+
+class TestMoney:
+    """Tests for integer-cent money handling."""
+
+    def test_half_up_rounding(self):
+        """Conversions round half up on the decimal value, not the binary float."""
+        assert to_cents(0.285) == 29
+        assert to_cents(1896.2) == 189620
+        assert round_cents(2.675) == 2.68
+        assert to_bps(6.125) == 613
+        assert apply_bps(15, 5000) == 8
+        assert apply_bps(14, 5000) == 7
+
+    def test_stored_as_integers(self, client, db, sample_mortgage_data):
+        """Amounts are stored as cents and rates as basis points."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+
+        raw = db.execute(
+            text("SELECT current_balance, monthly_payment, interest_rate FROM mortgages")
+        ).one()
+
+        assert tuple(raw) == (27500000, 189620, 650)
+        assert db.get(Mortgage, mortgage_id).monthly_payment == 1896.20
+        assert client.get(f"/api/v1/mortgages/{mortgage_id}").json()["interest_rate"] == 6.5
+
+    def test_input_rounded_to_stored_precision(self, client, sample_mortgage_data):
+        """POST, PUT, GET and the event history all report the stored values."""
+        payload = {**sample_mortgage_data, "interest_rate": 6.125, "monthly_payment": 1896.205}
+        created = client.post("/api/v1/mortgages", json=payload).json()
+        mortgage_id = created["id"]
+        updated = client.put(
+            f"/api/v1/mortgages/{mortgage_id}", json={"current_balance": 270000.005}
+        ).json()
+        fetched = client.get(f"/api/v1/mortgages/{mortgage_id}").json()
+        history = [
+            json.loads(line)
+            for line in client.get(f"/api/v1/mortgages/{mortgage_id}/history").text.splitlines()
+        ]
+
+        assert created["interest_rate"] == fetched["interest_rate"] == 6.13
+        assert created["monthly_payment"] == fetched["monthly_payment"] == 1896.21
+        assert updated["current_balance"] == fetched["current_balance"] == 270000.01
+        assert history[0]["data"]["interest_rate"] == 6.13
+        assert history[0]["data"]["monthly_payment"] == 1896.21
+        assert history[1]["data"] == {"current_balance": 270000.01}
+
+    def test_dashboard_amounts_exact(self):
+        """Arrears and late fees are exact multiples of the payment in cents."""
+        assert CalculationService.calculate_arrears(0.1, 3) == 0.3
+        assert CalculationService.calculate_late_fees(1896.20, 2) == 189.62
+        assert CalculationService.calculate_total_interest(0.3, 0.1, 3) == 0.0
+
+    def test_int64_dti_matches_scalar_exactly(self):
+        """The int64 batch DTI is bit-identical to the scalar calculation."""
+        rng = np.random.default_rng(7)
+        n = 5000
+        payment = rng.integers(1, 1_000_000, n)
+        expenses = rng.integers(0, 1_000_000, n)
+        income = rng.integers(1, 3_000_000, n)
+        columns = MortgageColumns.from_rows(
+            [(i, 1, 1, 1, 360, 360, int(p), None, None, 0, int(inc), int(e), None, "CA")
+             for i, (p, e, inc) in enumerate(zip(payment, expenses, income))]
+        )
+
+        ratios = PortfolioService.dti_ratios(columns)
+
+        for row, ratio in zip(columns, ratios):
+            expected = CalculationService.calculate_dti_ratio(
+                row.monthly_payment, row.monthly_expenses, row.monthly_income
+            )
+            assert float(ratio) == expected
+
+    def test_migration(self):
+        """The migration rescales float columns once."""
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE mortgages (id INTEGER PRIMARY KEY, loan_amount FLOAT, "
+                    "current_balance FLOAT, interest_rate FLOAT, monthly_payment FLOAT, "
+                    "monthly_income FLOAT, monthly_expenses FLOAT, property_value FLOAT)"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO mortgages VALUES (1, 300000, 275000.285, 6.5, 1896.2, "
+                    "NULL, 0, 350000)"
+                )
+            )
+
+        assert apply(engine, money_to_cents.NAME, money_to_cents.upgrade) is True
+        assert apply(engine, money_to_cents.NAME, money_to_cents.upgrade) is False
+
+        with engine.connect() as connection:
+            row = connection.execute(text("SELECT * FROM mortgages")).one()
+        assert tuple(row) == (1, 30000000, 27500029, 650, 189620, None, 0, 35000000)
+
+    def test_init_db_upgrades_baseline_database(self, monkeypatch):
+        """Startup converts a database created with float dollar columns, once."""
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        # The mortgages table as the first release created it
+        baseline = MetaData()
+        Table(
+            "mortgages",
+            baseline,
+            Column("id", Integer, primary_key=True, index=True),
+            *(Column(name, Float) for name in money_to_cents.CENTS_COLUMNS),
+            Column("interest_rate", Float),
+            Column("loan_term_months", Integer),
+            Column("remaining_months", Integer),
+            Column("loan_start_date", Date),
+            Column("last_payment_date", Date),
+            Column("missed_payments", Integer),
+            Column("state", String(2)),
+            Column("property_address", String(500)),
+            Column("created_at", DateTime),
+            Column("updated_at", DateTime),
+        )
+        baseline.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "INSERT INTO mortgages (id, loan_amount, current_balance, interest_rate, "
+                    "monthly_payment, monthly_expenses, loan_term_months, remaining_months, "
+                    "loan_start_date, missed_payments, state) VALUES "
+                    "(1, 300000, 275000.285, 6.5, 1896.2, 0, 360, 324, '2021-01-01', 2, 'CA')"
+                )
+            )
+        monkeypatch.setattr(database, "engine", engine)
+
+        database.init_db()
+        database.init_db()
+
+        with Session(engine) as session:
+            mortgage = session.get(Mortgage, 1)
+            assert mortgage.current_balance == 275000.29
+            assert mortgage.interest_rate == 6.5
+            assert mortgage.monthly_payment == 1896.2
+            applied = list(session.scalars(select(schema_migrations.c.name)))
+        assert applied == [money_to_cents.NAME]
+        assert inspect(engine).has_table("mortgage_events")
@@ -158,6 +158,16 @@ class TestScenariosEndpoint:
         assert "TERM_EXTENSION_10" in scenario_types
         assert "PRINCIPAL_FORBEARANCE" in scenario_types
 
+    def test_no_scenarios_at_end_of_term(self, client, sample_mortgage_data):
+        """A loan with no months left has nothing to modify."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        client.put(f"/api/v1/mortgages/{mortgage_id}", json={"remaining_months": 0})
+
+        response = client.get(f"/api/v1/mortgages/{mortgage_id}/scenarios")
+
+        assert response.status_code == 200
+        assert response.json() == []
+
 
 class TestDeadlinesEndpoint:
     """Tests for foreclosure deadlines endpoint."""
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.pool import StaticPool
+
+from app import database
+from app.migrations import money_to_cents, partition_mortgages, schema_migrations
+from app.services.states import StateService
+
+
+class TestPartitioning:
+    """Tests for the optional state-partitioned mortgages layout."""
+
+    def test_partition_per_state(self):
+        """DDL has one LIST partition per state plus a default partition."""
+        ddl = partition_mortgages.partition_ddl()
+
+        partitions = [s for s in ddl if "PARTITION OF mortgages" in s]
+        assert len(partitions) == len(StateService.get_all_states()) + 1
+        assert "CREATE TABLE mortgages_ca PARTITION OF mortgages FOR VALUES IN ('CA')" in ddl
+        assert "CREATE TABLE mortgages_default PARTITION OF mortgages DEFAULT" in ddl
+
+    def test_parent_table(self):
+        """The parent keys on (id, state) and carries the model's indexes."""
+        ddl = partition_mortgages.partition_ddl()
+        parent = next(s for s in ddl if s.startswith("CREATE TABLE mortgages ("))
+
+        assert parent.endswith("PRIMARY KEY (id, state)) PARTITION BY LIST (state)")
+        assert "current_balance BIGINT NOT NULL" in parent
+        assert "CREATE INDEX ix_mortgages_id ON mortgages (id)" in ddl
+
+    def test_upgrade_requires_postgres(self):
+        """The migration refuses to run on other databases."""
+        engine = create_engine("sqlite://")
+        with engine.begin() as connection, pytest.raises(RuntimeError):
+            partition_mortgages.upgrade(connection)
+
+    def test_init_db_records_baseline(self, monkeypatch):
+        """A new database records migrations it doesn't need; partitioning stays pending."""
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        monkeypatch.setattr(database, "engine", engine)
+        monkeypatch.setattr(database, "MORTGAGE_PARTITIONING", "state")
+
+        database.init_db()
+
+        assert inspect(engine).has_table("mortgages")
+        with engine.connect() as connection:
+            applied = list(connection.scalars(select(schema_migrations.c.name)))
+        assert applied == [money_to_cents.NAME]
@@ -0,0 +1,263 @@
+import pytest
+import numpy as np
+from datetime import date, timedelta
+
+from app.models.mortgage import Mortgage
+from app.schemas.mortgage import Warning
+from app.services.calculations import CalculationService
+from app.services.guidance import GuidanceService
+from app.services.portfolio import MISSING_CENTS, MortgageColumns, PortfolioService
+
+
+class TestPortfolioLoader:
+    """Tests for the columnar portfolio loader."""
+
+    def test_load_columns(self, db, client, sample_mortgage_data, sample_mortgage_current):
+        """Rows load into typed column arrays."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        client.post("/api/v1/mortgages", json={**sample_mortgage_current, "monthly_income": None})
+
+        columns = PortfolioService.load(db)
+
+        assert len(columns) == 2
+        assert columns.id.dtype == np.int64
+        assert columns.current_balance.dtype == np.int64
+        assert list(columns.current_balance) == [27500000, 24000000]
+        assert list(columns.interest_rate) == [650, 550]
+        assert columns.last_payment_date.dtype == np.dtype("datetime64[D]")
+        assert list(columns.state) == [b"CA", b"TX"]
+        assert columns.monthly_income[1] == MISSING_CENTS
+        assert columns[1].monthly_income is None
+        assert columns.nbytes < 200
+
+    def test_row_view_matches_orm(self, db, client, sample_mortgage_data):
+        """Row views expose the same values as ORM instances."""
+        client.post("/api/v1/mortgages", json={**sample_mortgage_data, "last_payment_date": None})
+        mortgage = db.query(Mortgage).one()
+        row = PortfolioService.load(db)[0]
+
+        for name in ("id", "current_balance", "missed_payments", "state",
+                     "loan_start_date", "last_payment_date", "property_value"):
+            assert getattr(row, name) == getattr(mortgage, name)
+        assert row.last_payment_date is None
+
+    def test_services_accept_row_view(self, db, client, sample_mortgage_critical):
+        """Scalar services consume row views directly."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_critical)
+        mortgage = db.query(Mortgage).one()
+        row = PortfolioService.load(db)[0]
+
+        assert CalculationService.get_payment_dashboard(row) == (
+            CalculationService.get_payment_dashboard(mortgage)
+        )
+        assert GuidanceService.get_deadline_info(row) == GuidanceService.get_deadline_info(mortgage)
+
+    def test_filters_and_chunks(self, db, client, sample_mortgage_data, sample_mortgage_current):
+        """Loader filters by state or ids and streams chunks in id order."""
+        for data in (sample_mortgage_data, sample_mortgage_current, sample_mortgage_data):
+            client.post("/api/v1/mortgages", json=data)
+
+        assert list(PortfolioService.load(db, state="ca").id) == [1, 3]
+        assert list(PortfolioService.load(db, ids=[2]).id) == [2]
+        chunks = list(PortfolioService.iter_chunks(db, chunk_size=2))
+        assert [list(chunk.id) for chunk in chunks] == [[1, 2], [3]]
+
+    def test_empty(self, db):
+        """Empty portfolio loads as empty columns."""
+        columns = PortfolioService.load(db)
+        assert len(columns) == 0
+        assert list(columns) == []
+        with pytest.raises(IndexError):
+            columns[0]
+        assert len(MortgageColumns.concat([])) == 0
+
+
+class TestVectorizedClassification:
+    """Batch risk and stage classification must match the scalar logic."""
+
+    def test_risk_levels_match_scalar(self):
+        """Risk codes match calculate_risk_level, including boundaries."""
+        rng = np.random.default_rng(42)
+        missed = np.concatenate([np.arange(10), rng.integers(0, 12, 2000)])
+        dti = np.concatenate(
+            [
+                [35.999, 36.0, 43.0, 43.0000001, 50.0, 50.0000001, 100.0, np.nan, 0, 0],
+                rng.uniform(0, 120, 2000),
+            ]
+        )
+
+        codes = PortfolioService.risk_levels(missed, dti)
+
+        expected = [
+            CalculationService.calculate_risk_level(int(m), float(d))
+            for m, d in zip(missed, dti)
+        ]
+        assert [PortfolioService.RISK_LEVELS[c] for c in codes] == expected
+
+    def test_stages_match_scalar(self):
+        """Stage codes match get_foreclosure_stage for short and long timelines."""
+        days = np.arange(0, 800)
+        for timeline_days_max in (60, 120, 200, 720):
+            codes = PortfolioService.foreclosure_stages(
+                days, np.full(len(days), timeline_days_max)
+            )
+            expected = [
+                GuidanceService.get_foreclosure_stage(int(d), timeline_days_max)
+                for d in days
+            ]
+            assert [PortfolioService.STAGES[c] for c in codes] == expected
+
+    def test_classify_matches_scalar(
+        self, db, client, sample_mortgage_data, sample_mortgage_current, sample_mortgage_critical
+    ):
+        """Portfolio classification matches the dashboard and deadline services."""
+        for data in (sample_mortgage_data, sample_mortgage_current, sample_mortgage_critical):
+            client.post("/api/v1/mortgages", json=data)
+            client.post("/api/v1/mortgages", json={**data, "last_payment_date": None})
+        columns = PortfolioService.load(db)
+
+        classified = PortfolioService.classify(columns)
+
+        for index, mortgage in enumerate(db.query(Mortgage).order_by(Mortgage.id)):
+            dashboard = CalculationService.get_payment_dashboard(mortgage)
+            deadlines = GuidanceService.get_deadline_info(mortgage)
+            assert classified["days_past_due"][index] == dashboard.days_past_due
+            assert round(float(classified["dti_ratio"][index]), 1) == dashboard.dti_ratio
+            risk_code = classified["risk_level"][index]
+            assert PortfolioService.RISK_LEVELS[risk_code] == dashboard.risk_level
+            stage_code = classified["foreclosure_stage"][index]
+            assert PortfolioService.STAGES[stage_code] == deadlines.current_stage
+
+
+class TestBatchWarnings:
+    """Portfolio warnings must match the per-mortgage warnings."""
+
+    def test_find_warnings_matches_scalar(
+        self, db, client, sample_mortgage_data, sample_mortgage_current, sample_mortgage_critical
+    ):
+        """Every mortgage gets exactly its get_warnings results."""
+        today = date.today()
+        variants = [
+            sample_mortgage_data,
+            sample_mortgage_current,
+            sample_mortgage_critical,
+            {**sample_mortgage_data, "last_payment_date": None},
+            {**sample_mortgage_current, "property_value": None, "monthly_income": None},
+            {**sample_mortgage_data, "last_payment_date": str(today - timedelta(days=125))},
+            {**sample_mortgage_current, "last_payment_date": str(today - timedelta(days=25))},
+        ]
+        for data in variants:
+            client.post("/api/v1/mortgages", json=data)
+
+        warnings = PortfolioService.find_warnings(PortfolioService.load(db))
+
+        for mortgage in db.query(Mortgage):
+            expected = GuidanceService.get_warnings(mortgage)
+            actual = [
+                Warning(**w.model_dump(exclude={"mortgage_id"}))
+                for w in warnings
+                if w.mortgage_id == mortgage.id
+            ]
+            assert actual == expected
+
+    def test_next_payment_due_matches_scalar(self):
+        """Vectorized next payment date matches the scalar calculation."""
+        today = date.today()
+        last_dates = [None] + [today - timedelta(days=d) for d in range(-5, 400, 7)]
+        columns = MortgageColumns.from_rows(
+            [(i, 1, 1, 1, 360, 360, 1, today, d, 0, None, None, None, "CA")
+             for i, d in enumerate(last_dates)]
+        )
+
+        due = PortfolioService.next_payment_due(columns, today)
+
+        expected = [CalculationService.get_next_payment_due(d) for d in last_dates]
+        assert [d.item() for d in due] == expected
+
+
+class TestWarningsEndpoint:
+    """Tests for the portfolio warnings endpoint."""
+
+    def test_list_critical_warnings(
+        self, client, sample_mortgage_data, sample_mortgage_current, sample_mortgage_critical
+    ):
+        """Severity filter returns only matching warnings across loans."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        client.post("/api/v1/mortgages", json=sample_mortgage_current)
+        critical_id = client.post("/api/v1/mortgages", json=sample_mortgage_critical).json()["id"]
+
+        response = client.get("/api/v1/warnings", params={"severity": "CRITICAL"})
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) > 0
+        assert all(w["severity"] == "CRITICAL" for w in data)
+        assert {w["mortgage_id"] for w in data} == {critical_id}
+
+    def test_list_warnings_by_state(self, client, sample_mortgage_data):
+        """State filter narrows the portfolio."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        assert len(client.get("/api/v1/warnings", params={"state": "CA"}).json()) > 0
+        assert client.get("/api/v1/warnings", params={"state": "TX"}).json() == []
+
+
+class TestRiskProjection:
+    """Tests for day-by-day risk and stage projections."""
+
+    def test_projection_matches_scalar(self):
+        """Each projected day matches the scalar deadline calculation on that date."""
+        start = date(2024, 3, 1)
+        last_dates = [None] + [start - timedelta(days=d) for d in range(-20, 300, 23)]
+        columns = MortgageColumns.from_rows(
+            [(i, 1, 1, 1, 360, 360, 1, start, d, 2, None, None, None, state)
+             for i, d in enumerate(last_dates) for state in ("CA", "NY")]
+        )
+
+        projections = PortfolioService.project(columns, start, 180)
+
+        for row, projection in zip(columns, projections):
+            assert len(projection.days_past_due) == 180
+            for offset in (0, 1, 29, 30, 89, 90, 179):
+                today = start + timedelta(days=offset)
+                days_past_due = CalculationService.calculate_days_past_due(
+                    row.last_payment_date, row.missed_payments, today
+                )
+                info = GuidanceService.get_deadline_info(row, today)
+                assert projection.days_past_due[offset] == days_past_due
+                assert projection.foreclosure_stage[offset] == info.current_stage
+
+    def test_notice_of_sale_date(self):
+        """Notice of sale date is the first day past the state's minimum timeline."""
+        start = date(2024, 3, 1)
+        columns = MortgageColumns.from_rows(
+            [(1, 1, 1, 1, 360, 360, 1, start, start - timedelta(days=30), 2,
+              None, None, None, "CA")]
+        )
+        timeline_days_min = GuidanceService.get_state_info("CA").timeline_days_min
+
+        projection = PortfolioService.project(columns, start, 365)[0]
+
+        assert projection.notice_of_sale_date == start + timedelta(days=timeline_days_min)
+        assert PortfolioService.project(columns, start, 30)[0].notice_of_sale_date is None
+
+    def test_projection_endpoints(self, client, sample_mortgage_data, sample_mortgage_current):
+        """Single and batch projection endpoints honour the start date."""
+        first_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        second_id = client.post("/api/v1/mortgages", json=sample_mortgage_current).json()["id"]
+
+        single = client.get(
+            f"/api/v1/mortgages/{first_id}/projection",
+            params={"days": 30, "as_of": "2024-06-01"},
+        )
+        assert single.status_code == 200
+        assert single.json()["start"] == "2024-06-01"
+        assert len(single.json()["days_past_due"]) == 30
+
+        batch = client.post(
+            "/api/v1/projections",
+            json={"mortgage_ids": [second_id, first_id], "start": "2024-06-01", "days": 30},
+        )
+        assert batch.status_code == 200
+        assert [p["mortgage_id"] for p in batch.json()] == [first_id, second_id]
+        assert batch.json()[0] == single.json()
+
+        assert client.get("/api/v1/mortgages/9999/projection").status_code == 404
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app.main import app
+from app.middleware.rate_limit import (
+    MemoryBackend,
+    RateLimitMiddleware,
+    client_key,
+    route_cost,
+)
+
+
+class TestRateLimit:
+    """Tests for per-client token buckets."""
+
+    def test_route_costs(self):
+        """Batch and export routes cost more; health checks are free."""
+        assert route_cost("GET", "/health") == 0
+        assert route_cost("GET", "/api/v1/mortgages/3/dashboard") == 1
+        assert route_cost("PATCH", "/api/v1/mortgages") == 20
+        assert route_cost("GET", "/api/v1/mortgages") == 1
+        assert route_cost("GET", "/api/v1/mortgages/3/history") == 5
+
+    def test_client_key(self):
+        """Known API keys identify clients before IP addresses do."""
+        scope = {"headers": [(b"x-api-key", b"secret")], "client": ("10.0.0.1", 5000)}
+        assert client_key(scope, {"secret"}).startswith("key:")
+        assert "secret" not in client_key(scope, {"secret"})
+        assert client_key(scope, {"other"}) == "ip:10.0.0.1"
+        assert client_key({"headers": [], "client": ("10.0.0.1", 5000)}) == "ip:10.0.0.1"
+
+    def test_bucket_refills(self):
+        """A bucket debits costs, refuses what it can't pay, and refills over time."""
+        backend = MemoryBackend()
+        take = lambda cost: asyncio.run(backend.take("client", cost, 10, 100.0))
+
+        assert take(8).remaining == 2
+        denied = take(5)
+        assert not denied.allowed
+        assert denied.retry_after == 1
+        time.sleep(0.05)
+        assert take(5).allowed
+
+    def test_memory_backend_bounded(self):
+        """Idle buckets are dropped once the key limit is reached."""
+        backend = MemoryBackend(max_keys=10)
+        for index in range(25):
+            asyncio.run(backend.take(f"client-{index}", 1, 10, 1.0))
+        assert len(backend._buckets) <= 10
+
+    def test_middleware(self, client):
+        """Responses carry RateLimit headers and exhausted clients get 429."""
+        limited = TestClient(
+            RateLimitMiddleware(app, capacity=3, rate=0.01, api_keys={"other"})
+        )
+
+        response = limited.get("/api/v1/mortgages")
+        assert response.status_code == 200
+        assert response.headers["RateLimit-Limit"] == "3"
+        assert response.headers["RateLimit-Remaining"] == "2"
+
+        limited.get("/api/v1/mortgages")
+        limited.get("/api/v1/mortgages")
+        response = limited.get("/api/v1/mortgages")
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+        assert limited.get("/health").status_code == 200
+        other_client = limited.get("/api/v1/mortgages", headers={"X-API-Key": "other"})
+        assert other_client.status_code == 200
+
+    def test_unknown_keys_share_ip_bucket(self, client):
+        """Rotating through made-up API keys doesn't buy fresh buckets."""
+        limited = TestClient(
+            RateLimitMiddleware(app, capacity=3, rate=0.01, api_keys={"known"})
+        )
+
+        statuses = [
+            limited.get("/api/v1/mortgages", headers={"X-API-Key": f"made-up-{index}"}).status_code
+            for index in range(4)
+        ]
+
+        assert statuses == [200, 200, 200, 429]
+
+    def test_forwarded_clients_separate_behind_trusted_proxy(self, client):
+        """Clients behind a trusted proxy get buckets by X-Forwarded-For."""
+        proxied = ProxyHeadersMiddleware(
+            RateLimitMiddleware(app, capacity=2, rate=0.01), trusted_hosts=["10.0.0.2"]
+        )
+
+        async def from_proxy(scope, receive, send):
+            # Every connection comes from the proxy's address
+            await proxied({**scope, "client": ("10.0.0.2", 40000)}, receive, send)
+
+        limited = TestClient(from_proxy)
+
+        def get(forwarded_for):
+            return limited.get(
+                "/api/v1/mortgages", headers={"X-Forwarded-For": forwarded_for}
+            ).status_code
+
+        assert [get("203.0.113.1") for _ in range(3)] == [200, 200, 429]
+        assert get("203.0.113.2") == 200
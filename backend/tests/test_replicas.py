@@ -0,0 +1,94 @@
+import time
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.database import READ_PRIMARY_COOKIE, ReplicaPool, wants_primary
+from app.middleware import ReadYourWritesMiddleware
+
+
+def make_request(headers=None):
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+class TestReplicaPool:
+    """Tests for read replica selection."""
+
+    def test_round_robin_and_fallback(self, tmp_path):
+        """Healthy replicas rotate; failed ones are skipped until they recover."""
+        first = create_engine(f"sqlite:///{tmp_path}/first.db")
+        second = create_engine(f"sqlite:///{tmp_path}/second.db")
+        broken = create_engine(f"sqlite:///{tmp_path}/missing/dir/broken.db")
+        pool = ReplicaPool([first, second, broken])
+
+        pool.check()
+        picks = {pool.pick() for _ in range(4)}
+        assert picks == {first, second}
+
+        pool.mark_unhealthy(first)
+        pool.mark_unhealthy(second)
+        assert pool.pick() is None
+
+        pool.check()
+        assert pool.pick() in (first, second)
+
+    def test_empty_pool(self):
+        """Without replicas the pool is falsy and reads use the primary."""
+        pool = ReplicaPool([])
+        assert not pool
+        assert pool.pick() is None
+
+
+class TestReadYourWrites:
+    """Tests for routing a client's reads to the primary after a write."""
+
+    def test_wants_primary(self):
+        """Strong consistency header or a live cookie selects the primary."""
+        assert not wants_primary(make_request())
+        assert wants_primary(make_request({"X-Consistency": "strong"}))
+        live = f"{READ_PRIMARY_COOKIE}={int(time.time()) + 5}"
+        expired = f"{READ_PRIMARY_COOKIE}={int(time.time()) - 5}"
+        assert wants_primary(make_request({"Cookie": live}))
+        assert not wants_primary(make_request({"Cookie": expired}))
+
+    def test_middleware_sets_cookie_on_writes(self):
+        """Successful writes set the cookie; reads and failures don't."""
+        app = FastAPI()
+        app.add_middleware(ReadYourWritesMiddleware, window_seconds=5)
+
+        @app.get("/item")
+        def read_item():
+            return {}
+
+        @app.post("/item")
+        def write_item(fail: bool = False):
+            if fail:
+                raise HTTPException(status_code=400)
+            return {}
+
+        client = TestClient(app)
+        assert READ_PRIMARY_COOKIE in client.post("/item").cookies
+        assert READ_PRIMARY_COOKIE not in client.get("/item").headers.get("set-cookie", "")
+        assert "set-cookie" not in client.post("/item", params={"fail": True}).headers
+
+    def test_cross_origin_consistency_header_allowed(self, client):
+        """A cross-site SPA may send X-Consistency on its reads."""
+        origin = "https://mortgage-guardian-mocha.vercel.app"
+        preflight = client.options(
+            "/api/v1/mortgages/1/dashboard",
+            headers={
+                "Origin": origin,
+                "Access-Control-Request-Method": "GET",
+                "Access-Control-Request-Headers": "content-type,x-consistency",
+            },
+        )
+
+        assert preflight.status_code == 200
+        assert preflight.headers["access-control-allow-origin"] == origin
+        assert "x-consistency" in preflight.headers["access-control-allow-headers"].lower()
+        read = client.get(
+            "/api/v1/mortgages", headers={"Origin": origin, "X-Consistency": "strong"}
+        )
+        assert read.status_code == 200
+        assert read.headers["access-control-allow-origin"] == origin
@@ -0,0 +1,88 @@
+from datetime import date, datetime, time
+from sqlalchemy import create_engine
+
+from app.jobs import rescore
+from app.jobs.scheduler import DailyScheduler, SchedulerLock, next_run_after
+from app.models.job_run import JobRun
+from app.models.milestone import MortgageMilestone
+from app.models.score import MortgageScore
+
+
+class TestRescoreJob:
+    """Tests for the daily re-scoring job."""
+
+    def test_scores_written_on_create(self, db, client, sample_mortgage_critical):
+        """Creating a mortgage materializes its score immediately."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_critical).json()["id"]
+        dashboard = client.get(f"/api/v1/mortgages/{mortgage_id}/dashboard").json()
+
+        score = db.get(MortgageScore, mortgage_id)
+        assert score.risk_level == dashboard["risk_level"] == "CRITICAL"
+        assert score.days_past_due == dashboard["days_past_due"]
+        assert score.next_payment_due == date.fromisoformat(dashboard["next_payment_due"])
+
+    def test_run_inline(self, db, client, sample_mortgage_data, sample_mortgage_current):
+        """Job rescores every mortgage in chunks and records the run."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        client.post("/api/v1/mortgages", json=sample_mortgage_current)
+        db.query(MortgageScore).delete()
+        db.query(MortgageMilestone).delete()
+        db.commit()
+
+        job_run = rescore.run(db, workers=1, chunk_size=1)
+
+        assert job_run.status == "succeeded"
+        assert job_run.rows_processed == 2
+        assert job_run.duration_seconds is not None
+        assert db.query(MortgageScore).count() == 2
+        assert db.query(MortgageMilestone).count() == 5
+        assert db.query(JobRun).filter(JobRun.job_name == "rescore").count() == 1
+
+    def test_run_process_pool(self, db, client, sample_mortgage_data):
+        """Process pool results match the on-write scores."""
+        for _ in range(3):
+            client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        before = {s.mortgage_id: s.foreclosure_stage for s in db.query(MortgageScore)}
+
+        job_run = rescore.run(db, workers=2, chunk_size=2)
+        db.expire_all()
+
+        assert job_run.rows_processed == 3
+        after = {s.mortgage_id: s.foreclosure_stage for s in db.query(MortgageScore)}
+        assert after == before
+
+    def test_delete_clears_score(self, db, client, sample_mortgage_data):
+        """Deleting a mortgage removes its score."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        client.delete(f"/api/v1/mortgages/{mortgage_id}")
+        assert db.get(MortgageScore, mortgage_id) is None
+
+
+class TestScheduler:
+    """Tests for the daily scheduler."""
+
+    def test_next_run_later_today(self):
+        """Run time later today is scheduled today."""
+        now = datetime(2024, 1, 15, 4, 30)
+        assert next_run_after(now, time(5, 0)) == datetime(2024, 1, 15, 5, 0)
+
+    def test_next_run_tomorrow(self):
+        """Run time already reached is scheduled tomorrow."""
+        now = datetime(2024, 1, 15, 5, 0)
+        assert next_run_after(now, time(5, 0)) == datetime(2024, 1, 16, 5, 0)
+
+    def test_one_process_runs_jobs(self, tmp_path):
+        """Only the scheduler holding the lock runs the jobs, until it stops."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+        runs = []
+        first = DailyScheduler(time(5, 0), [lambda: runs.append("first")], SchedulerLock(engine))
+        second = DailyScheduler(time(5, 0), [lambda: runs.append("second")], SchedulerLock(engine))
+
+        assert first.run_jobs()
+        assert not second.run_jobs()
+        assert first.run_jobs()
+        first.stop()
+        assert second.run_jobs()
+
+        assert runs == ["first", "first", "second"]
+        second.stop()
@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.guidance import GuidanceService
+from app.singleflight import SingleFlight, analytics_flight
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent identical calls."""
+
+    def run_concurrently(self, flight, key, fn, callers=5):
+        release = threading.Event()
+
+        def slow():
+            release.wait(5)
+            return fn()
+
+        with ThreadPoolExecutor(callers) as pool:
+            futures = [pool.submit(flight.do, key, slow) for _ in range(callers)]
+            while flight.shared < callers - 1:
+                threading.Event().wait(0.01)
+            release.set()
+            return [future.result() for future in futures]
+
+    def test_concurrent_calls_share_result(self):
+        """Concurrent callers with one key run the function once and share its result."""
+        flight = SingleFlight()
+        calls = []
+
+        results = self.run_concurrently(flight, "key", lambda: calls.append(1) or object())
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        # Finished calls aren't cached
+        assert flight.do("key", lambda: "fresh") == "fresh"
+
+    def test_error_shared(self):
+        """Every waiting caller sees the leader's exception."""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            self.run_concurrently(flight, "key", fail, callers=3)
+        assert flight.do("key", lambda: 1) == 1
+
+    def test_endpoint_keyed_by_updated_at(self, client, sample_mortgage_data, monkeypatch):
+        """Guidance requests coalesce per mortgage version."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        computed = []
+        get_guidance = GuidanceService.get_guidance
+        monkeypatch.setattr(
+            GuidanceService,
+            "get_guidance",
+            lambda mortgage, today=None: computed.append(mortgage.missed_payments)
+            or get_guidance(mortgage, today),
+        )
+        shared = analytics_flight.shared
+
+        url = f"/api/v1/mortgages/{mortgage_id}/guidance"
+        client.get(url)
+        client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 0})
+        client.get(url)
+
+        assert computed == [2, 0]
+        assert analytics_flight.shared == shared
+        assert client.get("/api/v1/mortgages/9999/guidance").status_code == 404
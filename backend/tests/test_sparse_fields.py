@@ -0,0 +1,51 @@
+
+
+class TestSparseFieldsets:
+    """Tests for the fields= projection on list and get."""
+
+    def test_list_fields(self, client, sample_mortgage_data, sample_mortgage_current):
+        """Only requested fields (plus id) are returned, with dollar amounts."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+        client.post("/api/v1/mortgages", json=sample_mortgage_current)
+
+        response = client.get(
+            "/api/v1/mortgages", params={"fields": "state, current_balance,missed_payments"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": 1, "current_balance": 275000.0, "missed_payments": 2, "state": "CA"},
+            {"id": 2, "current_balance": 240000.0, "missed_payments": 0, "state": "TX"},
+        ]
+
+    def test_get_fields_match_full(self, client, sample_mortgage_data):
+        """Projected values equal the full response's."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        full = client.get(f"/api/v1/mortgages/{mortgage_id}").json()
+
+        fields = ["interest_rate", "loan_start_date", "updated_at", "monthly_income"]
+        sparse = client.get(
+            f"/api/v1/mortgages/{mortgage_id}", params={"fields": ",".join(fields)}
+        ).json()
+
+        assert sparse == {name: full[name] for name in ["id", *fields]}
+
+    def test_archived_fields(self, client, db, sample_mortgage_data):
+        """Archived loans project too, including archive-only fields."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        params = {"fields": "state,archive_reason"}
+        assert client.get(f"/api/v1/mortgages/{mortgage_id}", params=params).json() == {
+            "id": mortgage_id, "state": "CA", "archive_reason": None,
+        }
+
+        client.post(f"/api/v1/mortgages/{mortgage_id}/archive")
+
+        response = client.get(f"/api/v1/mortgages/{mortgage_id}", params=params)
+        assert response.json()["archive_reason"] == "RESOLVED"
+        assert client.get("/api/v1/mortgages/9999", params=params).status_code == 404
+
+    def test_unknown_field(self, client):
+        """Unknown field names are rejected."""
+        response = client.get("/api/v1/mortgages", params={"fields": "state,password"})
+        assert response.status_code == 422
+        assert "password" in response.json()["detail"]
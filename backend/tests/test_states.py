@@ -64,6 +64,14 @@ class TestStateService:
         assert ForeclosureType.NON_JUDICIAL in types
         assert ForeclosureType.HYBRID in types
 
+    def test_get_all_states_sorted_copy(self):
+        """Test cached state list is sorted and safe to modify."""
+        states = StateService.get_all_states()
+        names = [s.name for s in states]
+        assert names == sorted(names)
+        states.clear()
+        assert len(StateService.get_all_states()) == 51
+
 
 class TestStatesEndpoint:
     """Tests for states API endpoint."""
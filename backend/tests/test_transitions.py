@@ -0,0 +1,128 @@
+import asyncio
+import json
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+
+from app.cursors import CURSOR_SETTLE_SECONDS
+from app.jobs import rescore
+from app.models.transition import MortgageTransition
+from app.services.transitions import TransitionService
+from app.streaming import TransitionBroadcaster
+
+
+def escalate(client, mortgage_data):
+    """Create a mortgage at low DTI and push it to CRITICAL risk."""
+    mortgage_data = {**mortgage_data, "monthly_income": 12000}
+    mortgage_id = client.post("/api/v1/mortgages", json=mortgage_data).json()["id"]
+    client.put(f"/api/v1/mortgages/{mortgage_id}", json={"missed_payments": 6})
+    return mortgage_id
+
+
+class TestTransitionRecording:
+    """Tests for recording risk transitions on rescore."""
+
+    def test_update_records_transition(self, client, db, sample_mortgage_data):
+        """An update that escalates risk records old and new values."""
+        mortgage_id = escalate(client, sample_mortgage_data)
+
+        [transition] = TransitionService.fetch(db)
+
+        assert transition.mortgage_id == mortgage_id
+        assert transition.state == "CA"
+        assert transition.previous_risk_level == "MEDIUM"
+        assert transition.risk_level == "CRITICAL"
+
+    def test_unchanged_score_not_recorded(self, client, db, sample_mortgage_data):
+        """Rescoring with no change in level, stage or warnings records nothing."""
+        mortgage_id = client.post("/api/v1/mortgages", json=sample_mortgage_data).json()["id"]
+        client.put(f"/api/v1/mortgages/{mortgage_id}", json={"property_address": "1 Main St"})
+        rescore.run(db, workers=1)
+
+        assert db.query(MortgageTransition).count() == 0
+
+    def test_daily_rescore_records_stage_change(self, client, db, sample_mortgage_data):
+        """The daily job records loans whose stage moves with the calendar."""
+        client.post("/api/v1/mortgages", json=sample_mortgage_data)
+
+        rescore.run(db, workers=1, today=date.today() + timedelta(days=60))
+
+        [transition] = TransitionService.fetch(db)
+        assert transition.previous_foreclosure_stage == "GRACE_PERIOD"
+        assert transition.foreclosure_stage == "DEFAULT"
+
+    def test_fetch_holds_back_behind_gap(self, client, db, sample_mortgage_data):
+        """Transitions after a missing id wait until it can no longer commit."""
+        for _ in range(3):
+            escalate(client, sample_mortgage_data)
+        # Stands in for a transition whose transaction is still open
+        db.query(MortgageTransition).filter_by(id=2).delete()
+        db.commit()
+        later = datetime.utcnow() + timedelta(seconds=CURSOR_SETTLE_SECONDS + 1)
+
+        assert [t.id for t in TransitionService.fetch(db)] == [1]
+        assert [t.id for t in TransitionService.fetch(db, 1, now=later)] == [3]
+        assert TransitionService.latest_id(db) == 0
+        assert TransitionService.latest_id(db, now=later) == 3
+
+
+class TestTransitionBroadcaster:
+    """Tests for fanning transitions out to SSE subscribers."""
+
+    def test_poll_filters_and_streams(self, client, db, sample_mortgage_data, sample_mortgage_current):
+        """Subscribers receive only matching transitions, formatted as SSE."""
+        ca_id = escalate(client, sample_mortgage_data)
+        escalate(client, sample_mortgage_current)
+        broadcaster = TransitionBroadcaster(sessionmaker(bind=db.get_bind()), 0.01, 10)
+
+        async def scenario():
+            california = broadcaster.subscribe(0, states=["ca"])
+            by_id = broadcaster.subscribe(0, mortgage_ids=[ca_id + 1])
+            await broadcaster.poll()
+            stream = broadcaster.events(db, california)
+            event = await stream.__anext__()
+            await stream.aclose()
+            broadcaster.unsubscribe(by_id)
+            return event, by_id.queue.qsize()
+
+        event, by_id_count = asyncio.run(scenario())
+
+        lines = event.splitlines()
+        assert lines[1] == "event: transition"
+        assert json.loads(lines[2][len("data: "):])["mortgage_id"] == ca_id
+        assert by_id_count == 1
+
+    def test_replay_from_last_event_id(self, client, db, sample_mortgage_data):
+        """Joining a running poller replays transitions it already passed."""
+        escalate(client, sample_mortgage_data)
+        escalate(client, sample_mortgage_data)
+        broadcaster = TransitionBroadcaster(sessionmaker(bind=db.get_bind()), 0.01, 10)
+
+        async def scenario():
+            first = broadcaster.subscribe(0)
+            await broadcaster.poll()
+            late = broadcaster.subscribe(1)
+            stream = broadcaster.events(db, late)
+            event = await stream.__anext__()
+            await stream.aclose()
+            broadcaster.unsubscribe(first)
+            return event, late.queue.qsize()
+
+        event, queued = asyncio.run(scenario())
+
+        assert event.startswith("id: 2\n")
+        assert queued == 0
+
+    def test_overflow_ends_stream(self, client, db, sample_mortgage_data):
+        """A subscriber whose buffer fills is told to reconnect."""
+        for _ in range(3):
+            escalate(client, sample_mortgage_data)
+        broadcaster = TransitionBroadcaster(sessionmaker(bind=db.get_bind()), 0.01, 2)
+
+        async def scenario():
+            subscription = broadcaster.subscribe(0)
+            await broadcaster.poll()
+            return [event async for event in broadcaster.events(db, subscription)]
+
+        events = asyncio.run(scenario())
+
+        assert [e.split("\n")[0] for e in events] == ["id: 1", "id: 2", "event: overflow"]
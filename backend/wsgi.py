@@ -7,7 +7,10 @@ path = os.path.dirname(os.path.abspath(__file__))
 if path not in sys.path:
     sys.path.insert(0, path)
 
+from a2wsgi import ASGIMiddleware
+
 from app.main import app
 
-# PythonAnywhere uses 'application' as the WSGI callable
-application = app
+# PythonAnywhere uses 'application' as the WSGI callable; FastAPI is an ASGI
+# app, so bridge it to WSGI
+application = ASGIMiddleware(app)
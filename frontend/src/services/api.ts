@@ -21,6 +21,11 @@ import type {
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || '';
 
+// Reads this soon after a write ask for the primary database, since read
+// replicas may lag. The API's cookie for this isn't sent across sites.
+const READ_YOUR_WRITES_MS = 5000;
+let readPrimaryUntil = 0;
+
 class ApiError extends Error {
   constructor(public status: number, message: string) {
     super(message);
@@ -47,13 +52,20 @@ async function request<T>(
   options: RequestInit = {}
 ): Promise<T> {
   const url = `${API_BASE_URL}${endpoint}`;
+  const isRead = !options.method || options.method === 'GET';
   const response = await fetch(url, {
     ...options,
     headers: {
       'Content-Type': 'application/json',
+      ...(isRead && Date.now() < readPrimaryUntil
+        ? { 'X-Consistency': 'strong' }
+        : {}),
       ...options.headers,
     },
   });
+  if (!isRead && response.ok) {
+    readPrimaryUntil = Date.now() + READ_YOUR_WRITES_MS;
+  }
   return handleResponse<T>(response);
 }
 
@@ -102,6 +102,28 @@ describe('API Client', () => {
     });
   });
 
+  describe('read your writes', () => {
+    it('asks for strong consistency on reads right after a write', async () => {
+      const now = vi.spyOn(Date, 'now').mockReturnValue(1_000_000);
+      mockFetch.mockResolvedValue({
+        ok: true,
+        json: () => Promise.resolve({ id: 1 }),
+      });
+
+      await api.mortgages.update(1, { missed_payments: 3 });
+      await api.dashboard.get(1);
+      now.mockReturnValue(1_006_000);
+      await api.dashboard.get(1);
+
+      const headers = mockFetch.mock.calls.map(([, init]) => init.headers);
+      expect(headers[0]).not.toHaveProperty('X-Consistency');
+      expect(headers[1]).toHaveProperty('X-Consistency', 'strong');
+      expect(headers[2]).not.toHaveProperty('X-Consistency');
+      now.mockRestore();
+      mockFetch.mockReset();
+    });
+  });
+
   describe('dashboard', () => {
     it('gets payment dashboard', async () => {
       const mockDashboard = {